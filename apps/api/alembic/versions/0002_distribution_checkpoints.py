@@ -0,0 +1,109 @@
+"""distribution checkpoints
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-07-01 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+# Distributions in the same (startup_id, month) group as another, and the group's first distribution.
+_DUPLICATE = """
+    EXISTS (
+        SELECT 1 FROM distributions AS other
+        WHERE other.startup_id = distributions.startup_id AND other.month = distributions.month
+            AND other.id <> distributions.id
+    )
+"""
+_FIRST = """
+    (SELECT MIN(first.id) FROM distributions AS first
+     WHERE first.startup_id = distributions.startup_id AND first.month = distributions.month)
+"""
+
+
+def _merge_duplicate_distributions() -> None:
+    # Reruns of a month used to create another distribution and pay the contracts again. Each group is
+    # merged into its first distribution: its total becomes the group's total, and a contract's payouts
+    # across the group become one payout carrying their sum, so the unique constraints below hold and
+    # no paid amount is lost.
+    bind = op.get_bind()
+    duplicated = bind.execute(
+        sa.text("SELECT 1 FROM distributions GROUP BY startup_id, month HAVING COUNT(*) > 1")
+    ).first()
+    if duplicated is None:
+        return
+    op.execute(
+        f"""
+        CREATE TEMPORARY TABLE distribution_merges AS
+        SELECT id, {_FIRST} AS first_id FROM distributions WHERE {_DUPLICATE}
+        """
+    )
+    op.execute(
+        """
+        UPDATE payouts SET amount_cents = (
+            SELECT SUM(other.amount_cents) FROM payouts AS other
+            JOIN distribution_merges AS other_merge ON other_merge.id = other.distribution_id
+            JOIN distribution_merges AS merge ON merge.id = payouts.distribution_id
+            WHERE other.contract_id = payouts.contract_id AND other_merge.first_id = merge.first_id
+        )
+        WHERE distribution_id IN (SELECT id FROM distribution_merges)
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM payouts
+        WHERE distribution_id IN (SELECT id FROM distribution_merges) AND EXISTS (
+            SELECT 1 FROM payouts AS other
+            JOIN distribution_merges AS other_merge ON other_merge.id = other.distribution_id
+            JOIN distribution_merges AS merge ON merge.id = payouts.distribution_id
+            WHERE other.contract_id = payouts.contract_id AND other_merge.first_id = merge.first_id
+                AND other.id < payouts.id
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE payouts
+        SET distribution_id = (SELECT first_id FROM distribution_merges WHERE id = payouts.distribution_id)
+        WHERE distribution_id IN (SELECT id FROM distribution_merges)
+        """
+    )
+    op.execute(
+        """
+        UPDATE distributions SET total_distributed_cents = (
+            SELECT SUM(other.total_distributed_cents) FROM distributions AS other
+            WHERE other.startup_id = distributions.startup_id AND other.month = distributions.month
+        )
+        WHERE id IN (SELECT first_id FROM distribution_merges)
+        """
+    )
+    op.execute("DELETE FROM distributions WHERE id IN (SELECT id FROM distribution_merges WHERE id <> first_id)")
+    op.execute("DROP TABLE distribution_merges")
+
+
+def upgrade() -> None:
+    _merge_duplicate_distributions()
+    with op.batch_alter_table("distributions") as batch:
+        batch.add_column(sa.Column("gross_revenue_cents", sa.Integer, nullable=False, server_default="0"))
+        batch.add_column(sa.Column("status", sa.String(length=20), nullable=False, server_default="completed"))
+        batch.add_column(sa.Column("checkpoint_contract_id", sa.Integer))
+        batch.create_unique_constraint("uq_distributions_startup_month", ["startup_id", "month"])
+    with op.batch_alter_table("payouts") as batch:
+        batch.create_unique_constraint("uq_payouts_distribution_contract", ["distribution_id", "contract_id"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("payouts") as batch:
+        batch.drop_constraint("uq_payouts_distribution_contract", type_="unique")
+    with op.batch_alter_table("distributions") as batch:
+        batch.drop_constraint("uq_distributions_startup_month", type_="unique")
+        batch.drop_column("checkpoint_contract_id")
+        batch.drop_column("status")
+        batch.drop_column("gross_revenue_cents")
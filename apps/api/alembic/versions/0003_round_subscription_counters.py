@@ -0,0 +1,46 @@
+"""round subscription counters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-07-08 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("rounds") as batch:
+        batch.add_column(sa.Column("raised_cents", sa.Integer, nullable=False, server_default="0"))
+        batch.add_column(sa.Column("investor_count", sa.Integer, nullable=False, server_default="0"))
+    op.execute(
+        """
+        UPDATE rounds SET
+            raised_cents = (SELECT COALESCE(SUM(amount_cents), 0) FROM investments WHERE investments.round_id = rounds.id),
+            investor_count = (SELECT COUNT(*) FROM investments WHERE investments.round_id = rounds.id)
+        """
+    )
+    # The invest path used to let rounds over-raise; the constraint cannot hold until those are resolved.
+    oversubscribed = op.get_bind().execute(
+        sa.text("SELECT id, raised_cents, max_raise_cents FROM rounds WHERE raised_cents > max_raise_cents ORDER BY id")
+    ).all()
+    if oversubscribed:
+        raise RuntimeError(
+            "Rounds raised more than their max_raise_cents; refund the excess investments or raise the "
+            "rounds' max_raise_cents, then rerun the migration: "
+            + ", ".join(f"round {id} raised {raised} of {maximum}" for id, raised, maximum in oversubscribed)
+        )
+    with op.batch_alter_table("rounds") as batch:
+        batch.create_check_constraint("ck_rounds_raised_within_max", sa.text("raised_cents <= max_raise_cents"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("rounds") as batch:
+        batch.drop_constraint("ck_rounds_raised_within_max", type_="check")
+        batch.drop_column("investor_count")
+        batch.drop_column("raised_cents")
@@ -0,0 +1,44 @@
+"""round reservations
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-07-15 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("rounds") as batch:
+        batch.add_column(sa.Column("reserved_cents", sa.Integer, nullable=False, server_default="0"))
+        batch.drop_constraint("ck_rounds_raised_within_max", type_="check")
+        batch.create_check_constraint(
+            "ck_rounds_subscribed_within_max", sa.text("raised_cents + reserved_cents <= max_raise_cents")
+        )
+    op.create_table(
+        "reservations",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("round_id", sa.Integer, sa.ForeignKey("rounds.id")),
+        sa.Column("investor_user_id", sa.Integer, sa.ForeignKey("users.id")),
+        sa.Column("amount_cents", sa.Integer),
+        sa.Column("status", sa.String(length=20)),
+        sa.Column("expires_at", sa.DateTime, nullable=True),
+        sa.Column("investment_id", sa.Integer, sa.ForeignKey("investments.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime),
+    )
+    op.create_index("ix_reservations_round_status", "reservations", ["round_id", "status", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reservations_round_status", table_name="reservations")
+    op.drop_table("reservations")
+    with op.batch_alter_table("rounds") as batch:
+        batch.drop_constraint("ck_rounds_subscribed_within_max", type_="check")
+        batch.create_check_constraint("ck_rounds_raised_within_max", sa.text("raised_cents <= max_raise_cents"))
+        batch.drop_column("reserved_cents")
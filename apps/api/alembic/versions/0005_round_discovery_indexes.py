@@ -0,0 +1,35 @@
+"""round discovery indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-07-22 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_rounds_status_id", "rounds", ["status", "id"])
+    op.create_index("ix_rounds_startup_status", "rounds", ["startup_id", "status", "id"])
+    op.create_index("ix_startups_industry_stage_country", "startups", ["industry", "revenue_stage", "country"])
+    if op.get_bind().dialect.name == "postgresql":
+        # Without joint statistics the planner multiplies the three filter selectivities as if they
+        # were independent; a rare combination then walks every published round newest-first instead
+        # of starting from the matching startups.
+        op.execute(
+            "CREATE STATISTICS st_startups_discovery (mcv) ON industry, revenue_stage, country FROM startups"
+        )
+        op.execute("ANALYZE startups")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP STATISTICS IF EXISTS st_startups_discovery")
+    op.drop_index("ix_startups_industry_stage_country", table_name="startups")
+    op.drop_index("ix_rounds_startup_status", table_name="rounds")
+    op.drop_index("ix_rounds_status_id", table_name="rounds")
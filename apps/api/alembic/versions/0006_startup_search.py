@@ -0,0 +1,38 @@
+"""startup full-text search
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2024-07-29 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Postgres only: SQLite deployments search through the in-process index in app.investor.search.
+    # The weights match FIELD_WEIGHTS there; a generated column keeps the vector current on every write.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        """
+        ALTER TABLE startups ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(legal_name, '') || ' ' || coalesce(operating_name, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(industry, '') || ' ' || coalesce(sub_industry, '')), 'B')
+            || setweight(to_tsvector('english', coalesce(short_description, '')), 'C')
+            || setweight(to_tsvector('english', coalesce(long_description, '')), 'D')
+        ) STORED
+        """
+    )
+    op.execute("CREATE INDEX ix_startups_search_vector ON startups USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS ix_startups_search_vector")
+    op.execute("ALTER TABLE startups DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,22 @@
+"""round version counter for conditional GETs
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2024-08-05 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("rounds", sa.Column("version", sa.Integer, nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    op.drop_column("rounds", "version")
@@ -0,0 +1,42 @@
+"""typed revenue report month
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2024-08-12 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("revenue_reports", sa.Column("month_start", sa.Date, nullable=True))
+    # Same rule as app.models.month_start: a leading "YYYY-MM" with a valid month, anything else stays NULL.
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            """
+            UPDATE revenue_reports
+            SET month_start = make_date(substr(month, 1, 4)::int, substr(month, 6, 2)::int, 1)
+            WHERE month ~ '^[0-9]{4}-(0[1-9]|1[0-2])'
+            """
+        )
+    else:
+        op.execute(
+            """
+            UPDATE revenue_reports
+            SET month_start = substr(month, 1, 7) || '-01'
+            WHERE month GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]*'
+                AND CAST(substr(month, 6, 2) AS INTEGER) BETWEEN 1 AND 12
+            """
+        )
+    op.create_index("ix_revenue_reports_startup_month", "revenue_reports", ["startup_id", "month_start"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_revenue_reports_startup_month", table_name="revenue_reports")
+    op.drop_column("revenue_reports", "month_start")
@@ -0,0 +1,69 @@
+"""startup summary read model
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2024-08-19 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "startup_summaries",
+        sa.Column("startup_id", sa.Integer, sa.ForeignKey("startups.id"), primary_key=True),
+        sa.Column("total_raised_cents", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column("live_round_id", sa.Integer, nullable=True),
+        sa.Column("last_revenue_month", sa.String(length=20), nullable=True),
+        sa.Column("total_distributed_cents", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column("active_contract_count", sa.Integer, nullable=False, server_default="0"),
+    )
+    # Same facts as app.startups.summary.rebuild; later rebuilds go through scripts/rebuild_startup_summaries.py.
+    op.execute(
+        """
+        INSERT INTO startup_summaries (
+            startup_id, total_raised_cents, live_round_id, last_revenue_month,
+            total_distributed_cents, active_contract_count
+        )
+        SELECT
+            startups.id,
+            COALESCE(rounds.total_raised_cents, 0),
+            rounds.live_round_id,
+            reports.month,
+            COALESCE(distributions.total_distributed_cents, 0),
+            COALESCE(contracts.active_contract_count, 0)
+        FROM startups
+        LEFT JOIN (
+            SELECT startup_id, SUM(raised_cents) AS total_raised_cents,
+                MIN(id) FILTER (WHERE status = 'published') AS live_round_id
+            FROM rounds GROUP BY startup_id
+        ) AS rounds ON rounds.startup_id = startups.id
+        LEFT JOIN (
+            SELECT startup_id, month,
+                ROW_NUMBER() OVER (PARTITION BY startup_id ORDER BY created_at DESC, id DESC) AS position
+            FROM revenue_reports
+        ) AS reports ON reports.startup_id = startups.id AND reports.position = 1
+        LEFT JOIN (
+            SELECT startup_id, SUM(total_distributed_cents) AS total_distributed_cents
+            FROM distributions GROUP BY startup_id
+        ) AS distributions ON distributions.startup_id = startups.id
+        LEFT JOIN (
+            SELECT rounds.startup_id, COUNT(contracts.id) AS active_contract_count
+            FROM contracts
+            JOIN investments ON investments.id = contracts.investment_id
+            JOIN rounds ON rounds.id = investments.round_id
+            WHERE contracts.status = 'active'
+            GROUP BY rounds.startup_id
+        ) AS contracts ON contracts.startup_id = startups.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("startup_summaries")
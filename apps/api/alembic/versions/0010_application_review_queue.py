@@ -0,0 +1,26 @@
+"""application review queue indexes
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2024-08-26 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The review queue lists applications by submission time; anything past draft without one predates
+    # the column being set consistently and is placed at its creation time.
+    op.execute("UPDATE applications SET submitted_at = created_at WHERE submitted_at IS NULL AND status <> 'draft'")
+    op.create_index("ix_applications_status_submitted", "applications", ["status", "submitted_at", "id"])
+    op.create_index("ix_applications_submitted", "applications", ["submitted_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_applications_submitted", table_name="applications")
+    op.drop_index("ix_applications_status_submitted", table_name="applications")
@@ -0,0 +1,23 @@
+"""ledger export indexes
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2024-09-02 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_ledger_entries_ts_id", "ledger_entries", ["ts", "id"])
+    op.create_index("ix_ledger_entries_type_ts_id", "ledger_entries", ["entry_type", "ts", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ledger_entries_type_ts_id", table_name="ledger_entries")
+    op.drop_index("ix_ledger_entries_ts_id", table_name="ledger_entries")
@@ -0,0 +1,56 @@
+"""ledger rollups
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2024-09-09 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ledger_rollups",
+        sa.Column("grain", sa.String(length=10), primary_key=True),
+        sa.Column("entry_type", sa.String(length=50), primary_key=True),
+        sa.Column("period_start", sa.Date, primary_key=True),
+        sa.Column("startup_id", sa.Integer, primary_key=True),
+        sa.Column("amount_cents", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column("entry_count", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ix_ledger_rollups_startup", "ledger_rollups", ["startup_id", "grain", "entry_type", "period_start"]
+    )
+    # Investment and platform fee entries were written without their startup; attribute them through the round.
+    op.execute(
+        """
+        UPDATE ledger_entries
+        SET startup_id = (SELECT rounds.startup_id FROM rounds WHERE rounds.id = ledger_entries.round_id)
+        WHERE startup_id IS NULL AND round_id IS NOT NULL
+        """
+    )
+    # Same periods as app.ledger.rollups.period_start: Monday weeks and calendar months.
+    if op.get_bind().dialect.name == "postgresql":
+        periods = {"week": "date_trunc('week', ts)::date", "month": "date_trunc('month', ts)::date"}
+    else:
+        periods = {"week": "date(ts, '-6 days', 'weekday 1')", "month": "date(ts, 'start of month')"}
+    for grain, period in periods.items():
+        op.execute(
+            f"""
+            INSERT INTO ledger_rollups (grain, entry_type, period_start, startup_id, amount_cents, entry_count)
+            SELECT '{grain}', entry_type, {period}, COALESCE(startup_id, 0), SUM(amount_cents), COUNT(*)
+            FROM ledger_entries
+            GROUP BY entry_type, {period}, COALESCE(startup_id, 0)
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ledger_rollups_startup", table_name="ledger_rollups")
+    op.drop_table("ledger_rollups")
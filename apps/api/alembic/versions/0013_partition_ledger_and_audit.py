@@ -0,0 +1,138 @@
+"""partition ledger and audit tables by month
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2024-09-16 00:00:00.000000
+"""
+
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+# Months of partitions created past the current one; later months come from scripts/ledger_partitions.py.
+MONTHS_AHEAD = 3
+
+
+def _columns(table: str) -> list:
+    sequence = sa.text(f"nextval('{table}_id_seq'::regclass)")
+    if table == "ledger_entries":
+        return [
+            sa.Column("id", sa.Integer, server_default=sequence, nullable=False),
+            sa.Column("ts", sa.DateTime, nullable=False),
+            sa.Column("entry_type", sa.String(length=50), nullable=False),
+            sa.Column("actor_user_id", sa.Integer),
+            sa.Column("startup_id", sa.Integer),
+            sa.Column("round_id", sa.Integer),
+            sa.Column("contract_id", sa.Integer),
+            sa.Column("amount_cents", sa.Integer, nullable=False),
+            sa.Column("metadata_json", sa.Text),
+        ]
+    return [
+        sa.Column("id", sa.Integer, server_default=sequence, nullable=False),
+        sa.Column("ts", sa.DateTime, nullable=False),
+        sa.Column("actor_user_id", sa.Integer),
+        sa.Column("action", sa.String(length=255), nullable=False),
+        sa.Column("entity_type", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", sa.Integer, nullable=False),
+        sa.Column("metadata_json", sa.Text),
+    ]
+
+
+# Unpartitioned b-tree indexes, as of 0011.
+_PLAIN_INDEXES = {
+    "ledger_entries": [
+        ("ix_ledger_entries_ts_id", ["ts", "id"]),
+        ("ix_ledger_entries_type_ts_id", ["entry_type", "ts", "id"]),
+    ],
+    "audit_logs": [],
+}
+# BRIN on ts for time-bounded scans; b-trees on the hot references, and on (ts, id) for the ledger's
+# keyset pages and exports, which read in that order.
+_PARTITIONED_INDEXES = {
+    "ledger_entries": [
+        ("ix_ledger_entries_ts_brin", ["ts"], "brin"),
+        ("ix_ledger_entries_ts_id", ["ts", "id"], "btree"),
+        ("ix_ledger_entries_type_ts_id", ["entry_type", "ts", "id"], "btree"),
+        ("ix_ledger_entries_startup_id", ["startup_id"], "btree"),
+        ("ix_ledger_entries_round_id", ["round_id"], "btree"),
+        ("ix_ledger_entries_contract_id", ["contract_id"], "btree"),
+    ],
+    "audit_logs": [
+        ("ix_audit_logs_ts_brin", ["ts"], "brin"),
+        ("ix_audit_logs_actor_user_id", ["actor_user_id"], "btree"),
+        ("ix_audit_logs_entity", ["entity_type", "entity_id"], "btree"),
+    ],
+}
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _copy(source: str, target: str, table: str) -> None:
+    names = ", ".join(column.name for column in _columns(table))
+    op.execute(f"INSERT INTO {target} ({names}) SELECT {names} FROM {source}")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {target}.id")
+    op.execute(f"DROP TABLE {source}")
+
+
+def _partition(table: str) -> None:
+    # Swaps the table for a copy partitioned by month of ts: one partition per month from the oldest
+    # row through MONTHS_AHEAD months from now, plus a default partition for anything outside them.
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned")
+    op.execute(f"ALTER TABLE {table}_unpartitioned RENAME CONSTRAINT {table}_pkey TO {table}_unpartitioned_pkey")
+    for name, _ in _PLAIN_INDEXES[table]:
+        op.drop_index(name, table_name=f"{table}_unpartitioned")
+    oldest = op.get_bind().execute(sa.text(f"SELECT min(ts) FROM {table}_unpartitioned")).scalar()
+    current = datetime.utcnow().date().replace(day=1)
+    month = min(oldest.date().replace(day=1), current) if oldest else current
+
+    op.create_table(
+        table,
+        *_columns(table),
+        sa.PrimaryKeyConstraint("id", "ts", name=f"{table}_pkey"),
+        postgresql_partition_by="RANGE (ts)",
+    )
+    while month <= _add_months(current, MONTHS_AHEAD):
+        op.execute(
+            f"CREATE TABLE {table}_{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+        )
+        month = _add_months(month, 1)
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    _copy(f"{table}_unpartitioned", table, table)
+    for name, columns, using in _PARTITIONED_INDEXES[table]:
+        op.create_index(name, table, columns, postgresql_using=using)
+    op.execute(f"ANALYZE {table}")
+
+
+def _unpartition(table: str) -> None:
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+    op.execute(f"ALTER TABLE {table}_partitioned RENAME CONSTRAINT {table}_pkey TO {table}_partitioned_pkey")
+    for name, _, _ in _PARTITIONED_INDEXES[table]:
+        op.drop_index(name, table_name=f"{table}_partitioned")
+    op.create_table(table, *_columns(table), sa.PrimaryKeyConstraint("id", name=f"{table}_pkey"))
+    _copy(f"{table}_partitioned", table, table)
+    for name, columns in _PLAIN_INDEXES[table]:
+        op.create_index(name, table, columns)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in ("ledger_entries", "audit_logs"):
+        _partition(table)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in ("ledger_entries", "audit_logs"):
+        _unpartition(table)
@@ -0,0 +1,27 @@
+"""cache version stamps
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2024-09-23 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    cache_versions = op.create_table(
+        "cache_versions",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("version", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.bulk_insert(cache_versions, [{"name": "principals", "version": 0}])
+
+
+def downgrade() -> None:
+    op.drop_table("cache_versions")
@@ -0,0 +1,34 @@
+"""token versions and revocation list
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2024-09-30 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("token_version", sa.Integer, nullable=False, server_default="0"))
+    op.create_table(
+        "token_revocations",
+        sa.Column("jti", sa.String(length=64), primary_key=True),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("expires_at", sa.DateTime, nullable=False),
+    )
+    op.create_index("ix_token_revocations_expires_at", "token_revocations", ["expires_at"])
+    cache_versions = sa.table("cache_versions", sa.column("name", sa.String), sa.column("version", sa.Integer))
+    op.bulk_insert(cache_versions, [{"name": "revocations", "version": 0}])
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM cache_versions WHERE name = 'revocations'")
+    op.drop_index("ix_token_revocations_expires_at", table_name="token_revocations")
+    op.drop_table("token_revocations")
+    op.drop_column("users", "token_version")
@@ -0,0 +1,44 @@
+"""hot path indexes
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2024-10-07 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+# Foreign keys and filters on the request paths, as tests/test_query_plans.py checks them. rounds.status
+# is already covered by ix_rounds_status_id (0005), and revenue_reports(startup_id, month_start) by 0008.
+INDEXES = [
+    ("ix_investments_round_id", "investments", ["round_id"]),
+    ("ix_investments_investor_user_id", "investments", ["investor_user_id"]),
+    ("ix_contracts_investment_id", "contracts", ["investment_id"]),
+    ("ix_contracts_status", "contracts", ["status"]),
+    ("ix_tier_options_round_tier", "tier_options", ["round_id", "tier"]),
+    ("ix_revenue_reports_startup_month_label", "revenue_reports", ["startup_id", "month"]),
+    ("ix_payouts_contract_id", "payouts", ["contract_id"]),
+    ("ix_documents_startup_id", "documents", ["startup_id"]),
+    ("ix_startups_founder_user_id", "startups", ["founder_user_id"]),
+    ("ix_applications_startup_status", "applications", ["startup_id", "status"]),
+    ("ix_reservations_investor", "reservations", ["investor_user_id", "id"]),
+    ("ix_exits_contract_id", "exits", ["contract_id"]),
+]
+
+
+# Built concurrently, outside the migration's transaction, so writes to these tables carry on during the
+# builds. A build that fails leaves an invalid index behind: drop it before rerunning.
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -1,28 +1,35 @@
-from datetime import datetime
+from collections import defaultdict
+from datetime import date, datetime
 import json
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
-from app.auth.router import get_current_user
-from app.db import get_db
+from app.auth.router import get_current_claims
+from app.db import SessionLocal, get_db
 from app.models import (
     Application,
     Document,
     Round,
-    LedgerEntry,
     RevenueReport,
-    Distribution,
-    Contract,
-    Investment,
-    Payout,
     ExitRequest,
+    StartupSummary,
     User,
 )
-from app.providers.payments import payout_investor
+from app.distributions import service as distribution_service
+from app.exits.service import settle_contract
+from app.distributions import preview as distribution_preview
+from app.ledger import export as ledger_export
+from app.ledger import rollups as ledger_rollups
+from app.ledger.export import LedgerFilters
+from app.ledger.writer import ledger_writer
 from app.auth.security import hash_password
 from app.algorithm.service import calculate_tiers
 from app.models import TierOption, Startup
+from app.settings import settings
+from app.startups import summary
 
 router = APIRouter()
 
@@ -32,25 +39,66 @@ def require_admin(current_user):
         raise HTTPException(status_code=403, detail="Forbidden")
 
 
+def _application_cursor(application: Application) -> str:
+    return f"{application.submitted_at.isoformat()}_{application.id}"
+
+
+def _parse_application_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        submitted_at, application_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(submitted_at), int(application_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
 @router.get("/applications")
-def applications(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def applications(
+    status: str | None = None,
+    order: str = "oldest",
+    cursor: str | None = None,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_claims),
+):
     require_admin(current_user)
-    apps = db.query(Application).all()
-    return [
-        {
-            "application_code": f"APP-{app.id:04d}",
-            "status": app.status,
-            "startup_code": f"STP-{app.startup_id:04d}",
-            "name": app.name,
-            "application_type": app.application_type,
-            "requested_limit_cents": app.requested_limit_cents,
-            "documents": [
-                {"doc_type": doc.doc_type, "filename": doc.filename}
-                for doc in db.query(Document).filter(Document.startup_id == app.startup_id).all()
-            ],
-        }
-        for app in apps
-    ]
+    if order not in {"oldest", "newest"}:
+        raise HTTPException(status_code=400, detail="Invalid order")
+    limit = max(1, min(limit, 200))
+    # Only submitted applications are in the queue; drafts have no submitted_at. Keyset pagination on
+    # (submitted_at, id) is a range scan of ix_applications_status_submitted, or of
+    # ix_applications_submitted without a status filter.
+    key = tuple_(Application.submitted_at, Application.id)
+    query = db.query(Application).filter(Application.submitted_at.is_not(None))
+    if order == "newest":
+        query = query.order_by(Application.submitted_at.desc(), Application.id.desc())
+    else:
+        query = query.order_by(Application.submitted_at, Application.id)
+    if status:
+        query = query.filter(Application.status == status)
+    if cursor:
+        position = _parse_application_cursor(cursor)
+        query = query.filter(key < position if order == "newest" else key > position)
+    rows = query.limit(limit + 1).all()
+    page = rows[:limit]
+    documents = defaultdict(list)
+    for doc in db.query(Document).filter(Document.startup_id.in_({app.startup_id for app in page})).order_by(Document.id):
+        documents[doc.startup_id].append({"doc_type": doc.doc_type, "filename": doc.filename})
+    return {
+        "applications": [
+            {
+                "application_code": f"APP-{app.id:04d}",
+                "status": app.status,
+                "startup_code": f"STP-{app.startup_id:04d}",
+                "name": app.name,
+                "application_type": app.application_type,
+                "requested_limit_cents": app.requested_limit_cents,
+                "submitted_at": app.submitted_at,
+                "documents": documents[app.startup_id],
+            }
+            for app in page
+        ],
+        "next_cursor": _application_cursor(page[-1]) if len(rows) > limit else None,
+    }
 
 
 class ApplicationDecision(BaseModel):
@@ -58,7 +106,7 @@ class ApplicationDecision(BaseModel):
 
 
 @router.post("/applications/{application_id}/approve")
-def approve_application(application_id: int, payload: ApplicationDecision, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def approve_application(application_id: int, payload: ApplicationDecision, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     require_admin(current_user)
     app = db.query(Application).filter(Application.id == application_id).first()
     if not app or app.status != "submitted":
@@ -67,13 +115,13 @@ def approve_application(application_id: int, payload: ApplicationDecision, db: S
     app.reviewed_at = datetime.utcnow()
     app.reviewer_id = current_user.id
     app.admin_notes = payload.notes
-    db.add(LedgerEntry(entry_type="application_approved", actor_user_id=current_user.id, startup_id=app.startup_id, amount_cents=0))
+    ledger_writer(db).add(entry_type="application_approved", actor_user_id=current_user.id, startup_id=app.startup_id, amount_cents=0)
     db.commit()
     return {"status": app.status}
 
 
 @router.post("/applications/{application_id}/deny")
-def deny_application(application_id: int, payload: ApplicationDecision, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def deny_application(application_id: int, payload: ApplicationDecision, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     require_admin(current_user)
     app = db.query(Application).filter(Application.id == application_id).first()
     if not app or app.status != "submitted":
@@ -87,7 +135,7 @@ def deny_application(application_id: int, payload: ApplicationDecision, db: Sess
 
 
 @router.get("/rounds")
-def rounds(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def rounds(db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     require_admin(current_user)
     rounds = db.query(Round).all()
     return [
@@ -101,75 +149,194 @@ def rounds(db: Session = Depends(get_db), current_user=Depends(get_current_user)
 
 
 @router.post("/rounds/{round_id}/close")
-def close_round(round_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def close_round(round_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     require_admin(current_user)
     round_obj = db.query(Round).filter(Round.id == round_id).first()
     if not round_obj:
         raise HTTPException(status_code=404, detail="Round not found")
     round_obj.status = "closed"
+    summary.record(db, round_obj.startup_id, round_status_changed=True)
     db.commit()
     return {"status": round_obj.status}
 
 
-@router.get("/ledger")
-def ledger(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+@router.get("/startups")
+def startups(db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     require_admin(current_user)
-    entries = db.query(LedgerEntry).all()
+    rows = (
+        db.query(Startup, StartupSummary)
+        .outerjoin(StartupSummary, StartupSummary.startup_id == Startup.id)
+        .order_by(Startup.id)
+        .all()
+    )
     return [
         {
-            "entry_code": f"LED-{entry.id:04d}",
-            "type": entry.entry_type,
-            "amount_cents": entry.amount_cents,
+            "startup_code": f"STP-{startup.id:04d}",
+            "name": startup.operating_name or startup.legal_name,
+            "status": startup.status,
+            "total_raised_cents": startup_summary.total_raised_cents if startup_summary else 0,
+            "live_round_code": (
+                f"RND-{startup_summary.live_round_id:04d}"
+                if startup_summary and startup_summary.live_round_id
+                else None
+            ),
+            "last_revenue_month": startup_summary.last_revenue_month if startup_summary else None,
+            "total_distributed_cents": startup_summary.total_distributed_cents if startup_summary else 0,
+            "active_contract_count": startup_summary.active_contract_count if startup_summary else 0,
         }
-        for entry in entries
+        for startup, startup_summary in rows
     ]
 
 
+@router.get("/ledger")
+def ledger(
+    entry_type: str | None = None,
+    ts_from: datetime | None = Query(default=None, alias="from"),
+    ts_to: datetime | None = Query(default=None, alias="to"),
+    cursor: str | None = None,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_claims),
+):
+    require_admin(current_user)
+    try:
+        page = ledger_export.ledger_page(
+            db, LedgerFilters(entry_type=entry_type, ts_from=ts_from, ts_to=ts_to), cursor=cursor, limit=max(1, min(limit, 1000))
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    return {
+        "entries": [
+            {
+                "entry_code": f"LED-{entry['id']:04d}",
+                "type": entry["entry_type"],
+                "amount_cents": entry["amount_cents"],
+                "ts": entry["ts"],
+            }
+            for entry in page["entries"]
+        ],
+        "next_cursor": page["next_cursor"],
+    }
+
+
+@router.get("/ledger/export")
+def export_ledger(
+    format: str = "ndjson",
+    entry_type: str | None = None,
+    ts_from: datetime | None = Query(default=None, alias="from"),
+    ts_to: datetime | None = Query(default=None, alias="to"),
+    current_user=Depends(get_current_claims),
+):
+    require_admin(current_user)
+    exports = {
+        "ndjson": (ledger_export.export_ndjson, "application/x-ndjson"),
+        "csv": (ledger_export.export_csv, "text/csv"),
+    }
+    if format not in exports:
+        raise HTTPException(status_code=400, detail="Format must be ndjson or csv")
+    export, media_type = exports[format]
+    filters = LedgerFilters(entry_type=entry_type, ts_from=ts_from, ts_to=ts_to)
+
+    # The request's session is closed before the body is streamed, so the export reads through its own.
+    def _stream():
+        db = SessionLocal()
+        try:
+            yield from export(db, filters)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        _stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="ledger.{format}"'},
+    )
+
+
+@router.get("/ledger/rollups")
+def ledger_rollup_totals(
+    entry_type: str,
+    grain: str = "month",
+    period_from: date | None = Query(default=None, alias="from"),
+    period_to: date | None = Query(default=None, alias="to"),
+    startup_id: int | None = None,
+    by_startup: bool = False,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_claims),
+):
+    # Totals per week or month from the rollup table, one row per startup and period; defaults to the
+    # current period. Entries not attributed to a startup are reported with a null startup_code.
+    require_admin(current_user)
+    if grain not in ledger_rollups.GRAINS:
+        raise HTTPException(status_code=400, detail="Grain must be week or month")
+    period_to = period_to or datetime.utcnow().date()
+    period_from = period_from or period_to
+    if period_from > period_to:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+    if len(ledger_rollups.periods(grain, period_from, period_to)) > 120:
+        raise HTTPException(status_code=400, detail="At most 120 periods per request")
+    totals = ledger_rollups.rollup_totals(
+        db, entry_type, grain, period_from, period_to, startup_id=startup_id, by_startup=by_startup
+    )
+    for period in totals:
+        if by_startup:
+            period["startups"] = [
+                {
+                    "startup_code": f"STP-{row['startup_id']:04d}" if row["startup_id"] else None,
+                    "amount_cents": row["amount_cents"],
+                    "entry_count": row["entry_count"],
+                }
+                for row in period["startups"]
+            ]
+    return {"entry_type": entry_type, "grain": grain, "periods": totals}
+
+
 class DistributionRun(BaseModel):
     startup_id: int
     month: str
 
 
 @router.post("/distributions/run")
-def run_distribution(payload: DistributionRun, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def run_distribution(payload: DistributionRun, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     require_admin(current_user)
-    contracts = (
-        db.query(Contract)
-        .join(Investment)
-        .join(Round)
-        .filter(Round.startup_id == payload.startup_id, Contract.status == "active")
-        .all()
-    )
-    distribution = Distribution(
-        startup_id=payload.startup_id,
-        month=payload.month,
-        total_distributed_cents=0,
-        created_by=current_user.id,
+    try:
+        distribution = distribution_service.run_distribution(db, payload.startup_id, payload.month, current_user.id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {
+        "distribution_code": f"DIST-{distribution.id:04d}",
+        "status": distribution.status,
+        "total_distributed_cents": distribution.total_distributed_cents,
+    }
+
+
+@router.get("/distributions/preview")
+def preview_distribution(
+    startup_id: int,
+    month: str,
+    offset: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_claims),
+):
+    require_admin(current_user)
+    try:
+        preview = distribution_preview.get_preview(db, startup_id, month)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return distribution_preview.preview_payload(preview, offset=offset, limit=min(limit, 1000))
+
+
+class MonthEndRun(BaseModel):
+    month: str
+
+
+@router.post("/distributions/month-end")
+def run_month_end(payload: MonthEndRun, current_user=Depends(get_current_claims)):
+    require_admin(current_user)
+    # Returns once the request budget is spent; remaining_count > 0 means the month needs another call.
+    return distribution_service.run_month_end(
+        payload.month, current_user.id, budget_seconds=settings.distribution_request_budget_seconds
     )
-    db.add(distribution)
-    db.commit()
-    total = 0
-    for contract in contracts:
-        payout_amount = int(contract.principal_cents * 0.02)
-        if contract.paid_to_date_cents >= contract.payout_cap_cents:
-            contract.status = "completed"
-            continue
-        payout_id = payout_investor(db, contract.id, payout_amount)
-        payout = Payout(
-            contract_id=contract.id,
-            distribution_id=distribution.id,
-            amount_cents=payout_amount,
-            payout_id=payout_id,
-        )
-        contract.paid_to_date_cents += payout_amount
-        total += payout_amount
-        db.add(payout)
-    distribution.total_distributed_cents = total
-    reports = db.query(RevenueReport).filter(RevenueReport.startup_id == payload.startup_id, RevenueReport.month == payload.month).all()
-    for report in reports:
-        report.distribution_status = "distributed"
-    db.commit()
-    return {"distribution_code": f"DIST-{distribution.id:04d}"}
 
 
 class RevenueSimulate(BaseModel):
@@ -179,8 +346,12 @@ class RevenueSimulate(BaseModel):
 
 
 @router.post("/revenue/simulate")
-def simulate_revenue(payload: RevenueSimulate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def simulate_revenue(payload: RevenueSimulate, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     require_admin(current_user)
+    try:
+        distribution_service.ensure_month_open(db, payload.startup_id, payload.month)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     report = RevenueReport(
         startup_id=payload.startup_id,
         month=payload.month,
@@ -189,16 +360,18 @@ def simulate_revenue(payload: RevenueSimulate, db: Session = Depends(get_db), cu
         distribution_status="pending",
     )
     db.add(report)
+    summary.record(db, payload.startup_id, revenue_month=payload.month)
     db.commit()
     return {"report_code": f"REV-{report.id:04d}"}
 
 
 @router.post("/exits/{exit_id}/settle")
-def settle_exit(exit_id: int, settlement_method: str, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def settle_exit(exit_id: int, settlement_method: str, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     require_admin(current_user)
     exit_req = db.query(ExitRequest).filter(ExitRequest.id == exit_id).first()
     if not exit_req:
         raise HTTPException(status_code=404, detail="Exit not found")
+    settle_contract(db, exit_req)
     exit_req.status = "settled"
     exit_req.settlement_method = settlement_method
     exit_req.settled_at = datetime.utcnow()
@@ -207,7 +380,7 @@ def settle_exit(exit_id: int, settlement_method: str, db: Session = Depends(get_
 
 
 @router.post("/demo/seed")
-def seed_demo(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def seed_demo(db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     require_admin(current_user)
     if db.query(User).count() > 1:
         return {"status": "already_seeded"}
@@ -248,6 +421,7 @@ def seed_demo(db: Session = Depends(get_db), current_user=Depends(get_current_us
         requested_limit_cents=5000000,
         risk_preference="medium",
         status="approved",
+        submitted_at=datetime.utcnow(),
         reviewed_at=datetime.utcnow(),
         reviewer_id=current_user.id,
     )
@@ -279,5 +453,6 @@ def seed_demo(db: Session = Depends(get_db), current_user=Depends(get_current_us
                 explanation_json=tier.explanation_json,
             )
         )
+    summary.rebuild(db, [startup.id])
     db.commit()
     return {"status": "seeded"}
@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+
+@dataclass
+class PayoutAllocation:
+    amounts: np.ndarray
+    completed: np.ndarray
+    expired: np.ndarray
+
+
+def allocate_payouts(
+    gross_revenue_cents: int,
+    pool_ids: np.ndarray,
+    revenue_share_bps: np.ndarray,
+    principal_cents: np.ndarray,
+    payout_cap_cents: np.ndarray,
+    paid_to_date_cents: np.ndarray,
+    end_date_cap: np.ndarray,
+    as_of: datetime,
+) -> PayoutAllocation:
+    # Each pool (a round) receives gross * bps of revenue, split pro-rata by principal across its
+    # eligible contracts. Floor division leaves remainder cents, which go one each to the contracts
+    # with the largest fractional remainder. Amounts are then clipped to each contract's cap.
+    n = len(principal_cents)
+    principal_cents = np.asarray(principal_cents, dtype=np.int64)
+    payout_cap_cents = np.asarray(payout_cap_cents, dtype=np.int64)
+    paid_to_date_cents = np.asarray(paid_to_date_cents, dtype=np.int64)
+    end_date_cap = np.asarray(end_date_cap, dtype="datetime64[us]")
+    expired = ~np.isnat(end_date_cap) & (end_date_cap < np.datetime64(as_of, "us"))
+    room = np.maximum(payout_cap_cents - paid_to_date_cents, 0)
+    if n == 0:
+        empty = np.zeros(0, dtype=bool)
+        return PayoutAllocation(amounts=np.zeros(0, dtype=np.int64), completed=empty, expired=empty)
+
+    pool_ids = np.asarray(pool_ids)
+    if (pool_ids[1:] < pool_ids[:-1]).any():
+        order = np.argsort(pool_ids, kind="stable")
+    else:
+        order = np.arange(n)
+    sorted_pools = pool_ids[order]
+    starts = np.flatnonzero(np.r_[True, sorted_pools[1:] != sorted_pools[:-1]])
+    group = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))
+
+    eligible = (~expired & (room > 0))[order]
+    weights = np.where(eligible, principal_cents[order], 0)
+    pool_weight = np.add.reduceat(weights, starts)
+    pool_bps = np.asarray(revenue_share_bps, dtype=np.int64)[order][starts]
+    pool_cents = np.where(pool_weight > 0, int(gross_revenue_cents) * pool_bps // 10000, 0)
+
+    numerator = pool_cents[group] * weights
+    divisor = np.maximum(pool_weight, 1)[group]
+    base, remainder = np.divmod(numerator, divisor)
+    leftover = pool_cents - np.add.reduceat(base, starts)
+
+    # A pool's leftover is always smaller than its number of contracts with a non-zero remainder,
+    # so a partial selection per pool is enough; pools per startup are few.
+    ends = np.r_[starts[1:], n]
+    for pool in np.flatnonzero(leftover):
+        start, end, k = starts[pool], ends[pool], leftover[pool]
+        top = np.argpartition(-remainder[start:end], k - 1)[:k]
+        base[start + top] += 1
+
+    allocated = np.empty(n, dtype=np.int64)
+    allocated[order] = base
+    amounts = np.minimum(allocated, room)
+    completed = ~expired & (paid_to_date_cents + amounts >= payout_cap_cents)
+    return PayoutAllocation(amounts=amounts, completed=completed, expired=expired)
@@ -0,0 +1,75 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import threading
+
+import bcrypt
+
+from app.settings import settings
+
+# bcrypt reads at most 72 bytes of a password; longer ones are truncated, as passlib did.
+_MAX_BYTES = 72
+
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode()[:_MAX_BYTES], bcrypt.gensalt(rounds)).decode()
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode()[:_MAX_BYTES], hashed_password.encode())
+    except ValueError:
+        return False
+
+
+def hash_cost(hashed_password: str) -> int | None:
+    # "$2b$12$<salt and digest>" -> 12.
+    parts = hashed_password.split("$")
+    return int(parts[2]) if len(parts) == 4 and parts[2].isdigit() else None
+
+
+class PasswordHasher:
+    # Runs bcrypt in a pool of worker processes, so hashing uses every core and does not hold up the
+    # threads serving requests. At most max_pending hashes are queued or running at once; callers past
+    # that wait for a slot. The pool starts on first use.
+    def __init__(self, workers: int | None = None, rounds: int | None = None, max_pending: int | None = None):
+        self.workers = workers or settings.password_hash_workers or os.cpu_count() or 1
+        self.rounds = rounds or settings.password_hash_rounds
+        self._slots = threading.BoundedSemaphore(max_pending or self.workers * 2)
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Spawned rather than forked: the server forking would copy its threads' locks.
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _run(self, fn, *args):
+        with self._slots:
+            return self._executor().submit(fn, *args).result()
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password, self.rounds)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self._run(_verify, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return hash_cost(hashed_password) != self.rounds
+
+    def start(self) -> None:
+        # Starts the worker processes ahead of the first login instead of during it.
+        pool = self._executor()
+        for future in [pool.submit(_verify, "", "") for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from threading import Lock
+import time
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.auth.security import decode_token
+from app.cache import TTLCache, VersionStamp, bump_stamp, on_commit
+from app.models import User
+from app.settings import settings
+
+STAMP = "principals"
+# Fields of User a principal carries; a change to role or country must reach every worker.
+_WATCHED = ("role", "country")
+
+
+@dataclass(frozen=True)
+class Principal:
+    # The authenticated user as handlers see it: an immutable snapshot, safe to share between requests.
+    id: int
+    email: str
+    role: str
+    country: str
+
+
+@dataclass(frozen=True)
+class Claims:
+    # The caller as the signed token states it, for endpoints that need no more than id and role.
+    id: int
+    role: str
+
+
+class PrincipalCache:
+    # Per-worker cache of principals by user id, and of verified token payloads by token. A write to a
+    # user's role or country drops the entry in the writing worker on commit and bumps the principals
+    # stamp; other workers read the stamp at most once per principal_stamp_seconds and start over when
+    # it moved, so a change reaches them within that interval instead of after the TTL.
+    def __init__(self, maxsize: int = 10000, ttl_seconds: float | None = None, stamp_seconds: float | None = None):
+        ttl_seconds = ttl_seconds or settings.principal_cache_seconds
+        self._principals = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self._tokens = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self._stamp = VersionStamp(STAMP, stamp_seconds or settings.principal_stamp_seconds)
+        self._lock = Lock()
+        self._generation = 0
+
+    def payload(self, token: str) -> dict:
+        # Raises ValueError for an invalid or expired token.
+        payload = self._tokens.get(token)
+        if payload is None or payload["exp"] <= time.time():
+            payload = decode_token(token)
+            self._tokens.set(token, payload)
+        return payload
+
+    def principal(self, db: Session, user_id: int) -> Principal | None:
+        if self._stamp.changed(db):
+            self.invalidate()
+        principal = self._principals.get(user_id)
+        if principal is not None:
+            return principal
+        generation = self._generation
+        row = db.execute(select(User.id, User.email, User.role, User.country).where(User.id == user_id)).one_or_none()
+        if row is None:
+            return None
+        principal = Principal(*row)
+        # Not cached if an invalidation ran while the row was read: the row may predate it.
+        with self._lock:
+            if generation == self._generation:
+                self._principals.set(user_id, principal)
+        return principal
+
+    def invalidate(self, user_ids=None) -> None:
+        with self._lock:
+            self._generation += 1
+            if user_ids is None:
+                self._principals.clear()
+            else:
+                for user_id in user_ids:
+                    self._principals.invalidate(user_id)
+
+    def clear(self) -> None:
+        self.invalidate()
+        self._tokens.clear()
+        self._stamp.reset()
+
+
+principal_cache = PrincipalCache()
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_changed_principals(session: Session, flush_context) -> None:
+    # Covers ORM writes; a bulk UPDATE of users must call bump_stamp itself.
+    user_ids = [
+        obj.id
+        for obj in session.dirty
+        if isinstance(obj, User) and any(inspect(obj).attrs[name].history.has_changes() for name in _WATCHED)
+    ]
+    if user_ids:
+        bump_stamp(session, STAMP)
+        on_commit(session, lambda: principal_cache.invalidate(user_ids))
@@ -0,0 +1,82 @@
+from datetime import datetime
+from threading import Lock
+
+from sqlalchemy import delete, event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.cache import VersionStamp, bump_stamp, on_commit
+from app.models import TokenRevocation, User
+from app.settings import settings
+
+STAMP = "revocations"
+
+
+class RevocationList:
+    # Per-worker copy of the revoked token ids and of every user's token version, so a token is checked
+    # without a query. A token is rejected once its id is revoked (logout) or its "ver" claim is below
+    # the user's token_version (role change). Revocations bump a stamp; every worker reloads the list
+    # within principal_stamp_seconds of a revocation elsewhere, and at once for its own.
+    def __init__(self, stamp_seconds: float | None = None):
+        self._stamp = VersionStamp(STAMP, stamp_seconds or settings.principal_stamp_seconds)
+        self._revoked: set[str] = set()
+        self._versions: dict[int, int] = {}
+        self._lock = Lock()
+
+    def check(self, db: Session, payload: dict) -> None:
+        # Raises ValueError for a revoked token.
+        if self._stamp.changed(db):
+            self._load(db)
+        if payload.get("jti") in self._revoked or payload.get("ver", 0) < self._versions.get(int(payload["sub"]), 0):
+            raise ValueError("Token revoked")
+
+    def _load(self, db: Session) -> None:
+        revoked = set(db.scalars(select(TokenRevocation.jti).where(TokenRevocation.expires_at > datetime.utcnow())))
+        versions = dict(db.execute(select(User.id, User.token_version).where(User.token_version > 0)).all())
+        with self._lock:
+            self._revoked, self._versions = revoked, versions
+
+    def revoke(self, db: Session, payload: dict) -> None:
+        # Revokes the token until it expires; a token issued without an id revokes every token of its
+        # user instead. Does not commit.
+        user_id = int(payload["sub"])
+        jti = payload.get("jti")
+        if jti is None:
+            user = db.get(User, user_id)
+            user.token_version += 1
+            return
+        db.execute(delete(TokenRevocation).where(TokenRevocation.expires_at <= datetime.utcnow()))
+        db.add(TokenRevocation(jti=jti, user_id=user_id, expires_at=datetime.utcfromtimestamp(payload["exp"])))
+        bump_stamp(db, STAMP)
+        on_commit(db, lambda: self._revoked.add(jti))
+
+    def set_versions(self, versions: dict[int, int]) -> None:
+        with self._lock:
+            self._versions.update(versions)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked, self._versions = set(), {}
+        self._stamp.reset()
+
+
+revocation_list = RevocationList()
+
+
+@event.listens_for(Session, "before_flush")
+def _revoke_on_role_change(session: Session, flush_context, instances) -> None:
+    # Tokens carry the role they were issued with, so a role change retires them.
+    for obj in session.dirty:
+        if isinstance(obj, User) and inspect(obj).attrs.role.history.has_changes():
+            obj.token_version = (obj.token_version or 0) + 1
+
+
+@event.listens_for(Session, "after_flush")
+def _publish_token_versions(session: Session, flush_context) -> None:
+    versions = {
+        obj.id: obj.token_version
+        for obj in session.dirty
+        if isinstance(obj, User) and inspect(obj).attrs.token_version.history.has_changes()
+    }
+    if versions:
+        bump_stamp(session, STAMP)
+        on_commit(session, lambda: revocation_list.set_versions(versions))
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Header
 from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.db import get_db
 from app.models import User
-from app.auth.security import create_access_token, verify_password, hash_password, decode_token
+from app.auth.principals import Claims, Principal, principal_cache
+from app.auth.revocations import revocation_list
+from app.auth.passwords import password_hasher
+from app.auth.security import create_access_token, verify_password, hash_password
 from app.settings import settings
 
 router = APIRouter()
@@ -30,6 +34,7 @@ class AuthResponse(BaseModel):
 
 
 def ensure_admin(db: Session) -> None:
+    # Run once at startup (app.main). Several workers may start together; one of them creates the admin.
     admin = db.query(User).filter(User.email == settings.admin_email).first()
     if not admin:
         db.add(
@@ -40,25 +45,50 @@ def ensure_admin(db: Session) -> None:
                 country=settings.country_mode,
             )
         )
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
 
 
-def get_current_user(
-    authorization: str | None = Header(default=None), db: Session = Depends(get_db)
-) -> User:
+def _verified_payload(authorization: str | None, db: Session) -> dict:
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing auth token")
     token = authorization.replace("Bearer ", "")
-    payload = decode_token(token)
-    user = db.query(User).filter(User.id == int(payload["sub"])).first()
+    try:
+        payload = principal_cache.payload(token)
+        revocation_list.check(db, payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=401, detail="Invalid token") from exc
+    return payload
+
+
+def get_current_claims(
+    authorization: str | None = Header(default=None), db: Session = Depends(get_db)
+) -> Claims:
+    # Id and role straight from the signed token: no query beyond the revocation list's stamp check.
+    # Role changes still apply, as they retire the user's tokens (app.auth.revocations).
+    payload = _verified_payload(authorization, db)
+    return Claims(id=int(payload["sub"]), role=payload["role"])
+
+
+def get_current_user(
+    authorization: str | None = Header(default=None), db: Session = Depends(get_db)
+) -> Principal:
+    # Served from the worker's principal cache: no query on a hit (see app.auth.principals).
+    payload = _verified_payload(authorization, db)
+    user = principal_cache.principal(db, int(payload["sub"]))
     if not user:
         raise HTTPException(status_code=401, detail="Invalid user")
     return user
 
 
+def _issue_token(user: User) -> str:
+    return create_access_token({"sub": str(user.id), "role": user.role, "ver": user.token_version})
+
+
 @router.post("/signup", response_model=AuthResponse)
 def signup(payload: SignupRequest, db: Session = Depends(get_db)):
-    ensure_admin(db)
     if payload.role not in {"founder", "investor"}:
         raise HTTPException(status_code=400, detail="Invalid role")
     if db.query(User).filter(User.email == payload.email).first():
@@ -72,27 +102,41 @@ def signup(payload: SignupRequest, db: Session = Depends(get_db)):
     db.add(user)
     db.commit()
     db.refresh(user)
-    token = create_access_token({"sub": str(user.id), "role": user.role})
+    token = _issue_token(user)
     return AuthResponse(access_token=token, role=user.role, company_name=settings.company_name)
 
 
 @router.post("/login", response_model=AuthResponse)
 def login(payload: AuthRequest, db: Session = Depends(get_db)):
-    ensure_admin(db)
     user = db.query(User).filter(User.email == payload.email).first()
     if not user or not verify_password(payload.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    token = create_access_token({"sub": str(user.id), "role": user.role})
+    # Brings the stored hash to the configured cost, now that the password is at hand.
+    if password_hasher.needs_rehash(user.hashed_password):
+        user.hashed_password = hash_password(payload.password)
+        db.commit()
+    token = _issue_token(user)
     return AuthResponse(access_token=token, role=user.role, company_name=settings.company_name)
 
 
 @router.post("/logout")
-def logout():
+def logout(authorization: str | None = Header(default=None), db: Session = Depends(get_db)):
+    # Always succeeds: a missing, invalid, expired or already revoked token has nothing left to revoke.
+    try:
+        payload = _verified_payload(authorization, db)
+    except HTTPException:
+        return {"status": "ok"}
+    revocation_list.revoke(db, payload)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Revoked by a concurrent logout with the same token.
+        db.rollback()
     return {"status": "ok"}
 
 
 @router.get("/me")
-def me(current_user: User = Depends(get_current_user)):
+def me(current_user: Principal = Depends(get_current_user)):
     return {
         "user_code": f"USR-{current_user.id:04d}",
         "email": current_user.email,
@@ -1,24 +1,24 @@
 from datetime import datetime, timedelta
+from uuid import uuid4
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 
+from app.auth.passwords import password_hasher
 from app.settings import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(password, hashed_password)
+    return password_hasher.verify(password, hashed_password)
 
 
 def create_access_token(data: dict, expires_minutes: int | None = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=expires_minutes or settings.jwt_expire_minutes)
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", uuid4().hex)
     return jwt.encode(to_encode, settings.jwt_secret, algorithm="HS256")
 
 
@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from threading import Lock
+import time
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models import CacheVersion
+
+
+class TTLCache:
+    # In-process LRU with a per-entry time-to-live. Entries are per worker; the TTL bounds how long
+    # another worker's write can go unnoticed.
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class VersionStamp:
+    # Follows one cache_versions row for a per-worker cache. changed() reads the row at most once per
+    # interval, so other workers' writes are noticed within the interval at one query per interval.
+    def __init__(self, name: str, interval_seconds: float):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self._version: int | None = None
+        self._checked_at = float("-inf")
+
+    def changed(self, db: Session) -> bool:
+        if time.monotonic() - self._checked_at < self.interval_seconds:
+            return False
+        version = db.execute(select(CacheVersion.version).where(CacheVersion.name == self.name)).scalar() or 0
+        self._checked_at = time.monotonic()
+        changed, self._version = version != self._version, version
+        return changed
+
+    def reset(self) -> None:
+        self._version, self._checked_at = None, float("-inf")
+
+
+def bump_stamp(session: Session, name: str) -> None:
+    # Moves the stamp inside the session's transaction; other workers see it once that commits.
+    dialect_insert = postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = dialect_insert(CacheVersion).values(name=name, version=1)
+    session.connection().execute(
+        statement.on_conflict_do_update(index_elements=[CacheVersion.name], set_={"version": CacheVersion.version + 1})
+    )
+
+
+def on_commit(session: Session, callback) -> None:
+    # Defer cache invalidation until the writing transaction commits, so a concurrent reader cannot
+    # repopulate the cache from rows that are about to change.
+    session.info.setdefault("on_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit(session: Session) -> None:
+    for callback in session.info.pop("on_commit", []):
+        callback()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_commit(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop("on_commit", None)
@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import chain
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.cache import TTLCache, on_commit
+from app.distributions.service import pending_revenue_cents, load_contract_state, allocate
+from app.models import Contract, RevenueReport
+from app.settings import settings
+
+
+@dataclass
+class DistributionPreview:
+    startup_id: int
+    month: str
+    gross_revenue_cents: int
+    computed_at: datetime
+    contract_ids: np.ndarray
+    paid_to_date_cents: np.ndarray
+    payout_cap_cents: np.ndarray
+    amounts: np.ndarray
+    completed: np.ndarray
+    expired: np.ndarray
+
+
+_cache = TTLCache(maxsize=256, ttl_seconds=settings.preview_cache_seconds)
+
+
+def get_preview(db: Session, startup_id: int, month: str) -> DistributionPreview:
+    key = (startup_id, month)
+    preview = _cache.get(key)
+    if preview is not None:
+        return preview
+    gross_revenue_cents = pending_revenue_cents(db, startup_id, month)
+    if gross_revenue_cents is None:
+        raise ValueError("No pending revenue report")
+    state = load_contract_state(db, startup_id)
+    computed_at = datetime.utcnow()
+    allocation = allocate(state, gross_revenue_cents, computed_at)
+    preview = DistributionPreview(
+        startup_id=startup_id,
+        month=month,
+        gross_revenue_cents=gross_revenue_cents,
+        computed_at=computed_at,
+        contract_ids=state["id"],
+        paid_to_date_cents=state["paid_to_date_cents"],
+        payout_cap_cents=state["payout_cap_cents"],
+        amounts=allocation.amounts,
+        completed=allocation.completed,
+        expired=allocation.expired,
+    )
+    _cache.set(key, preview)
+    return preview
+
+
+def preview_payload(preview: DistributionPreview, offset: int = 0, limit: int = 100) -> dict:
+    # Totals cover every contract; the per-contract list is paged so large startups stay cheap to serve.
+    page = slice(offset, offset + limit)
+    return {
+        "startup_code": f"STP-{preview.startup_id:04d}",
+        "month": preview.month,
+        "gross_revenue_cents": preview.gross_revenue_cents,
+        "projected_total_cents": int(preview.amounts.sum()),
+        "contract_count": len(preview.contract_ids),
+        "paying_count": int((preview.amounts > 0).sum()),
+        "reaching_cap": [f"CTR-{contract_id:04d}" for contract_id in preview.contract_ids[preview.completed].tolist()],
+        "completing": [
+            f"CTR-{contract_id:04d}"
+            for contract_id in preview.contract_ids[preview.completed | preview.expired].tolist()
+        ],
+        "computed_at": preview.computed_at,
+        "payouts": [
+            {
+                "contract_code": f"CTR-{contract_id:04d}",
+                "amount_cents": amount_cents,
+                "paid_to_date_cents": paid_to_date_cents + amount_cents,
+                "payout_cap_cents": payout_cap_cents,
+                "reaches_cap": reaches_cap,
+                "expired": expired,
+            }
+            for contract_id, amount_cents, paid_to_date_cents, payout_cap_cents, reaches_cap, expired in zip(
+                preview.contract_ids[page].tolist(),
+                preview.amounts[page].tolist(),
+                preview.paid_to_date_cents[page].tolist(),
+                preview.payout_cap_cents[page].tolist(),
+                preview.completed[page].tolist(),
+                preview.expired[page].tolist(),
+            )
+        ],
+    }
+
+
+def invalidate(startup_id: int | None = None) -> None:
+    if startup_id is None:
+        _cache.clear()
+    else:
+        _cache.invalidate_where(lambda key: key[0] == startup_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed(session: Session, flush_context) -> None:
+    # A changed report names its startup; a changed contract would need a join to find it, and
+    # contract writes are rare next to preview reads, so those clear every cached preview.
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, RevenueReport):
+            on_commit(session, lambda startup_id=obj.startup_id: invalidate(startup_id))
+        elif isinstance(obj, Contract):
+            on_commit(session, invalidate)
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_bulk(orm_execute_state) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_insert or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (Contract, RevenueReport):
+        on_commit(orm_execute_state.session, invalidate)
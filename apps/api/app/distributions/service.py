@@ -0,0 +1,310 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime
+import time
+
+import numpy as np
+from sqlalchemy import Boolean, Integer, select, update, insert, func, and_, or_, bindparam, case
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.algorithm.payouts import allocate_payouts, PayoutAllocation
+from app.db import SessionLocal
+from app.models import Contract, Investment, Round, Distribution, Payout, RevenueReport
+from app.providers.payments import payout_investors
+from app.settings import settings
+from app.startups import summary
+
+
+def pending_revenue_cents(db: Session, startup_id: int, month: str) -> int | None:
+    return db.execute(
+        select(func.sum(RevenueReport.gross_revenue_cents)).where(
+            RevenueReport.startup_id == startup_id,
+            RevenueReport.month == month,
+            RevenueReport.distribution_status == "pending",
+        )
+    ).scalar()
+
+
+def load_contract_state(db: Session, startup_id: int, distribution_id: int | None = None) -> dict[str, np.ndarray]:
+    # Contracts already paid by this distribution are included with that payout subtracted back out,
+    # so a resumed run sees the same eligibility and pro-rata weights as the original attempt.
+    paid_to_date_cents = Contract.paid_to_date_cents
+    if distribution_id is not None:
+        paid_to_date_cents = Contract.paid_to_date_cents - func.coalesce(Payout.amount_cents, 0)
+    query = (
+        select(
+            Contract.id,
+            Investment.round_id,
+            Contract.revenue_share_bps,
+            Contract.principal_cents,
+            Contract.payout_cap_cents,
+            paid_to_date_cents,
+            Contract.end_date_cap,
+        )
+        .join(Investment, Investment.id == Contract.investment_id)
+        .join(Round, Round.id == Investment.round_id)
+        .where(Round.startup_id == startup_id)
+        .order_by(Investment.round_id, Contract.id)
+    )
+    if distribution_id is None:
+        query = query.where(Contract.status == "active")
+    else:
+        query = query.outerjoin(
+            Payout, and_(Payout.contract_id == Contract.id, Payout.distribution_id == distribution_id)
+        ).where(or_(Contract.status == "active", Payout.id.is_not(None)))
+    rows = db.execute(query).all()
+    columns = list(zip(*rows)) or [()] * 7
+    return {
+        "id": np.array(columns[0], dtype=np.int64),
+        "round_id": np.array(columns[1], dtype=np.int64),
+        "revenue_share_bps": np.array(columns[2], dtype=np.int64),
+        "principal_cents": np.array(columns[3], dtype=np.int64),
+        "payout_cap_cents": np.array(columns[4], dtype=np.int64),
+        "paid_to_date_cents": np.array(columns[5], dtype=np.int64),
+        "end_date_cap": np.array(columns[6], dtype="datetime64[us]"),
+    }
+
+
+def allocate(state: dict[str, np.ndarray], gross_revenue_cents: int, as_of: datetime) -> PayoutAllocation:
+    return allocate_payouts(
+        gross_revenue_cents,
+        state["round_id"],
+        state["revenue_share_bps"],
+        state["principal_cents"],
+        state["payout_cap_cents"],
+        state["paid_to_date_cents"],
+        state["end_date_cap"],
+        as_of,
+    )
+
+
+def ensure_month_open(db: Session, startup_id: int, month: str) -> None:
+    # A month's revenue is distributed once: a report filed after its distribution started would never be paid.
+    distributed = db.scalar(
+        select(Distribution.id).where(Distribution.startup_id == startup_id, Distribution.month == month)
+    )
+    if distributed is not None:
+        raise ValueError("Revenue for this month is already distributed")
+
+
+def _start_distribution(db: Session, startup_id: int, month: str, created_by: int) -> Distribution:
+    distribution = db.scalar(
+        select(Distribution).where(Distribution.startup_id == startup_id, Distribution.month == month)
+    )
+    if distribution:
+        return distribution
+    gross_revenue_cents = pending_revenue_cents(db, startup_id, month)
+    if gross_revenue_cents is None:
+        raise ValueError("No pending revenue report")
+    distribution = Distribution(
+        startup_id=startup_id,
+        month=month,
+        gross_revenue_cents=gross_revenue_cents,
+        total_distributed_cents=0,
+        status="running",
+        created_by=created_by,
+    )
+    db.add(distribution)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("Distribution already started for this month")
+    return distribution
+
+
+def _write_chunk(db: Session, distribution: Distribution, state, allocation: PayoutAllocation, chunk: np.ndarray) -> None:
+    amounts = allocation.amounts[chunk]
+    paid = amounts > 0
+    payouts = list(zip(state["id"][chunk][paid].tolist(), amounts[paid].tolist()))
+    changed = paid | allocation.completed[chunk] | allocation.expired[chunk]
+    changed_ids = state["id"][chunk][changed].tolist()
+    contract_updates = [
+        {"contract_id": contract_id, "amount_cents": amount_cents, "expired": expired}
+        for contract_id, amount_cents, expired in zip(
+            changed_ids, amounts[changed].tolist(), allocation.expired[chunk][changed].tolist()
+        )
+    ]
+
+    if contract_updates:
+        # Contracts are paid by increments, and only while they are still active and under their cap, so
+        # a concurrent write (an exit, another run) between loading the state and this commit is never
+        # overwritten. If one got in the way, nothing of this chunk is written and a rerun resumes here.
+        contracts = Contract.__table__
+        amount_cents = bindparam("amount_cents", type_=Integer)
+        updated = db.execute(
+            update(contracts)
+            .where(
+                contracts.c.id == bindparam("contract_id"),
+                contracts.c.status == "active",
+                contracts.c.paid_to_date_cents + amount_cents <= contracts.c.payout_cap_cents,
+            )
+            .values(
+                paid_to_date_cents=contracts.c.paid_to_date_cents + amount_cents,
+                status=case(
+                    (bindparam("expired", type_=Boolean), "expired"),
+                    (contracts.c.paid_to_date_cents + amount_cents >= contracts.c.payout_cap_cents, "completed"),
+                    else_="active",
+                ),
+            ),
+            contract_updates,
+        ).rowcount
+        if updated != len(contract_updates):
+            db.rollback()
+            raise ValueError("Contracts changed while the distribution was running")
+    if payouts:
+        payout_ids = payout_investors(db, distribution.startup_id, payouts)
+        db.execute(
+            insert(Payout),
+            [
+                {
+                    "contract_id": contract_id,
+                    "distribution_id": distribution.id,
+                    "amount_cents": amount_cents,
+                    "payout_id": payout_id,
+                }
+                for (contract_id, amount_cents), payout_id in zip(payouts, payout_ids)
+            ],
+        )
+    distribution.total_distributed_cents += int(amounts.sum())
+    distribution.checkpoint_contract_id = int(state["id"][chunk].max())
+    # Every updated contract was active, so the ones no longer active are this chunk's completions and
+    # expiries, as written rather than as allocated.
+    ended = 0
+    if changed_ids:
+        ended = db.scalar(select(func.count()).where(Contract.id.in_(changed_ids), Contract.status != "active"))
+    summary.record(db, distribution.startup_id, distributed_cents=int(amounts.sum()), active_contracts=-ended)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("Distribution chunk already written by another run")
+
+
+def run_distribution(
+    db: Session,
+    startup_id: int,
+    month: str,
+    created_by: int,
+    chunk_size: int | None = None,
+    deadline: float | None = None,
+) -> Distribution:
+    # Runs are keyed by (startup, month) and processed in contract-id chunks, each committed together
+    # with its checkpoint. Calling this again after a failure resumes after the last committed chunk;
+    # calling it for a completed month returns the existing distribution, unless revenue was reported
+    # for the month after it was distributed, which fails rather than leave that report unpaid. Past the
+    # deadline (time.monotonic()), it stops between chunks and returns the distribution still running.
+    distribution = _start_distribution(db, startup_id, month, created_by)
+    if distribution.status == "completed":
+        if pending_revenue_cents(db, startup_id, month) is not None:
+            raise ValueError("Revenue reported after the month was distributed")
+        return distribution
+
+    state = load_contract_state(db, startup_id, distribution.id)
+    allocation = allocate(state, distribution.gross_revenue_cents, distribution.created_at)
+    by_id = np.argsort(state["id"], kind="stable")
+    if distribution.checkpoint_contract_id is not None:
+        by_id = by_id[state["id"][by_id] > distribution.checkpoint_contract_id]
+    chunk_size = chunk_size or settings.distribution_chunk_size
+    for offset in range(0, len(by_id), chunk_size):
+        if deadline is not None and time.monotonic() > deadline:
+            return distribution
+        _write_chunk(db, distribution, state, allocation, by_id[offset : offset + chunk_size])
+
+    db.execute(
+        update(RevenueReport)
+        .where(
+            RevenueReport.startup_id == startup_id,
+            RevenueReport.month == month,
+            RevenueReport.distribution_status == "pending",
+        )
+        .values(distribution_status="distributed")
+    )
+    distribution.status = "completed"
+    db.commit()
+    return distribution
+
+
+@dataclass
+class StartupRunResult:
+    startup_id: int
+    status: str
+    distribution_id: int | None = None
+    total_distributed_cents: int = 0
+    elapsed_ms: float = 0.0
+    error: str | None = None
+
+
+def startups_pending(db: Session, month: str) -> list[int]:
+    return db.scalars(
+        select(RevenueReport.startup_id)
+        .where(RevenueReport.month == month, RevenueReport.distribution_status == "pending")
+        .distinct()
+        .order_by(RevenueReport.startup_id)
+    ).all()
+
+
+def _run_startup(session_factory, startup_id: int, month: str, created_by: int, deadline: float) -> StartupRunResult:
+    if time.monotonic() > deadline:
+        return StartupRunResult(startup_id=startup_id, status="skipped", error="Budget exhausted")
+    started = time.perf_counter()
+    db = session_factory()
+    try:
+        distribution = run_distribution(db, startup_id, month, created_by, deadline=deadline)
+        paused = distribution.status != "completed"
+        return StartupRunResult(
+            startup_id=startup_id,
+            status="paused" if paused else "distributed",
+            distribution_id=distribution.id,
+            total_distributed_cents=distribution.total_distributed_cents,
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+            error="Budget exhausted" if paused else None,
+        )
+    except Exception as exc:
+        db.rollback()
+        return StartupRunResult(
+            startup_id=startup_id,
+            status="failed",
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+            error=str(exc),
+        )
+    finally:
+        db.close()
+
+
+def run_month_end(
+    month: str,
+    created_by: int,
+    max_workers: int | None = None,
+    budget_seconds: float | None = None,
+    session_factory=SessionLocal,
+) -> dict:
+    # Startups run concurrently, each in its own session and transaction. Once the budget is spent,
+    # startups that have not started yet are reported as skipped, and running ones pause after their
+    # current chunk; a rerun picks both up, resuming paused ones from their checkpoint.
+    started = time.perf_counter()
+    if budget_seconds is None:
+        budget_seconds = settings.distribution_budget_seconds
+    deadline = time.monotonic() + budget_seconds
+    db = session_factory()
+    try:
+        startup_ids = startups_pending(db, month)
+    finally:
+        db.close()
+    with ThreadPoolExecutor(max_workers=max_workers or settings.distribution_workers) as pool:
+        results = list(
+            pool.map(
+                lambda startup_id: _run_startup(session_factory, startup_id, month, created_by, deadline),
+                startup_ids,
+            )
+        )
+    return {
+        "month": month,
+        "startup_count": len(startup_ids),
+        "distributed_count": sum(1 for result in results if result.status == "distributed"),
+        "remaining_count": sum(1 for result in results if result.status in {"paused", "skipped"}),
+        "total_distributed_cents": sum(result.total_distributed_cents for result in results),
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+        "results": [asdict(result) for result in results],
+    }
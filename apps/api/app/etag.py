@@ -0,0 +1,43 @@
+from itertools import chain
+
+from sqlalchemy import event, or_, update
+from sqlalchemy.orm import Session
+
+from app.models import RevenueReport, Round, Startup, TierOption
+
+
+def round_etag(round_id: int, version: int, view: str) -> str:
+    return f'"{view}-{round_id}-v{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # Weak comparison, as If-None-Match requires: a proxy that compresses the body may mark the tag weak.
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_round_versions(session: Session, flush_context) -> None:
+    # Round.version changes whenever anything shown on the round's detail or tier pages is written
+    # through the ORM: the round itself, its tier options, or its startup and revenue reports. The
+    # counters moved by bulk UPDATEs (raised, reserved, investor count) are not part of those pages.
+    round_ids, startup_ids = set(), set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Round) and obj not in session.new:
+            round_ids.add(obj.id)
+        elif isinstance(obj, TierOption):
+            round_ids.add(obj.round_id)
+        elif isinstance(obj, RevenueReport):
+            startup_ids.add(obj.startup_id)
+        elif isinstance(obj, Startup) and obj not in session.new:
+            startup_ids.add(obj.id)
+    if not round_ids and not startup_ids:
+        return
+    session.connection().execute(
+        update(Round.__table__)
+        .where(or_(Round.id.in_(round_ids), Round.startup_id.in_(startup_ids)))
+        .values(version=Round.version + 1)
+    )
@@ -0,0 +1,19 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Contract, ExitRequest, Investment, Round
+from app.startups import summary
+
+
+def settle_contract(db: Session, exit_req: ExitRequest) -> None:
+    # A settled exit ends the contract: it stops taking part in distributions. Does not commit.
+    contract = db.get(Contract, exit_req.contract_id)
+    if contract is None or contract.status != "active":
+        return
+    contract.status = "exited"
+    startup_id = db.execute(
+        select(Round.startup_id)
+        .join(Investment, Investment.round_id == Round.id)
+        .where(Investment.id == contract.investment_id)
+    ).scalar()
+    summary.record(db, startup_id, active_contracts=-1)
@@ -1,12 +1,14 @@
-from datetime import datetime
+from collections import defaultdict
+from datetime import date, datetime
 import json
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 
-from app.auth.router import get_current_user
+from app.auth.router import get_current_claims
 from app.db import get_db
+from app.etag import etag_matches, round_etag
 from app.models import (
     Application,
     Document,
@@ -19,12 +21,17 @@ from app.models import (
     Contract,
     Investment,
     AuditLog,
-    LedgerEntry,
+    StartupSummary,
+    month_start,
 )
 from app.providers.payments import charge_application_fee
+from app.ledger.writer import ledger_writer
 from app.providers.storage import create_signed_upload_url, complete_upload
 from app.algorithm.service import calculate_tiers
+from app.distributions import service as distribution_service
 from app.settings import settings
+from app.exits.service import settle_contract
+from app.startups import summary
 
 router = APIRouter()
 
@@ -53,31 +60,33 @@ class StartupCreate(BaseModel):
 
 
 @router.get("/startups")
-def list_startups(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def list_startups(db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
-    startups = db.query(Startup).filter(Startup.founder_user_id == current_user.id).all()
+    rows = (
+        db.query(Startup, StartupSummary)
+        .outerjoin(StartupSummary, StartupSummary.startup_id == Startup.id)
+        .filter(Startup.founder_user_id == current_user.id)
+        .all()
+    )
+    startup_ids = [startup.id for startup, _ in rows]
+    application_statuses: dict[int, set[str]] = {}
+    for startup_id, application_status in db.execute(
+        select(Application.startup_id, Application.status)
+        .where(Application.startup_id.in_(startup_ids), Application.status.in_(("submitted", "approved")))
+        .distinct()
+    ):
+        application_statuses.setdefault(startup_id, set()).add(application_status)
+
     data = []
-    for startup in startups:
-        total_raised = (
-            db.query(func.coalesce(func.sum(Investment.amount_cents), 0))
-            .join(Round, Round.id == Investment.round_id)
-            .filter(Round.startup_id == startup.id)
-            .scalar()
-        )
-        active_round = db.query(Round).filter(Round.startup_id == startup.id, Round.status == "published").first()
-        last_report = (
-            db.query(RevenueReport)
-            .filter(RevenueReport.startup_id == startup.id)
-            .order_by(RevenueReport.created_at.desc())
-            .first()
-        )
+    for startup, startup_summary in rows:
+        active_round = bool(startup_summary and startup_summary.live_round_id)
         status = startup.status
         if active_round:
             status = "live"
-        elif db.query(Application).filter(Application.startup_id == startup.id, Application.status == "submitted").first():
+        elif "submitted" in application_statuses.get(startup.id, ()):
             status = "application_pending"
-        elif db.query(Application).filter(Application.startup_id == startup.id, Application.status == "approved").first():
+        elif "approved" in application_statuses.get(startup.id, ()):
             status = "approved"
         data.append(
             {
@@ -87,16 +96,16 @@ def list_startups(db: Session = Depends(get_db), current_user=Depends(get_curren
                 "industry": startup.industry,
                 "country": startup.country,
                 "status": status,
-                "total_raised_cents": total_raised,
-                "active_round": bool(active_round),
-                "last_revenue_reported": last_report.month if last_report else None,
+                "total_raised_cents": startup_summary.total_raised_cents if startup_summary else 0,
+                "active_round": active_round,
+                "last_revenue_reported": startup_summary.last_revenue_month if startup_summary else None,
             }
         )
     return data
 
 
 @router.post("/startups")
-def create_startup(payload: StartupCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def create_startup(payload: StartupCreate, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
     country = payload.country
@@ -133,7 +142,7 @@ def create_startup(payload: StartupCreate, db: Session = Depends(get_db), curren
 
 
 @router.get("/startups/{startup_id}")
-def get_startup(startup_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def get_startup(startup_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
     startup = db.query(Startup).filter(Startup.id == startup_id, Startup.founder_user_id == current_user.id).first()
@@ -170,7 +179,7 @@ def create_application(
     startup_id: int,
     payload: ApplicationCreate,
     db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_claims),
 ):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
@@ -195,7 +204,7 @@ def create_application(
 def list_applications(
     startup_id: int,
     db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_claims),
 ):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
@@ -219,7 +228,7 @@ def list_applications(
 
 
 @router.get("/applications/{application_id}")
-def get_application(application_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def get_application(application_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
     app = db.query(Application).filter(Application.id == application_id).first()
@@ -256,7 +265,7 @@ def submit_application(
     application_id: int,
     payload: ApplicationSubmit,
     db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_claims),
 ):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
@@ -282,7 +291,7 @@ class DocumentPresign(BaseModel):
 
 
 @router.post("/documents/presign")
-def presign_document(payload: DocumentPresign, current_user=Depends(get_current_user)):
+def presign_document(payload: DocumentPresign, current_user=Depends(get_current_claims)):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
     return {"upload_url": create_signed_upload_url(payload.filename)}
@@ -299,7 +308,7 @@ class DocumentComplete(BaseModel):
 def complete_document(
     payload: DocumentComplete,
     db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_claims),
 ):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
@@ -311,7 +320,7 @@ def complete_document(
 def approved_applications(
     startup_id: int,
     db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_claims),
 ):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
@@ -342,7 +351,7 @@ def create_round(
     application_id: int,
     payload: RoundCreate,
     db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_claims),
 ):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
@@ -365,37 +374,88 @@ def create_round(
     return {"round_code": f"RND-{round_obj.id:04d}", "id": round_obj.id}
 
 
+def _ticket_breakdowns(db: Session, startup_id: int) -> dict[int, dict]:
+    # One grouped pass over the startup's investments. Grouping by ticket size as well as day keeps
+    # the result small (most tickets repeat a handful of amounts) while still carrying every amount's
+    # frequency, which is all the median needs; this works the same on SQLite and Postgres.
+    day = func.date(Investment.created_at)
+    rows = db.execute(
+        select(
+            Investment.round_id,
+            day.label("day"),
+            Investment.amount_cents,
+            func.count(Investment.id).label("tickets"),
+        )
+        .join(Round, Round.id == Investment.round_id)
+        .where(Round.startup_id == startup_id)
+        .group_by(Investment.round_id, day, Investment.amount_cents)
+    ).all()
+    per_day: dict[int, dict[str, list[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+    tickets_by_amount: dict[int, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    for round_id, day_value, amount_cents, tickets in rows:
+        totals = per_day[round_id][str(day_value)]
+        totals[0] += tickets
+        totals[1] += amount_cents * tickets
+        tickets_by_amount[round_id][amount_cents] += tickets
+    breakdowns = {}
+    for round_id, amounts in tickets_by_amount.items():
+        breakdowns[round_id] = {
+            "investments_per_day": [
+                {"day": day_value, "investments": count, "amount_cents": amount_cents}
+                for day_value, (count, amount_cents) in sorted(per_day[round_id].items())
+            ],
+            "largest_ticket_cents": max(amounts),
+            "median_ticket_cents": _median(amounts),
+        }
+    return breakdowns
+
+
+def _median(frequencies: dict[int, int]) -> float:
+    total = sum(frequencies.values())
+    # Zero-based positions of the middle ticket(s) in sorted order.
+    lower, upper = (total - 1) // 2, total // 2
+    seen, low_value = 0, None
+    for amount_cents in sorted(frequencies):
+        seen += frequencies[amount_cents]
+        if low_value is None and seen > lower:
+            low_value = amount_cents
+        if seen > upper:
+            return (low_value + amount_cents) / 2
+    raise ValueError("No tickets")
+
+
 @router.get("/startups/{startup_id}/rounds")
 def list_rounds(
     startup_id: int,
+    breakdown: bool = False,
     db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_claims),
 ):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
     startup = db.query(Startup).filter(Startup.id == startup_id, Startup.founder_user_id == current_user.id).first()
     if not startup:
         raise HTTPException(status_code=404, detail="Startup not found")
+    # Raised and investor counts are the rounds' own counters, kept by the invest path.
     rounds = db.query(Round).filter(Round.startup_id == startup_id).all()
+    breakdowns = _ticket_breakdowns(db, startup_id) if breakdown else {}
     data = []
     for round_obj in rounds:
-        raised = (
-            db.query(func.coalesce(func.sum(Investment.amount_cents), 0))
-            .filter(Investment.round_id == round_obj.id)
-            .scalar()
-        )
-        investors = db.query(Investment).filter(Investment.round_id == round_obj.id).count()
-        data.append(
-            {
-                "round_code": f"RND-{round_obj.id:04d}",
-                "id": round_obj.id,
-                "status": round_obj.status,
-                "tier_selected": round_obj.tier_selected,
-                "max_raise_cents": round_obj.max_raise_cents,
-                "raised_cents": raised,
-                "investor_count": investors,
-            }
-        )
+        entry = {
+            "round_code": f"RND-{round_obj.id:04d}",
+            "id": round_obj.id,
+            "status": round_obj.status,
+            "tier_selected": round_obj.tier_selected,
+            "max_raise_cents": round_obj.max_raise_cents,
+            "raised_cents": round_obj.raised_cents,
+            "investor_count": round_obj.investor_count,
+        }
+        if breakdown:
+            entry["breakdown"] = breakdowns.get(
+                round_obj.id,
+                {"investments_per_day": [], "largest_ticket_cents": None, "median_ticket_cents": None},
+            )
+        data.append(entry)
     return data
 
 
@@ -406,7 +466,7 @@ class TierRequest(BaseModel):
 
 
 @router.post("/rounds/{round_id}/tiers")
-def run_tiers(round_id: int, payload: TierRequest, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def run_tiers(round_id: int, payload: TierRequest, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
     round_obj = db.query(Round).filter(Round.id == round_id).first()
@@ -441,15 +501,27 @@ def run_tiers(round_id: int, payload: TierRequest, db: Session = Depends(get_db)
 
 
 @router.get("/rounds/{round_id}/tiers")
-def list_tiers(round_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def list_tiers(
+    round_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_claims),
+):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
-    round_obj = db.query(Round).filter(Round.id == round_id).first()
-    if not round_obj:
-        raise HTTPException(status_code=404, detail="Round not found")
-    startup = db.query(Startup).filter(Startup.id == round_obj.startup_id, Startup.founder_user_id == current_user.id).first()
-    if not startup:
+    version = db.execute(
+        select(Round.version)
+        .join(Startup, Startup.id == Round.startup_id)
+        .where(Round.id == round_id, Startup.founder_user_id == current_user.id)
+    ).scalar()
+    if version is None:
         raise HTTPException(status_code=404, detail="Round not found")
+    etag = round_etag(round_id, version, "tiers")
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
     options = db.query(TierOption).filter(TierOption.round_id == round_id).all()
     return [
         {
@@ -467,7 +539,7 @@ def list_tiers(round_id: int, db: Session = Depends(get_db), current_user=Depend
 
 
 @router.post("/rounds/{round_id}/select-tier")
-def select_tier(round_id: int, tier: str, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def select_tier(round_id: int, tier: str, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
     round_obj = db.query(Round).filter(Round.id == round_id).first()
@@ -485,7 +557,7 @@ def select_tier(round_id: int, tier: str, db: Session = Depends(get_db), current
 
 
 @router.post("/rounds/{round_id}/publish")
-def publish_round(round_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def publish_round(round_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
     round_obj = db.query(Round).filter(Round.id == round_id).first()
@@ -500,6 +572,7 @@ def publish_round(round_id: int, db: Session = Depends(get_db), current_user=Dep
     round_obj.status = "published"
     round_obj.published_at = datetime.utcnow()
     startup.status = "live"
+    summary.record(db, startup.id, round_status_changed=True)
     db.commit()
     return {"round_code": f"RND-{round_obj.id:04d}", "status": round_obj.status}
 
@@ -511,12 +584,16 @@ class RevenueReportCreate(BaseModel):
 
 
 @router.post("/revenue/report")
-def report_revenue(payload: RevenueReportCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def report_revenue(payload: RevenueReportCreate, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
     startup = db.query(Startup).filter(Startup.id == payload.startup_id, Startup.founder_user_id == current_user.id).first()
     if not startup:
         raise HTTPException(status_code=404, detail="Startup not found")
+    try:
+        distribution_service.ensure_month_open(db, payload.startup_id, payload.month)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     report = RevenueReport(
         startup_id=payload.startup_id,
         month=payload.month,
@@ -525,49 +602,71 @@ def report_revenue(payload: RevenueReportCreate, db: Session = Depends(get_db),
         distribution_status="pending",
     )
     db.add(report)
-    db.add(
-        LedgerEntry(
-            entry_type="revenue_report",
-            actor_user_id=current_user.id,
-            startup_id=payload.startup_id,
-            amount_cents=payload.gross_revenue_cents,
-            metadata_json=json.dumps({"month": payload.month}),
-        )
+    ledger_writer(db).add(
+        entry_type="revenue_report",
+        actor_user_id=current_user.id,
+        startup_id=payload.startup_id,
+        amount_cents=payload.gross_revenue_cents,
+        metadata_json=json.dumps({"month": payload.month}),
     )
+    summary.record(db, payload.startup_id, revenue_month=payload.month)
     db.commit()
     return {"report_code": f"REV-{report.id:04d}"}
 
 
+def _month_param(value: str | None, name: str) -> date | None:
+    if value is None:
+        return None
+    start = month_start(value)
+    if start is None:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} month, expected YYYY-MM")
+    return start
+
+
 @router.get("/revenue/{startup_id}")
-def list_revenue(startup_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def list_revenue(
+    startup_id: int,
+    from_month: str | None = Query(default=None, alias="from"),
+    to_month: str | None = Query(default=None, alias="to"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_claims),
+):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
     startup = db.query(Startup).filter(Startup.id == startup_id, Startup.founder_user_id == current_user.id).first()
     if not startup:
         raise HTTPException(status_code=404, detail="Startup not found")
-    reports = db.query(RevenueReport).filter(RevenueReport.startup_id == startup_id).all()
-    data = []
-    for report in reports:
-        distribution = (
-            db.query(Distribution)
-            .filter(Distribution.startup_id == startup_id, Distribution.month == report.month)
-            .first()
-        )
-        data.append(
-            {
-                "report_code": f"REV-{report.id:04d}",
-                "month": report.month,
-                "gross_revenue_cents": report.gross_revenue_cents,
-                "created_at": report.created_at,
-                "distribution_status": report.distribution_status,
-                "total_distributed_cents": distribution.total_distributed_cents if distribution else 0,
-            }
+    # One range scan of ix_revenue_reports_startup_month; each report's distribution comes from the
+    # (startup_id, month) unique index through the outer join.
+    query = (
+        select(RevenueReport, Distribution.total_distributed_cents)
+        .outerjoin(
+            Distribution,
+            (Distribution.startup_id == RevenueReport.startup_id) & (Distribution.month == RevenueReport.month),
         )
-    return data
+        .where(RevenueReport.startup_id == startup_id)
+        .order_by(RevenueReport.month_start.asc().nulls_last(), RevenueReport.id)
+    )
+    first, last = _month_param(from_month, "from"), _month_param(to_month, "to")
+    if first is not None:
+        query = query.where(RevenueReport.month_start >= first)
+    if last is not None:
+        query = query.where(RevenueReport.month_start <= last)
+    return [
+        {
+            "report_code": f"REV-{report.id:04d}",
+            "month": report.month,
+            "gross_revenue_cents": report.gross_revenue_cents,
+            "created_at": report.created_at,
+            "distribution_status": report.distribution_status,
+            "total_distributed_cents": total_distributed_cents or 0,
+        }
+        for report, total_distributed_cents in db.execute(query)
+    ]
 
 
 @router.get("/exits")
-def list_exits(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def list_exits(db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
     exits = (
@@ -595,12 +694,21 @@ class ExitSettlement(BaseModel):
 
 
 @router.post("/exits/{exit_id}/settle")
-def settle_exit(exit_id: int, payload: ExitSettlement, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def settle_exit(exit_id: int, payload: ExitSettlement, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     if current_user.role != "founder":
         raise HTTPException(status_code=403, detail="Forbidden")
-    exit_req = db.query(ExitRequest).filter(ExitRequest.id == exit_id).first()
+    exit_req = (
+        db.query(ExitRequest)
+        .join(Contract)
+        .join(Investment)
+        .join(Round)
+        .join(Startup)
+        .filter(ExitRequest.id == exit_id, Startup.founder_user_id == current_user.id)
+        .first()
+    )
     if not exit_req:
         raise HTTPException(status_code=404, detail="Exit not found")
+    settle_contract(db, exit_req)
     exit_req.status = "settled"
     exit_req.settlement_method = payload.settlement_method
     exit_req.settled_at = datetime.utcnow()
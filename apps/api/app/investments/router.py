@@ -35,7 +35,9 @@ def invest(payload: InvestRequest, db: Session = Depends(get_db)):
         if total + payload.amount_cents > round_obj.max_raise_cents:
             raise HTTPException(status_code=400, detail="Round fully subscribed")
 
-        payment_id = collect_investment(db, payload.investor_id, payload.round_id, payload.amount_cents)
+        payment_id = collect_investment(
+            db, payload.investor_id, payload.round_id, payload.amount_cents, startup_id=round_obj.startup_id
+        )
         investment = Investment(investor_id=payload.investor_id, round_id=payload.round_id, amount_cents=payload.amount_cents)
         db.add(investment)
 
@@ -0,0 +1,210 @@
+from collections import defaultdict
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+import queue
+import threading
+import time
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.investor.service import eligible_round
+from app.models import Reservation, Round, User
+from app.settings import settings
+
+
+def reservation_payload(reservation: Reservation, waitlist_position: int | None = None) -> dict:
+    return {
+        "reservation_code": f"RSV-{reservation.id:04d}",
+        "round_code": f"RND-{reservation.round_id:04d}",
+        "amount_cents": reservation.amount_cents,
+        "status": reservation.status,
+        "expires_at": reservation.expires_at,
+        "waitlist_position": waitlist_position,
+    }
+
+
+def waitlist_position(db: Session, reservation: Reservation) -> int:
+    return db.execute(
+        select(func.count(Reservation.id)).where(
+            Reservation.round_id == reservation.round_id,
+            Reservation.status == "waitlisted",
+            Reservation.id <= reservation.id,
+        )
+    ).scalar()
+
+
+def _hold(db: Session, round_id: int, amount_cents: int) -> bool:
+    return bool(
+        db.execute(
+            update(Round)
+            .where(
+                Round.id == round_id,
+                Round.status == "published",
+                Round.raised_cents + Round.reserved_cents + amount_cents <= Round.max_raise_cents,
+            )
+            .values(reserved_cents=Round.reserved_cents + amount_cents)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    )
+
+
+def reserve(db: Session, investor: User, round_id: int, amount_cents: int, now: datetime | None = None) -> Reservation:
+    # Holds capacity for the investor until the reservation expires, or joins the round's waitlist
+    # when the remaining capacity is already held. Does not commit.
+    eligible_round(db, investor, round_id, amount_cents)
+    now = now or datetime.utcnow()
+    reservation = Reservation(round_id=round_id, investor_user_id=investor.id, amount_cents=amount_cents)
+    if _hold(db, round_id, amount_cents):
+        reservation.status = "held"
+        reservation.expires_at = now + timedelta(seconds=settings.reservation_seconds)
+    else:
+        reservation.status = "waitlisted"
+    db.add(reservation)
+    db.flush()
+    return reservation
+
+
+def promote_waitlist(db: Session, round_id: int, now: datetime | None = None) -> int:
+    # Strictly first come, first served: promotion stops at the first waitlisted request that does not fit.
+    now = now or datetime.utcnow()
+    waitlisted = db.execute(
+        select(Reservation.id, Reservation.amount_cents)
+        .where(Reservation.round_id == round_id, Reservation.status == "waitlisted")
+        .order_by(Reservation.id)
+    ).all()
+    promoted = []
+    for reservation_id, amount_cents in waitlisted:
+        if not _hold(db, round_id, amount_cents):
+            break
+        promoted.append(reservation_id)
+    if promoted:
+        db.execute(
+            update(Reservation)
+            .where(Reservation.id.in_(promoted))
+            .values(status="held", expires_at=now + timedelta(seconds=settings.reservation_seconds))
+            .execution_options(synchronize_session=False)
+        )
+    return len(promoted)
+
+
+def expire_reservations(db: Session, now: datetime | None = None) -> int:
+    # Releases lapsed holds and hands their capacity to each round's waitlist. Does not commit.
+    now = now or datetime.utcnow()
+    expired = db.execute(
+        update(Reservation)
+        .where(Reservation.status == "held", Reservation.expires_at <= now)
+        .values(status="expired")
+        .returning(Reservation.round_id, Reservation.amount_cents)
+        .execution_options(synchronize_session=False)
+    ).all()
+    released = defaultdict(int)
+    for round_id, amount_cents in expired:
+        released[round_id] += amount_cents
+    for round_id, amount_cents in released.items():
+        db.execute(
+            update(Round)
+            .where(Round.id == round_id)
+            .values(reserved_cents=Round.reserved_cents - amount_cents)
+            .execution_options(synchronize_session=False)
+        )
+        promote_waitlist(db, round_id, now)
+    return len(expired)
+
+
+class AdmissionQueue:
+    # One worker thread per process admits queued invest requests in arrival order. A burst on a hot
+    # round becomes a few batched transactions instead of hundreds of requests waiting on the round's
+    # row lock, so request latency tracks queue depth rather than lock contention. Capacity is still
+    # enforced by the conditional UPDATE in _hold, so several API processes stay correct.
+    def __init__(self, session_factory=SessionLocal, batch_size: int | None = None, sweep_seconds: float = 5.0):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.admission_batch_size
+        self.sweep_seconds = sweep_seconds
+        self._requests: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self._last_sweep = 0.0
+
+    def submit(self, investor_id: int, round_id: int, amount_cents: int) -> Future:
+        future: Future = Future()
+        self._requests.put((future, investor_id, round_id, amount_cents))
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="admission-queue", daemon=True)
+                self._worker.start()
+        return future
+
+    def stop(self) -> None:
+        self._requests.put(None)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._requests.get(timeout=self.sweep_seconds)
+            except queue.Empty:
+                self._sweep()
+                continue
+            if first is None:
+                return
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._requests.put(None)
+                    break
+                batch.append(item)
+            self._admit(batch)
+
+    def _sweep(self) -> None:
+        self._last_sweep = time.monotonic()
+        db = self.session_factory()
+        try:
+            expire_reservations(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+        finally:
+            db.close()
+
+    def _admit(self, batch: list) -> None:
+        # Requests cancelled while queued (their caller timed out) are dropped; the rest can no longer be.
+        batch = [item for item in batch if item[0].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        outcomes = []
+        db = self.session_factory()
+        try:
+            if time.monotonic() - self._last_sweep >= self.sweep_seconds:
+                self._last_sweep = time.monotonic()
+                expire_reservations(db)
+            investors = {
+                user.id: user
+                for user in db.scalars(select(User).where(User.id.in_({item[1] for item in batch})))
+            }
+            for future, investor_id, round_id, amount_cents in batch:
+                try:
+                    reservation = reserve(db, investors[investor_id], round_id, amount_cents)
+                except ValueError as exc:
+                    outcomes.append((future, exc))
+                    continue
+                position = waitlist_position(db, reservation) if reservation.status == "waitlisted" else None
+                outcomes.append((future, reservation_payload(reservation, position)))
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            outcomes = [(item[0], exc) for item in batch]
+        finally:
+            db.close()
+        for future, outcome in outcomes:
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+
+admission_queue = AdmissionQueue()
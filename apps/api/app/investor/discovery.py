@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from itertools import chain
+import json
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.cache import TTLCache, on_commit
+from app.models import Round, Startup, StartupSummary
+from app.settings import settings
+
+
+_cache = TTLCache(maxsize=1024, ttl_seconds=settings.discovery_cache_seconds)
+
+
+@dataclass(frozen=True)
+class RoundFilters:
+    industry: str | None = None
+    country: str | None = None
+    revenue_stage: str | None = None
+    min_raise_cents: int | None = None
+    max_raise_cents: int | None = None
+    min_funded_pct: float | None = None
+    max_funded_pct: float | None = None
+
+
+def published_rounds(db: Session, filters: RoundFilters, cursor: int | None = None, limit: int = 50) -> dict:
+    # Keyset pagination, newest round first: the cursor is the last round id already served, so every
+    # page is an index range scan on (status, id) rather than an OFFSET over the whole catalog.
+    query = (
+        select(
+            Round.id,
+            Round.max_raise_cents,
+            Round.tier_selected,
+            Round.raised_cents,
+            Startup.operating_name,
+            Startup.legal_name,
+            Startup.industry,
+            Startup.short_description,
+            Startup.country,
+            Startup.revenue_stage,
+            StartupSummary.total_distributed_cents,
+        )
+        .join(Startup, Startup.id == Round.startup_id)
+        .outerjoin(StartupSummary, StartupSummary.startup_id == Round.startup_id)
+        .where(Round.status == "published")
+        .order_by(Round.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        query = query.where(Round.id < cursor)
+    if filters.industry:
+        query = query.where(Startup.industry == filters.industry)
+    if filters.country:
+        query = query.where(Startup.country == filters.country)
+    if filters.revenue_stage:
+        query = query.where(Startup.revenue_stage == filters.revenue_stage)
+    if filters.min_raise_cents is not None:
+        query = query.where(Round.max_raise_cents >= filters.min_raise_cents)
+    if filters.max_raise_cents is not None:
+        query = query.where(Round.max_raise_cents <= filters.max_raise_cents)
+    # Compared in floating point: raised_cents * 100 overflows a 32-bit integer for rounds over $214k.
+    if filters.min_funded_pct is not None:
+        query = query.where(Round.raised_cents >= Round.max_raise_cents * (float(filters.min_funded_pct) / 100))
+    if filters.max_funded_pct is not None:
+        query = query.where(Round.raised_cents <= Round.max_raise_cents * (float(filters.max_funded_pct) / 100))
+    rows = db.execute(query).all()
+    page = rows[:limit]
+    return {
+        "rounds": [
+            {
+                "round_code": f"RND-{row.id:04d}",
+                "startup_name": row.operating_name or row.legal_name,
+                "industry": row.industry,
+                "short_description": row.short_description,
+                "country": row.country,
+                "revenue_stage": row.revenue_stage,
+                "max_raise_cents": row.max_raise_cents,
+                "tier_selected": row.tier_selected,
+                "raised_cents": row.raised_cents,
+                "startup_distributed_cents": row.total_distributed_cents or 0,
+            }
+            for row in page
+        ],
+        "next_cursor": page[-1].id if len(rows) > limit else None,
+    }
+
+
+def published_rounds_json(db: Session, filters: RoundFilters, cursor: int | None = None, limit: int = 50) -> bytes:
+    # Cached already serialized: on a hit the endpoint skips both the database and response encoding.
+    key = (filters, cursor, limit)
+    body = _cache.get(key)
+    if body is None:
+        body = json.dumps(published_rounds(db, filters, cursor, limit)).encode()
+        _cache.set(key, body)
+    return body
+
+
+def invalidate() -> None:
+    _cache.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed(session: Session, flush_context) -> None:
+    # Publishing and closing go through the ORM; startup edits change the names and filters shown.
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (Round, Startup, StartupSummary)):
+            on_commit(session, invalidate)
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_bulk(orm_execute_state) -> None:
+    # Investments and admissions move the round counters, and distributions the startup summaries,
+    # with bulk UPDATEs.
+    if not (orm_execute_state.is_update or orm_execute_state.is_insert or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (Round, Startup, StartupSummary):
+        on_commit(orm_execute_state.session, invalidate)
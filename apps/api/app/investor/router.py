@@ -1,51 +1,82 @@
 from datetime import datetime, timedelta
 import json
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from pydantic import BaseModel
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
-from app.auth.router import get_current_user
+from app.auth.router import get_current_claims, get_current_user
 from app.db import get_db
-from app.models import Round, Startup, TierOption, Investment, Contract, ExitRequest, Payout, RevenueReport, Application
-from app.providers.payments import collect_investment
+from app.etag import etag_matches, round_etag
+from app.models import (
+    Round,
+    Startup,
+    TierOption,
+    Investment,
+    Contract,
+    ExitRequest,
+    Payout,
+    RevenueReport,
+    Application,
+    Reservation,
+)
+from app.investor import discovery, search as investor_search, service as investor_service
+from app.investor.admission import admission_queue, reservation_payload, waitlist_position
 from app.settings import settings
 
 router = APIRouter()
 
 
 @router.get("/rounds")
-def list_rounds(db: Session = Depends(get_db)):
-    rounds = db.query(Round).filter(Round.status == "published").all()
-    response = []
-    for round_obj in rounds:
-        startup = db.query(Startup).filter(Startup.id == round_obj.startup_id).first()
-        raised = (
-            db.query(func.coalesce(func.sum(Investment.amount_cents), 0))
-            .filter(Investment.round_id == round_obj.id)
-            .scalar()
-        )
-        response.append(
-            {
-                "round_code": f"RND-{round_obj.id:04d}",
-                "startup_name": startup.operating_name or startup.legal_name,
-                "industry": startup.industry,
-                "short_description": startup.short_description,
-                "country": startup.country,
-                "revenue_stage": startup.revenue_stage,
-                "max_raise_cents": round_obj.max_raise_cents,
-                "tier_selected": round_obj.tier_selected,
-                "raised_cents": raised,
-            }
-        )
-    return response
+def list_rounds(
+    industry: str | None = None,
+    country: str | None = None,
+    revenue_stage: str | None = None,
+    min_raise_cents: int | None = None,
+    max_raise_cents: int | None = None,
+    min_funded_pct: float | None = None,
+    max_funded_pct: float | None = None,
+    cursor: int | None = None,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+):
+    filters = discovery.RoundFilters(
+        industry=industry,
+        country=country,
+        revenue_stage=revenue_stage,
+        min_raise_cents=min_raise_cents,
+        max_raise_cents=max_raise_cents,
+        min_funded_pct=min_funded_pct,
+        max_funded_pct=max_funded_pct,
+    )
+    body = discovery.published_rounds_json(db, filters, cursor=cursor, limit=max(1, min(limit, 200)))
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/search")
+def search(q: str, offset: int = 0, limit: int = 20, db: Session = Depends(get_db)):
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Search query required")
+    return investor_search.search_rounds(db, q, offset=max(0, offset), limit=max(1, min(limit, 100)))
 
 
 @router.get("/rounds/{round_id}")
-def round_detail(round_id: int, db: Session = Depends(get_db)):
-    round_obj = db.query(Round).filter(Round.id == round_id).first()
-    if not round_obj:
+def round_detail(
+    round_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    # The version is read before the body, so a cached body is never newer than its tag claims.
+    version = db.execute(select(Round.version).where(Round.id == round_id)).scalar()
+    if version is None:
         raise HTTPException(status_code=404, detail="Round not found")
+    etag = round_etag(round_id, version, "round")
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    round_obj = db.get(Round, round_id)
     tier = (
         db.query(TierOption)
         .filter(TierOption.round_id == round_id, TierOption.tier == round_obj.tier_selected)
@@ -94,53 +125,56 @@ class InvestRequest(BaseModel):
 def invest(payload: InvestRequest, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
     if current_user.role != "investor":
         raise HTTPException(status_code=403, detail="Forbidden")
-    round_obj = db.query(Round).filter(Round.id == payload.round_id).first()
-    if not round_obj or round_obj.status != "published":
-        raise HTTPException(status_code=400, detail="Round not available")
-    startup = db.query(Startup).filter(Startup.id == round_obj.startup_id).first()
-    if settings.country_mode == "CA":
-        if not startup or startup.country != "CA" or current_user.country != "CA":
-            raise HTTPException(status_code=400, detail="Canada-only mode enforced")
-    total = (
-        db.query(func.coalesce(func.sum(Investment.amount_cents), 0))
-        .filter(Investment.round_id == round_obj.id)
-        .scalar()
-    )
-    if total + payload.amount_cents > round_obj.max_raise_cents:
-        raise HTTPException(status_code=400, detail="Round fully subscribed")
-    payment_id = collect_investment(db, current_user.id, round_obj.id, payload.amount_cents)
-    investment = Investment(
-        round_id=round_obj.id,
-        investor_user_id=current_user.id,
-        amount_cents=payload.amount_cents,
-        payment_id=payment_id,
-    )
-    db.add(investment)
-    db.commit()
-    db.refresh(investment)
-    tier = (
-        db.query(TierOption)
-        .filter(TierOption.round_id == round_obj.id, TierOption.tier == round_obj.tier_selected)
-        .first()
-    )
-    payout_cap_cents = int(payload.amount_cents * float(tier.payout_cap_mult))
-    contract = Contract(
-        investment_id=investment.id,
-        status="active",
-        principal_cents=payload.amount_cents,
-        payout_cap_cents=payout_cap_cents,
-        revenue_share_bps=tier.revenue_share_bps,
-        start_date=datetime.utcnow(),
-        end_date_cap=datetime.utcnow() + timedelta(days=tier.time_cap_months * 30),
-        paid_to_date_cents=0,
+    if settings.invest_admission_mode == "queue":
+        admission = admission_queue.submit(current_user.id, payload.round_id, payload.amount_cents)
+        try:
+            try:
+                return admission.result(timeout=30)
+            except TimeoutError as exc:
+                # Still queued: cancelled, so nothing is held. Already being admitted: its outcome stands.
+                if admission.cancel():
+                    raise HTTPException(status_code=503, detail="Admission queue busy") from exc
+                return admission.result()
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    try:
+        investment = investor_service.place_investment(db, current_user, payload.round_id, payload.amount_cents)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"investment_code": f"INV-{investment.id:04d}"}
+
+
+@router.get("/reservations")
+def list_reservations(db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
+    if current_user.role != "investor":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    reservations = (
+        db.query(Reservation)
+        .filter(Reservation.investor_user_id == current_user.id)
+        .order_by(Reservation.id.desc())
+        .all()
     )
-    db.add(contract)
-    db.commit()
+    return [
+        reservation_payload(
+            reservation, waitlist_position(db, reservation) if reservation.status == "waitlisted" else None
+        )
+        for reservation in reservations
+    ]
+
+
+@router.post("/reservations/{reservation_id}/confirm")
+def confirm_reservation(reservation_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    if current_user.role != "investor":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    try:
+        investment = investor_service.confirm_reservation(db, current_user, reservation_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     return {"investment_code": f"INV-{investment.id:04d}"}
 
 
 @router.get("/portfolio")
-def portfolio(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def portfolio(db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     if current_user.role != "investor":
         raise HTTPException(status_code=403, detail="Forbidden")
     investments = db.query(Investment).filter(Investment.investor_user_id == current_user.id).all()
@@ -166,7 +200,7 @@ class ExitRequestCreate(BaseModel):
 
 
 @router.post("/exits/request")
-def request_exit(payload: ExitRequestCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def request_exit(payload: ExitRequestCreate, db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     if current_user.role != "investor":
         raise HTTPException(status_code=403, detail="Forbidden")
     if payload.exit_type not in {"quarterly", "offcycle"}:
@@ -194,7 +228,7 @@ def request_exit(payload: ExitRequestCreate, db: Session = Depends(get_db), curr
 
 
 @router.get("/payouts")
-def payout_history(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def payout_history(db: Session = Depends(get_db), current_user=Depends(get_current_claims)):
     if current_user.role != "investor":
         raise HTTPException(status_code=403, detail="Forbidden")
     investment_ids = [
@@ -0,0 +1,222 @@
+from collections import defaultdict
+from itertools import chain
+import html
+import re
+from threading import Lock
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import column, event, exists, func, select, text
+from sqlalchemy.orm import Session
+
+from app.cache import on_commit
+from app.models import Round, Startup
+from app.settings import settings
+
+# Same field weights as the Postgres search_vector column (ts_rank's defaults for A, B, C, D).
+FIELD_WEIGHTS = {
+    "legal_name": 1.0,
+    "operating_name": 1.0,
+    "industry": 0.4,
+    "sub_industry": 0.4,
+    "short_description": 0.2,
+    "long_description": 0.1,
+}
+_START, _STOP = "\x02", "\x03"
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _highlight(fragment: str) -> str:
+    # Fragments are marked with control characters and escaped afterwards, so founder-supplied text
+    # can never inject markup next to the <mark> tags.
+    return html.escape(fragment).replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+def _result(round_id: int, startup: Startup, rank: float, highlight: str) -> dict:
+    return {
+        "round_code": f"RND-{round_id:04d}",
+        "startup_code": f"STP-{startup.id:04d}",
+        "startup_name": startup.operating_name or startup.legal_name,
+        "industry": startup.industry,
+        "short_description": startup.short_description,
+        "rank": round(float(rank), 6),
+        "highlight": _highlight(highlight),
+    }
+
+
+def search_rounds(db: Session, q: str, offset: int = 0, limit: int = 20) -> dict:
+    # Startups are matched on their text fields; results are the startups' published rounds.
+    if db.get_bind().dialect.name == "postgresql":
+        results = _search_postgres(db, q, offset, limit + 1)
+    else:
+        results = _search_inverted_index(db, q, offset, limit + 1)
+    return {
+        "results": results[:limit],
+        "next_offset": offset + limit if len(results) > limit else None,
+    }
+
+
+def _search_postgres(db: Session, q: str, offset: int, limit: int) -> list[dict]:
+    query = func.websearch_to_tsquery("english", q)
+    # Ranking has to read every candidate's vector, which is seconds for a term that matches most of
+    # the catalog. Ranking is therefore limited to the first search_candidate_limit matches: exact
+    # for selective queries, best-effort for near-universal ones. Only startups with a published round
+    # are candidates, so matches that could never be returned do not take up the limit.
+    candidates = (
+        select(Startup.id, column("search_vector"))
+        .where(column("search_vector").op("@@")(query))
+        .where(exists().where(Round.startup_id == Startup.id, Round.status == "published"))
+        .limit(settings.search_candidate_limit)
+        .subquery()
+    )
+    rank = func.ts_rank(candidates.c.search_vector, query).label("rank")
+    # Rank and page first, then build headlines for the page only: ts_headline re-parses the document
+    # and is by far the most expensive part of the query.
+    page = (
+        select(Round.id.label("round_id"), candidates.c.id.label("startup_id"), rank)
+        .join(Round, Round.startup_id == candidates.c.id)
+        .where(Round.status == "published")
+        .order_by(rank.desc(), Round.id.desc())
+        .offset(offset)
+        .limit(limit)
+        .subquery()
+    )
+    # psycopg prepares statements it sees repeatedly, and Postgres may then reuse one generic plan for
+    # every search term. The right plan depends on how common the term is (a short sequential scan
+    # for near-universal terms, the GIN index for rare ones), so plan each search for its own term.
+    db.execute(text("SET LOCAL plan_cache_mode = force_custom_plan"))
+    headline = func.ts_headline(
+        "english",
+        Startup.short_description + " " + Startup.long_description,
+        query,
+        f"StartSel={_START}, StopSel={_STOP}, MaxWords=30, MinWords=10",
+    )
+    rows = db.execute(
+        select(page.c.round_id, page.c.rank, Startup, headline.label("headline"))
+        .join(Startup, Startup.id == page.c.startup_id)
+        .order_by(page.c.rank.desc(), page.c.round_id.desc())
+    ).all()
+    return [_result(row.round_id, row.Startup, row.rank, row.headline) for row in rows]
+
+
+class InvertedIndex:
+    # In-process fallback for SQLite, where there is no full-text column to query. It is loaded from
+    # the database on first use and then patched from committed startup writes in this process.
+    def __init__(self):
+        self.loaded = False
+        self._postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self._terms: dict[int, set[str]] = {}
+        self._lock = Lock()
+
+    def index(self, startup_id: int, fields: dict) -> None:
+        scores: dict[str, float] = defaultdict(float)
+        for name, weight in FIELD_WEIGHTS.items():
+            for term in _TOKEN.findall((fields.get(name) or "").lower()):
+                scores[term] += weight
+        with self._lock:
+            self._remove(startup_id)
+            for term, score in scores.items():
+                self._postings[term][startup_id] = score
+            self._terms[startup_id] = set(scores)
+
+    def remove(self, startup_id: int) -> None:
+        with self._lock:
+            self._remove(startup_id)
+
+    def _remove(self, startup_id: int) -> None:
+        for term in self._terms.pop(startup_id, ()):
+            postings = self._postings[term]
+            postings.pop(startup_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def search(self, terms: list[str]) -> list[tuple[int, float]]:
+        # Every term must match, like websearch_to_tsquery without operators.
+        with self._lock:
+            postings = [self._postings.get(term, {}) for term in terms]
+        if not postings:
+            return []
+        postings.sort(key=len)
+        matches = {
+            startup_id: sum(posting[startup_id] for posting in postings)
+            for startup_id in postings[0]
+            if all(startup_id in posting for posting in postings[1:])
+        }
+        return sorted(matches.items(), key=lambda item: (-item[1], -item[0]))
+
+
+_indexes: WeakKeyDictionary = WeakKeyDictionary()
+_indexes_lock = Lock()
+
+
+def _index_fields(startup) -> dict:
+    return {name: getattr(startup, name) for name in FIELD_WEIGHTS}
+
+
+def inverted_index(db: Session) -> InvertedIndex:
+    engine = db.get_bind()
+    with _indexes_lock:
+        index = _indexes.get(engine)
+        if index is None:
+            index = _indexes[engine] = InvertedIndex()
+    if not index.loaded:
+        columns = [getattr(Startup, name) for name in FIELD_WEIGHTS]
+        for row in db.execute(select(Startup.id, *columns)):
+            index.index(row.id, row._mapping)
+        index.loaded = True
+    return index
+
+
+def _snippet(document: str, terms: set[str], words: int = 30) -> str:
+    # A window of words around the first match, like ts_headline's MaxWords.
+    tokens = document.split()
+    first = next(
+        (i for i, token in enumerate(tokens) if terms.intersection(_TOKEN.findall(token.lower()))),
+        0,
+    )
+    start = max(0, first - words // 3)
+    return re.sub(
+        r"[A-Za-z0-9]+",
+        lambda match: f"{_START}{match.group(0)}{_STOP}" if match.group(0).lower() in terms else match.group(0),
+        " ".join(tokens[start : start + words]),
+    )
+
+
+def _search_inverted_index(db: Session, q: str, offset: int, limit: int) -> list[dict]:
+    terms = _TOKEN.findall(q.lower())
+    rank_by_startup = dict(inverted_index(db).search(terms))
+    if not rank_by_startup:
+        return []
+    hits = [
+        (rank_by_startup[startup_id], round_id, startup_id)
+        for round_id, startup_id in db.execute(select(Round.id, Round.startup_id).where(Round.status == "published"))
+        if startup_id in rank_by_startup
+    ]
+    hits.sort(key=lambda hit: (-hit[0], -hit[1]))
+    page = hits[offset : offset + limit]
+    startups = {
+        startup.id: startup
+        for startup in db.scalars(select(Startup).where(Startup.id.in_({hit[2] for hit in page})))
+    }
+    return [
+        _result(
+            round_id,
+            startups[startup_id],
+            rank,
+            _snippet(f"{startups[startup_id].short_description} {startups[startup_id].long_description}", set(terms)),
+        )
+        for rank, round_id, startup_id in page
+    ]
+
+
+@event.listens_for(Session, "after_flush")
+def _reindex_flushed(session: Session, flush_context) -> None:
+    engine = session.get_bind()
+    index = _indexes.get(engine)
+    if index is None or not index.loaded:
+        return
+    for obj in chain(session.new, session.dirty):
+        if isinstance(obj, Startup):
+            on_commit(session, lambda startup_id=obj.id, fields=_index_fields(obj): index.index(startup_id, fields))
+    for obj in session.deleted:
+        if isinstance(obj, Startup):
+            on_commit(session, lambda startup_id=obj.id: index.remove(startup_id))
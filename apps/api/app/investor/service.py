@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, select, update
+from sqlalchemy.orm import Session
+
+from app.ledger.writer import ledger_writer
+from app.models import Round, Startup, TierOption, Investment, Contract, Reservation, User
+from app.providers.payments import collect_investment
+from app.settings import settings
+from app.startups import summary
+
+
+def eligible_round(db: Session, investor: User, round_id: int, amount_cents: int) -> tuple[Round, TierOption]:
+    if amount_cents <= 0:
+        raise ValueError("Amount must be positive")
+    round_obj = db.get(Round, round_id)
+    if not round_obj or round_obj.status != "published":
+        raise ValueError("Round not available")
+    if settings.country_mode == "CA":
+        startup_country = db.execute(select(Startup.country).where(Startup.id == round_obj.startup_id)).scalar()
+        if startup_country != "CA" or investor.country != "CA":
+            raise ValueError("Canada-only mode enforced")
+    tier = db.execute(
+        select(TierOption).where(TierOption.round_id == round_id, TierOption.tier == round_obj.tier_selected)
+    ).scalar()
+    if tier is None:
+        raise ValueError("Round not available")
+    return round_obj, tier
+
+
+def _record_investment(db: Session, investor: User, round_obj: Round, tier: TierOption, amount_cents: int) -> Investment:
+    payment_id = collect_investment(db, investor.id, round_obj.id, amount_cents, startup_id=round_obj.startup_id)
+    investment = Investment(
+        round_id=round_obj.id,
+        investor_user_id=investor.id,
+        amount_cents=amount_cents,
+        payment_id=payment_id,
+    )
+    db.add(investment)
+    db.flush()
+    now = datetime.utcnow()
+    db.add(
+        Contract(
+            investment_id=investment.id,
+            status="active",
+            principal_cents=amount_cents,
+            payout_cap_cents=int(amount_cents * float(tier.payout_cap_mult)),
+            revenue_share_bps=tier.revenue_share_bps,
+            start_date=now,
+            end_date_cap=now + timedelta(days=tier.time_cap_months * 30),
+            paid_to_date_cents=0,
+        )
+    )
+    db.flush()
+    ledger_writer(db).flush()
+    return investment
+
+
+def _status_after_raise(amount_cents: int):
+    # SET expressions see the row's values from before the UPDATE.
+    return case((Round.raised_cents + amount_cents >= Round.max_raise_cents, "closed"), else_=Round.status)
+
+
+def _release_waitlist(db: Session, round_id: int) -> None:
+    db.execute(
+        update(Reservation)
+        .where(Reservation.round_id == round_id, Reservation.status == "waitlisted")
+        .values(status="expired")
+        .execution_options(synchronize_session=False)
+    )
+
+
+def place_investment(db: Session, investor: User, round_id: int, amount_cents: int) -> Investment:
+    round_obj, tier = eligible_round(db, investor, round_id, amount_cents)
+    if round_obj.raised_cents + round_obj.reserved_cents + amount_cents > round_obj.max_raise_cents:
+        raise ValueError("Round fully subscribed")
+    investment = _record_investment(db, investor, round_obj, tier, amount_cents)
+
+    # The reservation is the last statement before commit: the conditional UPDATE holds the round's
+    # row lock until the transaction ends, so every other write happens before it is taken. Postgres
+    # re-checks the WHERE clause against the latest row version after waiting on that lock, so
+    # concurrent investors cannot both fit into the same remaining capacity; a losing request rolls
+    # back its investment, contract and ledger rows with it.
+    status = db.execute(
+        update(Round)
+        .where(
+            Round.id == round_id,
+            Round.status == "published",
+            Round.raised_cents + Round.reserved_cents + amount_cents <= Round.max_raise_cents,
+        )
+        .values(
+            raised_cents=Round.raised_cents + amount_cents,
+            investor_count=Round.investor_count + 1,
+            status=_status_after_raise(amount_cents),
+        )
+        .returning(Round.status)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if status is None:
+        db.rollback()
+        raise ValueError("Round fully subscribed")
+    if status == "closed":
+        _release_waitlist(db, round_id)
+    # After the round, so investors that do not fit never queue on the startup's summary row.
+    summary.record(
+        db,
+        round_obj.startup_id,
+        raised_cents=amount_cents,
+        active_contracts=1,
+        round_status_changed=status == "closed",
+    )
+    db.commit()
+    return investment
+
+
+def confirm_reservation(db: Session, investor: User, reservation_id: int) -> Investment:
+    reservation = db.get(Reservation, reservation_id)
+    if not reservation or reservation.investor_user_id != investor.id:
+        raise ValueError("Reservation not found")
+    if reservation.status == "waitlisted":
+        raise ValueError("Reservation is waitlisted")
+    now = datetime.utcnow()
+    if reservation.status != "held" or reservation.expires_at <= now:
+        raise ValueError("Reservation expired")
+    round_id, amount_cents = reservation.round_id, reservation.amount_cents
+    round_obj, tier = eligible_round(db, investor, round_id, amount_cents)
+    investment = _record_investment(db, investor, round_obj, tier, amount_cents)
+
+    # Claiming the reservation races only with the expiry sweep; whichever UPDATE matches the held
+    # row first wins. The capacity was set aside at admission, so the round update cannot overfill.
+    claimed = db.execute(
+        update(Reservation)
+        .where(Reservation.id == reservation_id, Reservation.status == "held", Reservation.expires_at > now)
+        .values(status="confirmed", investment_id=investment.id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not claimed:
+        db.rollback()
+        raise ValueError("Reservation expired")
+    status = db.execute(
+        update(Round)
+        .where(Round.id == round_id)
+        .values(
+            raised_cents=Round.raised_cents + amount_cents,
+            reserved_cents=Round.reserved_cents - amount_cents,
+            investor_count=Round.investor_count + 1,
+            status=_status_after_raise(amount_cents),
+        )
+        .returning(Round.status)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if status == "closed":
+        _release_waitlist(db, round_id)
+    summary.record(
+        db,
+        round_obj.startup_id,
+        raised_cents=amount_cents,
+        active_contracts=1,
+        round_status_changed=status == "closed",
+    )
+    db.commit()
+    return investment
@@ -0,0 +1,97 @@
+import csv
+from dataclasses import dataclass
+from datetime import datetime
+import io
+import json
+from typing import Iterator
+
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models import LedgerEntry
+
+COLUMNS = [
+    "id",
+    "ts",
+    "entry_type",
+    "actor_user_id",
+    "startup_id",
+    "round_id",
+    "contract_id",
+    "amount_cents",
+    "metadata_json",
+]
+# Rows fetched per round trip from the server-side cursor; also the unit written to the response.
+BATCH_SIZE = 2000
+
+
+@dataclass(frozen=True)
+class LedgerFilters:
+    entry_type: str | None = None
+    ts_from: datetime | None = None
+    ts_to: datetime | None = None
+
+
+def _ledger_query(filters: LedgerFilters) -> Select:
+    # Chronological, (ts, id) keyed: a range scan of ix_ledger_entries_ts_id, or of
+    # ix_ledger_entries_type_ts_id with an entry_type filter.
+    query = select(*(getattr(LedgerEntry, column) for column in COLUMNS)).order_by(LedgerEntry.ts, LedgerEntry.id)
+    if filters.entry_type:
+        query = query.where(LedgerEntry.entry_type == filters.entry_type)
+    if filters.ts_from is not None:
+        query = query.where(LedgerEntry.ts >= filters.ts_from)
+    if filters.ts_to is not None:
+        query = query.where(LedgerEntry.ts < filters.ts_to)
+    return query
+
+
+def _row_dict(row) -> dict:
+    entry = dict(row._mapping)
+    entry["ts"] = entry["ts"].isoformat()
+    return entry
+
+
+def entry_cursor(entry: dict) -> str:
+    return f"{entry['ts']}_{entry['id']}"
+
+
+def parse_entry_cursor(cursor: str) -> tuple[datetime, int]:
+    # Raises ValueError for a malformed cursor.
+    ts, entry_id = cursor.rsplit("_", 1)
+    return datetime.fromisoformat(ts), int(entry_id)
+
+
+def ledger_page(db: Session, filters: LedgerFilters, cursor: str | None = None, limit: int = 100) -> dict:
+    query = _ledger_query(filters).limit(limit + 1)
+    if cursor:
+        ts, entry_id = parse_entry_cursor(cursor)
+        # The plain ts bound is implied by the row comparison, but only it prunes the earlier partitions.
+        query = query.where(LedgerEntry.ts >= ts, tuple_(LedgerEntry.ts, LedgerEntry.id) > (ts, entry_id))
+    rows = [_row_dict(row) for row in db.execute(query)]
+    page = rows[:limit]
+    return {"entries": page, "next_cursor": entry_cursor(page[-1]) if len(rows) > limit else None}
+
+
+def _batches(db: Session, filters: LedgerFilters) -> Iterator[list]:
+    # yield_per streams from a server-side cursor on Postgres (and steps the cursor on SQLite), so at
+    # most one batch of rows is held in memory whatever the size of the export.
+    result = db.execute(_ledger_query(filters).execution_options(yield_per=BATCH_SIZE))
+    yield from result.partitions()
+
+
+def export_ndjson(db: Session, filters: LedgerFilters) -> Iterator[str]:
+    for batch in _batches(db, filters):
+        yield "".join(json.dumps(_row_dict(row)) + "\n" for row in batch)
+
+
+def export_csv(db: Session, filters: LedgerFilters) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for batch in _batches(db, filters):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
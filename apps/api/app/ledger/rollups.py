@@ -0,0 +1,230 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+import time
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models import LedgerEntry, LedgerRollup
+from app.settings import settings
+
+GRAINS = ("week", "month")
+UNATTRIBUTED = 0
+_KEY = [LedgerRollup.grain, LedgerRollup.entry_type, LedgerRollup.period_start, LedgerRollup.startup_id]
+# Rows per INSERT statement, well under the bind parameter limits of both dialects.
+_UPSERT_BATCH = 1000
+
+
+def period_start(grain: str, day: date) -> date:
+    # Weeks start on Monday, as ISO weeks and Postgres date_trunc('week') do.
+    if grain == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def period_end(grain: str, start: date) -> date:
+    if grain == "week":
+        return start + timedelta(days=7)
+    return (start + timedelta(days=31)).replace(day=1)
+
+
+def periods(grain: str, first: date, last: date) -> list[date]:
+    starts, start = [], period_start(grain, first)
+    while start <= last:
+        starts.append(start)
+        start = period_end(grain, start)
+    return starts
+
+
+def fold(
+    totals: dict, entry_type: str, startup_id: int | None, day: date, amount_cents: int, entry_count: int = 1
+) -> None:
+    # Adds a day's amount to the week and the month containing it.
+    for grain in GRAINS:
+        total = totals[(grain, entry_type, period_start(grain, day), startup_id or UNATTRIBUTED)]
+        total[0] += amount_cents
+        total[1] += entry_count
+
+
+def totals_dict() -> dict:
+    return defaultdict(lambda: [0, 0])
+
+
+def _upsert(db: Session, totals: dict, replace: bool) -> None:
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    rows = [
+        {
+            "grain": grain,
+            "entry_type": entry_type,
+            "period_start": start,
+            "startup_id": startup_id,
+            "amount_cents": amount_cents,
+            "entry_count": entry_count,
+        }
+        for (grain, entry_type, start, startup_id), (amount_cents, entry_count) in sorted(totals.items())
+    ]
+    for offset in range(0, len(rows), _UPSERT_BATCH):
+        statement = dialect_insert(LedgerRollup).values(rows[offset : offset + _UPSERT_BATCH])
+        if replace:
+            values = {"amount_cents": statement.excluded.amount_cents, "entry_count": statement.excluded.entry_count}
+        else:
+            values = {
+                "amount_cents": LedgerRollup.amount_cents + statement.excluded.amount_cents,
+                "entry_count": LedgerRollup.entry_count + statement.excluded.entry_count,
+            }
+        db.execute(statement.on_conflict_do_update(index_elements=_KEY, set_=values))
+
+
+def apply(db: Session, deltas: dict) -> None:
+    # Adds each key's delta to its rollup row with one INSERT ... ON CONFLICT DO UPDATE. Keys are
+    # sorted, so concurrent writers take the row locks they share in the same order. Does not commit.
+    if deltas:
+        _upsert(db, deltas, replace=False)
+
+
+def rollup_totals(
+    db: Session,
+    entry_type: str,
+    grain: str,
+    first: date,
+    last: date,
+    startup_id: int | None = None,
+    by_startup: bool = False,
+) -> list[dict]:
+    # Reads one rollup row per startup and period; the ledger itself is never scanned.
+    starts = periods(grain, first, last)
+    query = select(
+        LedgerRollup.period_start, LedgerRollup.startup_id, LedgerRollup.amount_cents, LedgerRollup.entry_count
+    ).where(
+        LedgerRollup.grain == grain,
+        LedgerRollup.entry_type == entry_type,
+        LedgerRollup.period_start.between(starts[0], starts[-1]),
+    )
+    if startup_id is not None:
+        query = query.where(LedgerRollup.startup_id == startup_id)
+    result = {start: {"period_start": start, "amount_cents": 0, "entry_count": 0, "startups": []} for start in starts}
+    for row in db.execute(query.order_by(LedgerRollup.period_start, LedgerRollup.startup_id)):
+        period = result[row.period_start]
+        period["amount_cents"] += row.amount_cents
+        period["entry_count"] += row.entry_count
+        period["startups"].append(
+            {"startup_id": row.startup_id, "amount_cents": row.amount_cents, "entry_count": row.entry_count}
+        )
+    if not by_startup:
+        for period in result.values():
+            del period["startups"]
+    return list(result.values())
+
+
+def _as_date(value) -> date:
+    # func.date() comes back as a date from Postgres and as an ISO string from SQLite.
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _compared(key: tuple, since: date, cutoff: date) -> bool:
+    grain, _, start, _ = key
+    return since <= start and period_end(grain, start) <= cutoff
+
+
+def _mismatch(key: tuple, expected: dict, stored: dict) -> dict:
+    grain, entry_type, start, startup_id = key
+    expected_amount, expected_count = expected.get(key, (0, 0))
+    stored_amount, stored_count = stored.get(key, (0, 0))
+    return {
+        "grain": grain,
+        "entry_type": entry_type,
+        "period_start": start,
+        "startup_id": startup_id,
+        "expected_amount_cents": expected_amount,
+        "stored_amount_cents": stored_amount,
+        "expected_entry_count": expected_count,
+        "stored_entry_count": stored_count,
+    }
+
+
+def _chunk_totals(session_factory, first_id: int, last_id: int, cutoff: datetime) -> list:
+    day = func.date(LedgerEntry.ts)
+    db = session_factory()
+    try:
+        return db.execute(
+            select(
+                LedgerEntry.entry_type, LedgerEntry.startup_id, day, func.sum(LedgerEntry.amount_cents), func.count()
+            )
+            .where(LedgerEntry.id.between(first_id, last_id), LedgerEntry.ts < cutoff)
+            .group_by(LedgerEntry.entry_type, LedgerEntry.startup_id, day)
+        ).all()
+    finally:
+        db.close()
+
+
+def verify(
+    cutoff: date | None = None,
+    chunk_size: int | None = None,
+    max_workers: int | None = None,
+    repair: bool = False,
+    session_factory=SessionLocal,
+) -> dict:
+    # Re-derives the rollups from the raw ledger and compares them with the stored rows. The ledger is
+    # read in id ranges, concurrently, each range in its own session and grouped by day. Only periods
+    # that ended by the cutoff (default: today, UTC) are compared, as open periods are still being
+    # written, and none before the month of the oldest entry: the rollups outlive detached ledger
+    # partitions. With repair, mismatched rows are overwritten with the re-derived totals.
+    started = time.perf_counter()
+    cutoff = cutoff or datetime.utcnow().date()
+    chunk_size = chunk_size or settings.rollup_verify_chunk_size
+    db = session_factory()
+    try:
+        first_id, last_id, oldest = db.execute(
+            select(func.min(LedgerEntry.id), func.max(LedgerEntry.id), func.min(LedgerEntry.ts))
+        ).one()
+    finally:
+        db.close()
+    ranges = []
+    if first_id is not None:
+        ranges = [(start, min(start + chunk_size - 1, last_id)) for start in range(first_id, last_id + 1, chunk_size)]
+    since = period_start("month", oldest.date()) if oldest else cutoff
+    cutoff_ts = datetime.combine(cutoff, datetime.min.time())
+    with ThreadPoolExecutor(max_workers=max_workers or settings.rollup_verify_workers) as pool:
+        chunks = list(pool.map(lambda bounds: _chunk_totals(session_factory, *bounds, cutoff_ts), ranges))
+
+    expected = totals_dict()
+    for rows in chunks:
+        for entry_type, startup_id, day, amount_cents, entry_count in rows:
+            fold(expected, entry_type, startup_id, _as_date(day), int(amount_cents), entry_count)
+    expected = {key: total for key, total in expected.items() if _compared(key, since, cutoff)}
+
+    db = session_factory()
+    try:
+        rows = db.execute(
+            select(*_KEY, LedgerRollup.amount_cents, LedgerRollup.entry_count).where(
+                LedgerRollup.period_start >= since, LedgerRollup.period_start < cutoff
+            )
+        )
+        stored = {
+            tuple(row[:4]): [row.amount_cents, row.entry_count]
+            for row in rows
+            if _compared(tuple(row[:4]), since, cutoff)
+        }
+        mismatched = sorted(key for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key))
+        if repair and mismatched:
+            replacements = {key: expected[key] for key in mismatched if key in expected}
+            if replacements:
+                _upsert(db, replacements, replace=True)
+            stale = [key for key in mismatched if key not in expected]
+            if stale:
+                db.execute(delete(LedgerRollup).where(tuple_(*_KEY).in_(stale)))
+            db.commit()
+    finally:
+        db.close()
+
+    return {
+        "cutoff": cutoff,
+        "chunk_count": len(ranges),
+        "checked_count": len(expected.keys() | stored.keys()),
+        "mismatches": [_mismatch(key, expected, stored) for key in mismatched],
+        "repaired": repair and bool(mismatched),
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+    }
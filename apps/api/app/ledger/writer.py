@@ -0,0 +1,83 @@
+from datetime import datetime
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from app.ledger import rollups
+from app.models import LedgerEntry
+
+
+class LedgerWriter:
+    # Buffers ledger rows for one session and writes them as part of that session's commit. Flushed
+    # rows are also folded into rollup deltas, which are applied only at commit: the rollup rows are
+    # shared by every writer of the same startup and period, so their locks are taken last.
+    def __init__(self, session: Session):
+        self.session = session
+        self._rows: list[dict] = []
+        self._rollups = rollups.totals_dict()
+
+    def add(
+        self,
+        entry_type: str,
+        amount_cents: int,
+        metadata_json: str | None = None,
+        actor_user_id: int | None = None,
+        startup_id: int | None = None,
+        round_id: int | None = None,
+        contract_id: int | None = None,
+    ) -> None:
+        self._rows.append(
+            {
+                "ts": datetime.utcnow(),
+                "entry_type": entry_type,
+                "actor_user_id": actor_user_id,
+                "startup_id": startup_id,
+                "round_id": round_id,
+                "contract_id": contract_id,
+                "amount_cents": amount_cents,
+                "metadata_json": metadata_json,
+            }
+        )
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        # RETURNING lets SQLAlchemy batch the rows into multi-row INSERT ... VALUES statements on
+        # drivers that would otherwise execute one INSERT per row.
+        self.session.scalars(insert(LedgerEntry).returning(LedgerEntry.id), rows).all()
+        for row in rows:
+            rollups.fold(self._rollups, row["entry_type"], row["startup_id"], row["ts"].date(), row["amount_cents"])
+
+    def flush_rollups(self) -> None:
+        deltas, self._rollups = self._rollups, rollups.totals_dict()
+        rollups.apply(self.session, deltas)
+
+    def discard(self) -> None:
+        self._rows = []
+        self._rollups = rollups.totals_dict()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+def ledger_writer(db: Session) -> LedgerWriter:
+    writer = db.info.get("ledger_writer")
+    if writer is None:
+        writer = db.info["ledger_writer"] = LedgerWriter(db)
+    return writer
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_ledger(session: Session) -> None:
+    writer = session.info.get("ledger_writer")
+    if writer is not None:
+        writer.flush()
+        writer.flush_rollups()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_ledger(session: Session, previous_transaction) -> None:
+    writer = session.info.get("ledger_writer")
+    if writer is not None and previous_transaction.parent is None:
+        writer.discard()
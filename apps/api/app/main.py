@@ -1,13 +1,27 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.db import SessionLocal
 from app.settings import settings
-from app.auth.router import router as auth_router
+from app.auth.passwords import password_hasher
+from app.auth.router import ensure_admin, router as auth_router
 from app.founder.router import router as founder_router
 from app.investor.router import router as investor_router
 from app.admin.router import router as admin_router
 
-app = FastAPI(title=f"{settings.company_name} API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    password_hasher.start()
+    with SessionLocal() as db:
+        ensure_admin(db)
+    yield
+    password_hasher.shutdown()
+
+
+app = FastAPI(title=f"{settings.company_name} API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -1,6 +1,7 @@
-from datetime import datetime
-from sqlalchemy import String, Integer, ForeignKey, DateTime, Text, Numeric
-from sqlalchemy.orm import Mapped, mapped_column
+from datetime import date, datetime
+import re
+from sqlalchemy import String, Integer, BigInteger, ForeignKey, Date, DateTime, Text, Numeric, UniqueConstraint, CheckConstraint, Index
+from sqlalchemy.orm import Mapped, mapped_column, validates
 
 from app.db import Base
 
@@ -12,11 +13,33 @@ class User(Base):
     hashed_password: Mapped[str] = mapped_column(String(255))
     role: Mapped[str] = mapped_column(String(50))
     country: Mapped[str] = mapped_column(String(2), default="CA")
+    token_version: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
+class TokenRevocation(Base):
+    # Access tokens revoked before they expire (logout); rows past expires_at can be deleted.
+    __tablename__ = "token_revocations"
+    __table_args__ = (Index("ix_token_revocations_expires_at", "expires_at"),)
+    jti: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    expires_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class CacheVersion(Base):
+    # Version stamps for in-process caches: a writer bumps the stamp in its transaction and every worker
+    # drops its cached entries once it sees the new version.
+    __tablename__ = "cache_versions"
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+
+
 class Startup(Base):
     __tablename__ = "startups"
+    __table_args__ = (
+        Index("ix_startups_industry_stage_country", "industry", "revenue_stage", "country"),
+        Index("ix_startups_founder_user_id", "founder_user_id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     founder_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     legal_name: Mapped[str] = mapped_column(String(255))
@@ -43,8 +66,24 @@ class Startup(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
+class StartupSummary(Base):
+    # Read model maintained by app.startups.summary in the same transaction as the writes it reflects.
+    __tablename__ = "startup_summaries"
+    startup_id: Mapped[int] = mapped_column(ForeignKey("startups.id"), primary_key=True)
+    total_raised_cents: Mapped[int] = mapped_column(BigInteger, default=0)
+    live_round_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    last_revenue_month: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    total_distributed_cents: Mapped[int] = mapped_column(BigInteger, default=0)
+    active_contract_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        Index("ix_applications_status_submitted", "status", "submitted_at", "id"),
+        Index("ix_applications_submitted", "submitted_at", "id"),
+        Index("ix_applications_startup_status", "startup_id", "status"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     startup_id: Mapped[int] = mapped_column(ForeignKey("startups.id"))
     name: Mapped[str] = mapped_column(String(255))
@@ -62,6 +101,7 @@ class Application(Base):
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (Index("ix_documents_startup_id", "startup_id"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     startup_id: Mapped[int] = mapped_column(ForeignKey("startups.id"))
     doc_type: Mapped[str] = mapped_column(String(50))
@@ -72,11 +112,20 @@ class Document(Base):
 
 class Round(Base):
     __tablename__ = "rounds"
+    __table_args__ = (
+        CheckConstraint("raised_cents + reserved_cents <= max_raise_cents", name="ck_rounds_subscribed_within_max"),
+        Index("ix_rounds_status_id", "status", "id"),
+        Index("ix_rounds_startup_status", "startup_id", "status", "id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     startup_id: Mapped[int] = mapped_column(ForeignKey("startups.id"))
     application_id: Mapped[int] = mapped_column(ForeignKey("applications.id"))
     title: Mapped[str] = mapped_column(String(255))
     max_raise_cents: Mapped[int] = mapped_column(Integer)
+    raised_cents: Mapped[int] = mapped_column(Integer, default=0)
+    reserved_cents: Mapped[int] = mapped_column(Integer, default=0)
+    investor_count: Mapped[int] = mapped_column(Integer, default=0)
+    version: Mapped[int] = mapped_column(Integer, default=1)
     tier_selected: Mapped[str | None] = mapped_column(String(20), nullable=True)
     status: Mapped[str] = mapped_column(String(20), default="draft")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -85,6 +134,7 @@ class Round(Base):
 
 class TierOption(Base):
     __tablename__ = "tier_options"
+    __table_args__ = (Index("ix_tier_options_round_tier", "round_id", "tier"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     round_id: Mapped[int] = mapped_column(ForeignKey("rounds.id"))
     tier: Mapped[str] = mapped_column(String(20))
@@ -99,6 +149,10 @@ class TierOption(Base):
 
 class Investment(Base):
     __tablename__ = "investments"
+    __table_args__ = (
+        Index("ix_investments_round_id", "round_id"),
+        Index("ix_investments_investor_user_id", "investor_user_id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     round_id: Mapped[int] = mapped_column(ForeignKey("rounds.id"))
     investor_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
@@ -107,8 +161,28 @@ class Investment(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
+class Reservation(Base):
+    __tablename__ = "reservations"
+    __table_args__ = (
+        Index("ix_reservations_round_status", "round_id", "status", "id"),
+        Index("ix_reservations_investor", "investor_user_id", "id"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    round_id: Mapped[int] = mapped_column(ForeignKey("rounds.id"))
+    investor_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    amount_cents: Mapped[int] = mapped_column(Integer)
+    status: Mapped[str] = mapped_column(String(20), default="held")
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    investment_id: Mapped[int | None] = mapped_column(ForeignKey("investments.id"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 class Contract(Base):
     __tablename__ = "contracts"
+    __table_args__ = (
+        Index("ix_contracts_investment_id", "investment_id"),
+        Index("ix_contracts_status", "status"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     investment_id: Mapped[int] = mapped_column(ForeignKey("investments.id"))
     status: Mapped[str] = mapped_column(String(20), default="active")
@@ -120,29 +194,59 @@ class Contract(Base):
     paid_to_date_cents: Mapped[int] = mapped_column(Integer, default=0)
 
 
+_MONTH = re.compile(r"(\d{4})-(\d{2})")
+
+
+def month_start(month: str | None) -> date | None:
+    # "2024-06" (or a full "2024-06-15") to the first day of that month; None for anything else.
+    match = _MONTH.match(month or "")
+    if not match or not 1 <= int(match.group(2)) <= 12:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
 class RevenueReport(Base):
     __tablename__ = "revenue_reports"
+    __table_args__ = (
+        Index("ix_revenue_reports_startup_month", "startup_id", "month_start"),
+        Index("ix_revenue_reports_startup_month_label", "startup_id", "month"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     startup_id: Mapped[int] = mapped_column(ForeignKey("startups.id"))
     month: Mapped[str] = mapped_column(String(20))
+    month_start: Mapped[date | None] = mapped_column(Date, nullable=True)
     gross_revenue_cents: Mapped[int] = mapped_column(Integer)
     reported_by: Mapped[int] = mapped_column(ForeignKey("users.id"))
     distribution_status: Mapped[str] = mapped_column(String(20), default="pending")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    @validates("month")
+    def _set_month_start(self, key, month):
+        # month stays the reported label; month_start is its typed form for range queries.
+        self.month_start = month_start(month)
+        return month
+
 
 class Distribution(Base):
     __tablename__ = "distributions"
+    __table_args__ = (UniqueConstraint("startup_id", "month", name="uq_distributions_startup_month"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     startup_id: Mapped[int] = mapped_column(ForeignKey("startups.id"))
     month: Mapped[str] = mapped_column(String(20))
+    gross_revenue_cents: Mapped[int] = mapped_column(Integer, default=0)
     total_distributed_cents: Mapped[int] = mapped_column(Integer)
+    status: Mapped[str] = mapped_column(String(20), default="running")
+    checkpoint_contract_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     created_by: Mapped[int] = mapped_column(ForeignKey("users.id"))
 
 
 class Payout(Base):
     __tablename__ = "payouts"
+    __table_args__ = (
+        UniqueConstraint("distribution_id", "contract_id", name="uq_payouts_distribution_contract"),
+        Index("ix_payouts_contract_id", "contract_id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     contract_id: Mapped[int] = mapped_column(ForeignKey("contracts.id"))
     distribution_id: Mapped[int] = mapped_column(ForeignKey("distributions.id"))
@@ -153,6 +257,7 @@ class Payout(Base):
 
 class ExitRequest(Base):
     __tablename__ = "exits"
+    __table_args__ = (Index("ix_exits_contract_id", "contract_id"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     contract_id: Mapped[int] = mapped_column(ForeignKey("contracts.id"))
     requested_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -165,7 +270,16 @@ class ExitRequest(Base):
 
 
 class LedgerEntry(Base):
+    # On Postgres, partitioned by month of ts (migration 0013, app.partitions), keyed by (id, ts).
     __tablename__ = "ledger_entries"
+    __table_args__ = (
+        Index("ix_ledger_entries_ts_brin", "ts", postgresql_using="brin"),
+        Index("ix_ledger_entries_ts_id", "ts", "id"),
+        Index("ix_ledger_entries_type_ts_id", "entry_type", "ts", "id"),
+        Index("ix_ledger_entries_startup_id", "startup_id"),
+        Index("ix_ledger_entries_round_id", "round_id"),
+        Index("ix_ledger_entries_contract_id", "contract_id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     ts: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     entry_type: Mapped[str] = mapped_column(String(50))
@@ -177,8 +291,27 @@ class LedgerEntry(Base):
     metadata_json: Mapped[str | None] = mapped_column(Text, nullable=True)
 
 
+class LedgerRollup(Base):
+    # Ledger totals per entry type, startup and week or month, maintained by app.ledger.rollups as entries
+    # are written. startup_id 0 collects entries that are not attributed to a startup.
+    __tablename__ = "ledger_rollups"
+    __table_args__ = (Index("ix_ledger_rollups_startup", "startup_id", "grain", "entry_type", "period_start"),)
+    grain: Mapped[str] = mapped_column(String(10), primary_key=True)
+    entry_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    startup_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    amount_cents: Mapped[int] = mapped_column(BigInteger, default=0)
+    entry_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
 class AuditLog(Base):
+    # Partitioned like LedgerEntry on Postgres.
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_ts_brin", "ts", postgresql_using="brin"),
+        Index("ix_audit_logs_actor_user_id", "actor_user_id"),
+        Index("ix_audit_logs_entity", "entity_type", "entity_id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     ts: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     actor_user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
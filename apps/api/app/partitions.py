@@ -0,0 +1,105 @@
+from datetime import date, datetime
+import re
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+# Append-only tables that Postgres partitions by month of ts (migration 0013). Each has one partition
+# per month, named <table>_YYYY_MM, and a <table>_default partition for rows outside every month.
+PARTITIONED_TABLES = ("ledger_entries", "audit_logs")
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def _require_postgres(engine: Engine) -> None:
+    if engine.dialect.name != "postgresql":
+        raise ValueError("Partitioned tables are Postgres only")
+
+
+def partition_months(connection, table: str) -> list[date]:
+    names = connection.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class AS parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :table
+            """
+        ),
+        {"table": table},
+    ).scalars()
+    months = []
+    for name in names:
+        match = re.fullmatch(rf"{table}_(\d{{4}})_(\d{{2}})", name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def _create_partition(connection, table: str, month: date) -> None:
+    # Built as a standalone table and then attached: CREATE TABLE ... PARTITION OF would lock the parent
+    # against writes, ATTACH PARTITION does not. Rows that reached the default partition for the month
+    # are moved over first, and the CHECK constraint lets ATTACH skip scanning the new table. DDL takes
+    # no bind parameters, so the bounds are inlined; they are formatted from dates.
+    name = partition_name(table, month)
+    start, end = f"'{month:%Y-%m-%d}'", f"'{add_months(month, 1):%Y-%m-%d}'"
+    connection.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)"))
+    connection.execute(text(f"ALTER TABLE {name} ADD CONSTRAINT {name}_bounds CHECK (ts >= {start} AND ts < {end})"))
+    connection.execute(
+        text(
+            f"""
+            WITH moved AS (DELETE FROM {table}_default WHERE ts >= {start} AND ts < {end} RETURNING *)
+            INSERT INTO {name} SELECT * FROM moved
+            """
+        )
+    )
+    connection.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ({start}) TO ({end})"))
+    connection.execute(text(f"ALTER TABLE {name} DROP CONSTRAINT {name}_bounds"))
+
+
+def ensure_partitions(engine: Engine, months_ahead: int = 3, today: date | None = None) -> list[str]:
+    # Creates any missing partition from the current month through months_ahead months from now, one
+    # transaction per partition. Safe to rerun.
+    _require_postgres(engine)
+    current = (today or datetime.utcnow().date()).replace(day=1)
+    created = []
+    for table in PARTITIONED_TABLES:
+        with engine.connect() as connection:
+            existing = set(partition_months(connection, table))
+        for month in (add_months(current, offset) for offset in range(months_ahead + 1)):
+            if month in existing:
+                continue
+            with engine.begin() as connection:
+                _create_partition(connection, table, month)
+            created.append(partition_name(table, month))
+    return created
+
+
+def detach_partitions(engine: Engine, before: date, drop: bool = False, lock_timeout: str = "5s") -> list[str]:
+    # Detaches the monthly partitions of every month before the given one: a catalog change, however
+    # many rows they hold. DETACH ... CONCURRENTLY is not allowed next to a default partition, so each
+    # detach briefly locks the parent, and gives up after lock_timeout rather than queue writes behind
+    # a long-running reader. Detached partitions stay as standalone tables to archive, unless dropped.
+    _require_postgres(engine)
+    before = before.replace(day=1)
+    detached = []
+    for table in PARTITIONED_TABLES:
+        with engine.connect() as connection:
+            months = [month for month in partition_months(connection, table) if month < before]
+        for month in months:
+            name = partition_name(table, month)
+            with engine.begin() as connection:
+                connection.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+                connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                if drop:
+                    connection.execute(text(f"DROP TABLE {name}"))
+            detached.append(name)
+    return detached
@@ -2,13 +2,11 @@ from uuid import uuid4
 from sqlalchemy.orm import Session
 
 from app.settings import settings
-from app.models import LedgerEntry
+from app.ledger.writer import ledger_writer
 
 
-def _record_simulated(db: Session, entry_type: str, amount_cents: int, meta: str) -> None:
-    entry = LedgerEntry(entry_type=entry_type, amount_cents=amount_cents, metadata_json=meta)
-    db.add(entry)
-    db.commit()
+def _record_simulated(db: Session, entry_type: str, amount_cents: int, meta: str, **refs) -> None:
+    ledger_writer(db).add(entry_type=entry_type, amount_cents=amount_cents, metadata_json=meta, **refs)
 
 
 def _demo_id(prefix: str) -> str:
@@ -18,7 +16,7 @@ def _demo_id(prefix: str) -> str:
 def charge_application_fee(db: Session, founder_id: int, amount_cents: int) -> str:
     if not settings.enable_stripe or not settings.stripe_secret_key:
         payment_id = _demo_id("pay_demo")
-        _record_simulated(db, "application_fee", amount_cents, f"founder={founder_id}")
+        _record_simulated(db, "application_fee", amount_cents, f"founder={founder_id}", actor_user_id=founder_id)
         return payment_id
     return _demo_id("pay_stripe")
 
@@ -26,17 +24,20 @@ def charge_application_fee(db: Session, founder_id: int, amount_cents: int) -> s
 def create_connected_account(db: Session, founder_id: int) -> str:
     if not settings.enable_stripe or not settings.stripe_secret_key:
         account_id = _demo_id("acct_demo")
-        _record_simulated(db, "connected_account", 0, f"founder={founder_id}")
+        _record_simulated(db, "connected_account", 0, f"founder={founder_id}", actor_user_id=founder_id)
         return account_id
     return _demo_id("acct_stripe")
 
 
-def collect_investment(db: Session, investor_id: int, round_id: int, amount_cents: int) -> str:
+def collect_investment(
+    db: Session, investor_id: int, round_id: int, amount_cents: int, startup_id: int | None = None
+) -> str:
     platform_fee_cents = int(amount_cents * 0.02)
     if not settings.enable_stripe or not settings.stripe_secret_key:
         payment_id = _demo_id("pay_demo")
-        _record_simulated(db, "investment", amount_cents, f"investor={investor_id} round={round_id}")
-        _record_simulated(db, "platform_fee", platform_fee_cents, f"investor={investor_id}")
+        refs = {"actor_user_id": investor_id, "startup_id": startup_id, "round_id": round_id}
+        _record_simulated(db, "investment", amount_cents, f"investor={investor_id} round={round_id}", **refs)
+        _record_simulated(db, "platform_fee", platform_fee_cents, f"investor={investor_id}", **refs)
         return payment_id
     return _demo_id("pay_stripe")
 
@@ -47,3 +48,13 @@ def payout_investor(db: Session, investor_id: int, amount_cents: int) -> str:
         _record_simulated(db, "payout", amount_cents, f"investor={investor_id}")
         return payout_id
     return _demo_id("po_stripe")
+
+
+def payout_investors(db: Session, startup_id: int, payouts: list[tuple[int, int]]) -> list[str]:
+    if not settings.enable_stripe or not settings.stripe_secret_key:
+        for contract_id, amount_cents in payouts:
+            _record_simulated(
+                db, "payout", amount_cents, f"contract={contract_id}", startup_id=startup_id, contract_id=contract_id
+            )
+        return [_demo_id("po_demo") for _ in payouts]
+    return [_demo_id("po_stripe") for _ in payouts]
@@ -7,8 +7,25 @@ class Settings(BaseSettings):
     database_url: str = "postgresql+psycopg://radion:radion@db:5432/radion"
     jwt_secret: str = "dev_secret"
     jwt_expire_minutes: int = 60
+    principal_cache_seconds: float = 300.0
+    principal_stamp_seconds: float = 1.0
     admin_email: str = "admin@demo.com"
     admin_password: str = "password"
+    password_hash_rounds: int = 12
+    password_hash_workers: int = 0  # 0: one per CPU
+
+    distribution_chunk_size: int = 1000
+    distribution_workers: int = 8
+    distribution_budget_seconds: float = 600.0
+    distribution_request_budget_seconds: float = 20.0
+    rollup_verify_chunk_size: int = 100000
+    rollup_verify_workers: int = 8
+    preview_cache_seconds: float = 300.0
+    discovery_cache_seconds: float = 30.0
+    search_candidate_limit: int = 2000
+    invest_admission_mode: str = "direct"
+    reservation_seconds: float = 900.0
+    admission_batch_size: int = 200
 
     enable_stripe: bool = False
     stripe_secret_key: str | None = None
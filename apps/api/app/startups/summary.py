@@ -0,0 +1,132 @@
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models import Contract, Distribution, Investment, RevenueReport, Round, Startup, StartupSummary
+
+
+def _live_round(startup_id):
+    return (
+        select(func.min(Round.id))
+        .where(Round.startup_id == startup_id, Round.status == "published")
+        .scalar_subquery()
+    )
+
+
+def _summaries(startup_ids=None):
+    # Every fact from the raw tables with one grouped subquery each, for all startups or a given set.
+    rounds = (
+        select(
+            Round.startup_id,
+            func.sum(Round.raised_cents).label("total_raised_cents"),
+            func.min(Round.id).filter(Round.status == "published").label("live_round_id"),
+        )
+        .group_by(Round.startup_id)
+        .subquery()
+    )
+    reports = (
+        select(
+            RevenueReport.startup_id,
+            RevenueReport.month,
+            func.row_number()
+            .over(
+                partition_by=RevenueReport.startup_id,
+                order_by=(RevenueReport.created_at.desc(), RevenueReport.id.desc()),
+            )
+            .label("position"),
+        )
+        .subquery()
+    )
+    distributions = (
+        select(Distribution.startup_id, func.sum(Distribution.total_distributed_cents).label("total_distributed_cents"))
+        .group_by(Distribution.startup_id)
+        .subquery()
+    )
+    contracts = (
+        select(Round.startup_id, func.count(Contract.id).label("active_contract_count"))
+        .join(Investment, Investment.round_id == Round.id)
+        .join(Contract, Contract.investment_id == Investment.id)
+        .where(Contract.status == "active")
+        .group_by(Round.startup_id)
+        .subquery()
+    )
+    query = (
+        select(
+            Startup.id,
+            func.coalesce(rounds.c.total_raised_cents, 0),
+            rounds.c.live_round_id,
+            reports.c.month,
+            func.coalesce(distributions.c.total_distributed_cents, 0),
+            func.coalesce(contracts.c.active_contract_count, 0),
+        )
+        .outerjoin(rounds, rounds.c.startup_id == Startup.id)
+        .outerjoin(reports, (reports.c.startup_id == Startup.id) & (reports.c.position == 1))
+        .outerjoin(distributions, distributions.c.startup_id == Startup.id)
+        .outerjoin(contracts, contracts.c.startup_id == Startup.id)
+    )
+    if startup_ids is not None:
+        query = query.where(Startup.id.in_(startup_ids))
+    return query
+
+
+_COLUMNS = [
+    StartupSummary.startup_id,
+    StartupSummary.total_raised_cents,
+    StartupSummary.live_round_id,
+    StartupSummary.last_revenue_month,
+    StartupSummary.total_distributed_cents,
+    StartupSummary.active_contract_count,
+]
+
+
+def rebuild(db: Session, startup_ids: list[int] | None = None) -> int:
+    # Recomputes summaries from the raw tables, in bulk: one DELETE and one INSERT ... SELECT. Does not commit.
+    statement = delete(StartupSummary)
+    if startup_ids is not None:
+        statement = statement.where(StartupSummary.startup_id.in_(startup_ids))
+    db.execute(statement)
+    return db.execute(insert(StartupSummary).from_select(_COLUMNS, _summaries(startup_ids))).rowcount
+
+
+def _create(db: Session, startup_id: int) -> bool:
+    # INSERT ... ON CONFLICT DO NOTHING: False when a concurrent transaction created the row first.
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = dialect_insert(StartupSummary).from_select(_COLUMNS, _summaries([startup_id])).on_conflict_do_nothing()
+    return bool(db.execute(statement).rowcount)
+
+
+def record(
+    db: Session,
+    startup_id: int,
+    raised_cents: int = 0,
+    distributed_cents: int = 0,
+    active_contracts: int = 0,
+    revenue_month: str | None = None,
+    round_status_changed: bool = False,
+) -> None:
+    # Applies a write's effect to the startup's summary inside the writer's transaction. Counters move
+    # by deltas, so concurrent writers never overwrite each other. A startup without a summary row
+    # yet gets one computed from the raw tables, which already include this transaction's writes.
+    values = {}
+    if raised_cents:
+        values["total_raised_cents"] = StartupSummary.total_raised_cents + raised_cents
+    if distributed_cents:
+        values["total_distributed_cents"] = StartupSummary.total_distributed_cents + distributed_cents
+    if active_contracts:
+        values["active_contract_count"] = StartupSummary.active_contract_count + active_contracts
+    if revenue_month is not None:
+        values["last_revenue_month"] = revenue_month
+    if round_status_changed:
+        values["live_round_id"] = _live_round(startup_id)
+    if not values:
+        return
+    db.flush()
+    statement = (
+        update(StartupSummary)
+        .where(StartupSummary.startup_id == startup_id)
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+    if not db.execute(statement).rowcount and not _create(db, startup_id):
+        # The other transaction's row was computed without this write.
+        db.execute(statement)
@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta
+import json
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app import models  # noqa: F401
+from app.models import User, Startup, Application, Round, TierOption, Investment, Contract
+from app.auth.principals import principal_cache
+from app.auth.revocations import revocation_list
+from app.distributions import preview
+from app.investor import discovery
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    preview.invalidate()
+    discovery.invalidate()
+    principal_cache.clear()
+    revocation_list.clear()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def query_counter(engine):
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _count)
+
+
+@pytest.fixture
+def make_user(db):
+    def _make(role="investor", email=None, country="CA"):
+        user = User(
+            email=email or f"{role}{db.query(User).count()}@demo.com",
+            hashed_password="x",
+            role=role,
+            country=country,
+        )
+        db.add(user)
+        db.commit()
+        return user
+
+    return _make
+
+
+@pytest.fixture
+def make_startup(db, make_user):
+    def _make(founder=None, **overrides):
+        founder = founder or make_user("founder")
+        fields = dict(
+            founder_user_id=founder.id,
+            legal_name="Steelman Industries",
+            operating_name="Steelman",
+            country="CA",
+            incorporation_type="Corp",
+            incorporation_date="2021-01-01",
+            industry="Fintech",
+            short_description="Compliance-first revenue-share platform.",
+            long_description="A revenue-share marketplace for aligned capital.",
+            current_monthly_revenue="$25k-$50k",
+            revenue_model="SaaS",
+            revenue_consistency="Stable",
+            revenue_stage="Stable",
+            existing_debt=0,
+            existing_investors=0,
+            intended_use_of_funds=json.dumps(["Hiring"]),
+            target_funding_size="$250k-$1M",
+            preferred_timeline="3-6 months",
+            status="draft",
+        )
+        fields.update(overrides)
+        startup = Startup(**fields)
+        db.add(startup)
+        db.commit()
+        return startup
+
+    return _make
+
+
+@pytest.fixture
+def make_round(db, make_startup):
+    def _make(startup=None, max_raise_cents=5000000, status="published", revenue_share_bps=350):
+        startup = startup or make_startup()
+        application = Application(
+            startup_id=startup.id,
+            name="Initial Funding Application",
+            application_type="Initial Funding Application",
+            requested_limit_cents=max_raise_cents,
+            risk_preference="medium",
+            status="approved",
+        )
+        db.add(application)
+        db.flush()
+        round_obj = Round(
+            startup_id=startup.id,
+            application_id=application.id,
+            title="Revenue Share Round",
+            max_raise_cents=max_raise_cents,
+            tier_selected="medium",
+            status=status,
+            published_at=datetime.utcnow() if status == "published" else None,
+        )
+        db.add(round_obj)
+        db.flush()
+        db.add(
+            TierOption(
+                round_id=round_obj.id,
+                tier="medium",
+                revenue_share_bps=revenue_share_bps,
+                time_cap_months=24,
+                payout_cap_mult=1.7,
+                min_hold_days=90,
+                exit_fee_bps_quarterly=50,
+                exit_fee_bps_offcycle=150,
+                explanation_json="{}",
+            )
+        )
+        db.commit()
+        return round_obj
+
+    return _make
+
+
+@pytest.fixture
+def make_contracts(db, make_user):
+    def _make(round_obj, count, principal_cents=100000, payout_cap_cents=170000, paid_to_date_cents=0, revenue_share_bps=350):
+        investor = make_user("investor")
+        contracts = []
+        for _ in range(count):
+            investment = Investment(
+                round_id=round_obj.id,
+                investor_user_id=investor.id,
+                amount_cents=principal_cents,
+                payment_id="pay_test",
+            )
+            db.add(investment)
+            db.flush()
+            contract = Contract(
+                investment_id=investment.id,
+                status="active",
+                principal_cents=principal_cents,
+                payout_cap_cents=payout_cap_cents,
+                revenue_share_bps=revenue_share_bps,
+                start_date=datetime.utcnow(),
+                end_date_cap=datetime.utcnow() + timedelta(days=720),
+                paid_to_date_cents=paid_to_date_cents,
+            )
+            db.add(contract)
+            contracts.append(contract)
+        db.commit()
+        return contracts
+
+    return _make
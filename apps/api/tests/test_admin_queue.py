@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from app.admin.router import applications
+from app.models import Application, Document
+
+
+def _queue(db, admin, **params):
+    params = {"status": None, "order": "oldest", "cursor": None, "limit": 50, **params}
+    return applications(db=db, current_user=admin, **params)
+
+
+def test_review_queue_pages_by_submission_with_constant_queries(db, make_user, make_startup, query_counter):
+    admin = make_user("admin")
+    submitted = datetime(2024, 7, 1)
+    for index in range(7):
+        startup = make_startup()
+        db.add(Document(startup_id=startup.id, doc_type="financials", filename="f.pdf", storage_key=f"k{index}"))
+        db.add(
+            Application(
+                startup_id=startup.id,
+                name=f"Application {index}",
+                application_type="Initial Funding Application",
+                requested_limit_cents=100000,
+                risk_preference="medium",
+                status="approved" if index == 3 else "submitted",
+                # Two applications share a timestamp, so the id breaks the tie.
+                submitted_at=submitted + timedelta(hours=min(index, 5)),
+            )
+        )
+    db.add(
+        Application(
+            startup_id=startup.id,
+            name="Draft",
+            application_type="Initial Funding Application",
+            requested_limit_cents=100000,
+            risk_preference="medium",
+        )
+    )
+    db.commit()
+    db.refresh(admin)
+
+    seen, cursor, counts = [], None, []
+    while True:
+        query_counter.clear()
+        page = _queue(db, admin, status="submitted", cursor=cursor, limit=2)
+        counts.append(len(query_counter))
+        seen += [entry["name"] for entry in page["applications"]]
+        assert all(entry["documents"] == [{"doc_type": "financials", "filename": "f.pdf"}] for entry in page["applications"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"Application {index}" for index in (0, 1, 2, 4, 5, 6)]
+    assert set(counts) == {2}
+
+    newest = _queue(db, admin, order="newest", limit=3)["applications"]
+    assert [entry["name"] for entry in newest] == ["Application 6", "Application 5", "Application 4"]
+    assert "Draft" not in [entry["name"] for entry in _queue(db, admin)["applications"]]
@@ -0,0 +1,74 @@
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.investor.admission import AdmissionQueue, reserve, expire_reservations
+from app.investor.service import confirm_reservation, place_investment
+from app.models import Reservation
+
+
+def test_reserve_holds_capacity_then_waitlists(db, make_user, make_round):
+    round_obj = make_round(max_raise_cents=200000)
+    investors = [make_user("investor") for _ in range(3)]
+    held = [reserve(db, investor, round_obj.id, 100000) for investor in investors]
+    db.commit()
+    assert [reservation.status for reservation in held] == ["held", "held", "waitlisted"]
+    db.refresh(round_obj)
+    assert round_obj.reserved_cents == 200000
+    with pytest.raises(ValueError, match="fully subscribed"):
+        place_investment(db, make_user("investor"), round_obj.id, 100000)
+
+
+def test_expired_hold_is_released_to_the_waitlist(db, make_user, make_round):
+    round_obj = make_round(max_raise_cents=100000)
+    first, second = make_user("investor"), make_user("investor")
+    lapsed = reserve(db, first, round_obj.id, 100000, now=datetime.utcnow() - timedelta(days=1))
+    waiting = reserve(db, second, round_obj.id, 100000)
+    db.commit()
+    assert expire_reservations(db) == 1
+    db.commit()
+    db.refresh(lapsed)
+    db.refresh(waiting)
+    assert (lapsed.status, waiting.status) == ("expired", "held")
+    with pytest.raises(ValueError, match="expired"):
+        confirm_reservation(db, first, lapsed.id)
+
+
+def test_confirming_the_last_hold_closes_the_round(db, make_user, make_round):
+    round_obj = make_round(max_raise_cents=200000)
+    first, second = make_user("investor"), make_user("investor")
+    holds = [reserve(db, first, round_obj.id, 100000), reserve(db, first, round_obj.id, 100000)]
+    waiting = reserve(db, second, round_obj.id, 100000)
+    db.commit()
+    for reservation in holds:
+        confirm_reservation(db, first, reservation.id)
+    db.refresh(round_obj)
+    db.refresh(waiting)
+    assert (round_obj.status, round_obj.raised_cents, round_obj.reserved_cents) == ("closed", 200000, 0)
+    assert round_obj.investor_count == 2
+    assert waiting.status == "expired"
+
+
+def test_queue_admits_in_arrival_order(db, session_factory, make_user, make_round):
+    round_obj = make_round(max_raise_cents=300000)
+    investors = [make_user("investor") for _ in range(5)]
+    admission_queue = AdmissionQueue(session_factory=session_factory, batch_size=2)
+    admissions = [admission_queue.submit(investor.id, round_obj.id, 100000) for investor in investors]
+    results = [admission.result(timeout=10) for admission in admissions]
+    admission_queue.stop()
+    assert [result["status"] for result in results] == ["held"] * 3 + ["waitlisted"] * 2
+    assert [result["waitlist_position"] for result in results[3:]] == [1, 2]
+    assert db.query(Reservation).filter(Reservation.status == "held").count() == 3
+
+
+def test_queue_skips_requests_cancelled_while_queued(db, session_factory, make_user, make_round):
+    round_obj = make_round(max_raise_cents=300000)
+    timed_out, waiting = make_user("investor"), make_user("investor")
+    cancelled, admitted = Future(), Future()
+    assert cancelled.cancel()
+    AdmissionQueue(session_factory=session_factory)._admit(
+        [(cancelled, timed_out.id, round_obj.id, 100000), (admitted, waiting.id, round_obj.id, 100000)]
+    )
+    assert admitted.result(timeout=0)["status"] == "held"
+    assert [r.investor_user_id for r in db.query(Reservation).all()] == [waiting.id]
@@ -0,0 +1,49 @@
+import time
+
+from fastapi import HTTPException
+import pytest
+
+from app.auth.principals import PrincipalCache
+from app.auth.router import get_current_user
+from app.auth.security import create_access_token
+from app.models import CacheVersion
+
+
+def _bearer(user) -> str:
+    return f"Bearer {create_access_token({'sub': str(user.id), 'role': user.role, 'ver': user.token_version})}"
+
+
+def test_authenticated_requests_skip_the_user_query(db, make_user, query_counter):
+    user = make_user("investor")
+    authorization = _bearer(user)
+    query_counter.clear()
+
+    first = get_current_user(authorization=authorization, db=db)
+    # The revocation list's stamp and load, the principal stamp and the user.
+    assert len(query_counter) == 5
+    query_counter.clear()
+    second = get_current_user(authorization=authorization, db=db)
+    assert query_counter == []
+    assert first is second
+    assert (second.id, second.role, second.country) == (user.id, "investor", "CA")
+
+
+def test_role_change_reaches_this_worker_on_commit_and_others_by_stamp(db, make_user):
+    user = make_user("investor")
+    other_worker = PrincipalCache(stamp_seconds=0.05)
+    assert get_current_user(authorization=_bearer(user), db=db).role == "investor"
+    assert other_worker.principal(db, user.id).role == "investor"
+
+    user.role = "admin"
+    db.commit()
+    assert db.get(CacheVersion, "principals").version == 1
+    assert get_current_user(authorization=_bearer(user), db=db).role == "admin"
+    assert other_worker.principal(db, user.id).role == "investor"
+    time.sleep(0.06)
+    assert other_worker.principal(db, user.id).role == "admin"
+
+
+def test_invalid_tokens_are_rejected(db):
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(authorization="Bearer not-a-token", db=db)
+    assert exc.value.status_code == 401
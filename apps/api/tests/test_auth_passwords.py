@@ -0,0 +1,45 @@
+from fastapi import HTTPException
+import pytest
+
+from app.auth.passwords import PasswordHasher, hash_cost, password_hasher
+from app.auth.router import AuthRequest, login
+from app.models import User
+from app.settings import settings
+
+
+@pytest.fixture(scope="module")
+def hasher():
+    hasher = PasswordHasher(workers=2, rounds=4)
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.fixture
+def fast_hashes(monkeypatch):
+    monkeypatch.setattr(password_hasher, "rounds", 5)
+    yield password_hasher
+    password_hasher.shutdown()
+
+
+def test_hashes_in_worker_processes(hasher):
+    hashed = hasher.hash("secret")
+    assert hash_cost(hashed) == 4
+    assert hasher.verify("secret", hashed)
+    assert not hasher.verify("wrong", hashed)
+    assert not hasher.verify("secret", "not-a-hash")
+
+
+def test_login_rehashes_to_the_configured_cost(db, make_user, hasher, fast_hashes):
+    user = make_user("investor")
+    user.hashed_password = hasher.hash("secret")
+    db.commit()
+
+    assert login(AuthRequest(email=user.email, password="secret"), db=db).role == "investor"
+    db.refresh(user)
+    assert hash_cost(user.hashed_password) == 5
+    assert login(AuthRequest(email=user.email, password="secret"), db=db).access_token
+    with pytest.raises(HTTPException) as exc:
+        login(AuthRequest(email=user.email, password="wrong"), db=db)
+    assert exc.value.status_code == 401
+    # The admin is bootstrapped at startup, not on login.
+    assert db.query(User).filter(User.email == settings.admin_email).count() == 0
@@ -0,0 +1,64 @@
+import time
+
+from fastapi import HTTPException
+import pytest
+
+from app.auth.revocations import RevocationList
+from app.auth.principals import principal_cache
+from app.auth.router import _issue_token, get_current_claims, logout
+from app.auth.security import create_access_token
+from app.models import TokenRevocation
+
+
+def _bearer(user) -> str:
+    return f"Bearer {_issue_token(user)}"
+
+
+def _rejected(authorization, db) -> bool:
+    with pytest.raises(HTTPException) as exc:
+        get_current_claims(authorization=authorization, db=db)
+    return exc.value.status_code == 401
+
+
+def test_claims_are_checked_without_queries(db, make_user, query_counter):
+    user = make_user("investor")
+    authorization = _bearer(user)
+    get_current_claims(authorization=authorization, db=db)
+    query_counter.clear()
+    claims = get_current_claims(authorization=authorization, db=db)
+    assert query_counter == []
+    assert (claims.id, claims.role) == (user.id, "investor")
+
+
+def test_logout_revokes_the_token_in_every_worker(db, make_user):
+    user = make_user("investor")
+    authorization, other_session = _bearer(user), _bearer(user)
+    other_worker = RevocationList(stamp_seconds=0.05)
+    other_worker.check(db, principal_cache.payload(authorization[7:]))
+
+    assert logout(authorization=authorization, db=db) == {"status": "ok"}
+    assert _rejected(authorization, db)
+    assert get_current_claims(authorization=other_session, db=db).id == user.id
+    time.sleep(0.06)
+    with pytest.raises(ValueError, match="revoked"):
+        other_worker.check(db, principal_cache.payload(authorization[7:]))
+
+
+def test_logout_is_a_no_op_for_unusable_tokens(db, make_user):
+    user = make_user("investor")
+    authorization = _bearer(user)
+    expired = f"Bearer {create_access_token({'sub': str(user.id), 'role': 'investor', 'ver': 0}, expires_minutes=-1)}"
+
+    assert logout(authorization=authorization, db=db) == {"status": "ok"}
+    for stale in (authorization, expired, "Bearer not-a-token", None):
+        assert logout(authorization=stale, db=db) == {"status": "ok"}
+    assert db.query(TokenRevocation).count() == 1
+
+
+def test_role_change_retires_issued_tokens(db, make_user):
+    user = make_user("investor")
+    authorization = _bearer(user)
+    user.role = "founder"
+    db.commit()
+    assert _rejected(authorization, db)
+    assert get_current_claims(authorization=_bearer(user), db=db).role == "founder"
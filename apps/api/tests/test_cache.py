@@ -0,0 +1,31 @@
+from sqlalchemy import text
+
+from app.cache import TTLCache, on_commit
+
+
+def test_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_entries_expire():
+    cache = TTLCache(ttl_seconds=-1)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_on_commit_runs_only_after_commit(db):
+    calls = []
+    db.execute(text("SELECT 1"))
+    on_commit(db, lambda: calls.append("rolled back"))
+    db.rollback()
+    on_commit(db, lambda: calls.append("committed"))
+    db.commit()
+    assert calls == ["committed"]
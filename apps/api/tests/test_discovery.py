@@ -0,0 +1,60 @@
+import json
+
+from app.investor.router import list_rounds
+from app.investor.service import place_investment
+
+
+def _rounds(db, **params):
+    return json.loads(list_rounds(db=db, **params).body)
+
+
+def test_list_rounds_is_one_query_then_cached(db, make_round, query_counter):
+    for _ in range(5):
+        make_round()
+    make_round(status="draft")
+    query_counter.clear()
+    listed = _rounds(db)["rounds"]
+    assert len(listed) == 5
+    assert listed[0]["startup_name"] == "Steelman"
+    assert len(query_counter) == 1
+    _rounds(db)
+    assert len(query_counter) == 1
+
+
+def test_list_rounds_cache_follows_publish_and_invest(db, make_user, make_round):
+    round_obj = make_round()
+    draft = make_round(status="draft")
+    assert len(_rounds(db)["rounds"]) == 1
+    draft.status = "published"
+    db.commit()
+    assert len(_rounds(db)["rounds"]) == 2
+    place_investment(db, make_user("investor"), round_obj.id, 100000)
+    listed = {entry["round_code"]: entry for entry in _rounds(db)["rounds"]}
+    assert listed[f"RND-{round_obj.id:04d}"]["raised_cents"] == 100000
+
+
+def test_list_rounds_pages_newest_first(db, make_round):
+    round_ids = [make_round().id for _ in range(7)]
+    seen, cursor = [], None
+    while True:
+        page = _rounds(db, cursor=cursor, limit=3)
+        seen += [entry["round_code"] for entry in page["rounds"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"RND-{round_id:04d}" for round_id in reversed(round_ids)]
+
+
+def test_list_rounds_filters(db, make_user, make_startup, make_round):
+    health = make_round(make_startup(industry="Health", revenue_stage="Early"), max_raise_cents=1000000)
+    fintech = make_round(max_raise_cents=300000)
+    place_investment(db, make_user("investor"), fintech.id, 250000)
+
+    def codes(**filters):
+        return [entry["round_code"] for entry in _rounds(db, **filters)["rounds"]]
+
+    assert codes(industry="Health") == [f"RND-{health.id:04d}"]
+    assert codes(industry="Health", revenue_stage="Stable") == []
+    assert codes(min_raise_cents=500000) == [f"RND-{health.id:04d}"]
+    assert codes(min_funded_pct=80) == [f"RND-{fintech.id:04d}"]
+    assert codes(max_funded_pct=10) == [f"RND-{health.id:04d}"]
@@ -0,0 +1,291 @@
+import pytest
+
+from app.distributions.service import run_distribution, run_month_end
+from app.models import Contract, Distribution, LedgerEntry, Payout, RevenueReport
+
+
+def report_revenue(db, startup_id, gross_revenue_cents, month="2024-06-01"):
+    db.add(
+        RevenueReport(
+            startup_id=startup_id,
+            month=month,
+            gross_revenue_cents=gross_revenue_cents,
+            reported_by=1,
+            distribution_status="pending",
+        )
+    )
+    db.commit()
+
+
+def test_run_distribution_splits_revenue_share_pro_rata(db, make_user, make_round, make_contracts):
+    admin = make_user("admin")
+    round_obj = make_round(revenue_share_bps=1000)
+    make_contracts(round_obj, 3, principal_cents=100000, revenue_share_bps=1000)
+    report_revenue(db, round_obj.startup_id, 100000)
+
+    distribution = run_distribution(db, round_obj.startup_id, "2024-06-01", admin.id)
+
+    assert distribution.total_distributed_cents == 10000
+    assert db.query(Payout).filter(Payout.distribution_id == distribution.id).count() == 3
+    assert db.query(LedgerEntry).filter(LedgerEntry.entry_type == "payout").count() == 3
+    assert sorted(c.paid_to_date_cents for c in db.query(Contract).all()) == [3333, 3333, 3334]
+    assert {r.distribution_status for r in db.query(RevenueReport).all()} == {"distributed"}
+
+
+def test_run_distribution_caps_and_completes_contracts(db, make_user, make_round, make_contracts):
+    admin = make_user("admin")
+    round_obj = make_round(revenue_share_bps=1000)
+    make_contracts(round_obj, 2, payout_cap_cents=1500, paid_to_date_cents=1000, revenue_share_bps=1000)
+    report_revenue(db, round_obj.startup_id, 100000)
+
+    run_distribution(db, round_obj.startup_id, "2024-06-01", admin.id)
+
+    contracts = db.query(Contract).all()
+    assert {c.status for c in contracts} == {"completed"}
+    assert {c.paid_to_date_cents for c in contracts} == {1500}
+    assert db.query(Distribution).one().total_distributed_cents == 1000
+
+
+def test_run_distribution_requires_pending_report(db, make_user, make_round, make_contracts):
+    admin = make_user("admin")
+    round_obj = make_round()
+    make_contracts(round_obj, 1)
+
+    with pytest.raises(ValueError):
+        run_distribution(db, round_obj.startup_id, "2024-06-01", admin.id)
+
+
+def test_run_distribution_statement_count_is_independent_of_contracts(
+    db, make_user, make_round, make_contracts, query_counter
+):
+    admin = make_user("admin")
+    small = make_round()
+    make_contracts(small, 2)
+    report_revenue(db, small.startup_id, 100000)
+    large = make_round()
+    make_contracts(large, 40)
+    report_revenue(db, large.startup_id, 100000)
+
+    query_counter.clear()
+    run_distribution(db, small.startup_id, "2024-06-01", admin.id)
+    small_count = len(query_counter)
+
+    query_counter.clear()
+    run_distribution(db, large.startup_id, "2024-06-01", admin.id)
+    assert len(query_counter) == small_count
+
+
+def test_run_month_end_distributes_every_pending_startup(db, session_factory, make_user, make_round, make_contracts):
+    admin = make_user("admin")
+    startup_ids = []
+    for _ in range(4):
+        round_obj = make_round(revenue_share_bps=1000)
+        make_contracts(round_obj, 2, revenue_share_bps=1000)
+        report_revenue(db, round_obj.startup_id, 100000)
+        startup_ids.append(round_obj.startup_id)
+
+    result = run_month_end("2024-06-01", admin.id, max_workers=4, session_factory=session_factory)
+
+    assert result["startup_count"] == 4
+    assert [r["startup_id"] for r in result["results"]] == startup_ids
+    assert {r["status"] for r in result["results"]} == {"distributed"}
+    assert result["total_distributed_cents"] == 4 * 10000
+
+
+def test_run_month_end_skips_startups_once_budget_is_spent(db, session_factory, make_user, make_round, make_contracts):
+    admin = make_user("admin")
+    round_obj = make_round()
+    make_contracts(round_obj, 1)
+    report_revenue(db, round_obj.startup_id, 100000)
+
+    result = run_month_end("2024-06-01", admin.id, budget_seconds=0, session_factory=session_factory)
+
+    assert [r["status"] for r in result["results"]] == ["skipped"]
+    assert result["remaining_count"] == 1
+    assert db.query(Distribution).count() == 0
+
+
+def test_run_distribution_is_idempotent(db, make_user, make_round, make_contracts):
+    admin = make_user("admin")
+    round_obj = make_round(revenue_share_bps=1000)
+    make_contracts(round_obj, 3, revenue_share_bps=1000)
+    report_revenue(db, round_obj.startup_id, 100000)
+
+    first = run_distribution(db, round_obj.startup_id, "2024-06-01", admin.id)
+    second = run_distribution(db, round_obj.startup_id, "2024-06-01", admin.id)
+
+    assert first.id == second.id
+    assert db.query(Payout).count() == 3
+    assert sum(c.paid_to_date_cents for c in db.query(Contract).all()) == 10000
+
+
+def test_run_distribution_resumes_after_failed_chunk(db, monkeypatch, make_user, make_round, make_contracts):
+    from app.distributions import service
+
+    admin = make_user("admin")
+    round_obj = make_round(revenue_share_bps=1000)
+    make_contracts(round_obj, 2, payout_cap_cents=2000, revenue_share_bps=1000)
+    make_contracts(round_obj, 3, payout_cap_cents=10**6, revenue_share_bps=1000)
+    report_revenue(db, round_obj.startup_id, 100000)
+
+    calls = []
+    payout_investors = service.payout_investors
+
+    def flaky_payout_investors(*args):
+        calls.append(args)
+        if len(calls) == 2:
+            raise RuntimeError("payment provider unavailable")
+        return payout_investors(*args)
+
+    monkeypatch.setattr(service, "payout_investors", flaky_payout_investors)
+    with pytest.raises(RuntimeError):
+        run_distribution(db, round_obj.startup_id, "2024-06-01", admin.id, chunk_size=2)
+    db.rollback()
+
+    distribution = db.query(Distribution).one()
+    assert distribution.status == "running"
+    assert db.query(Payout).count() == 2
+
+    distribution = run_distribution(db, round_obj.startup_id, "2024-06-01", admin.id, chunk_size=2)
+
+    assert distribution.status == "completed"
+    assert distribution.total_distributed_cents == 10000
+    assert db.query(Payout).count() == 5
+    contracts = db.query(Contract).order_by(Contract.id).all()
+    assert [c.paid_to_date_cents for c in contracts] == [2000] * 5
+    assert [c.status for c in contracts] == ["completed", "completed", "active", "active", "active"]
+
+
+def test_run_distribution_pauses_between_chunks_at_the_deadline(db, monkeypatch, make_user, make_round, make_contracts):
+    from types import SimpleNamespace
+    import time
+
+    from app.distributions import service
+
+    admin = make_user("admin")
+    round_obj = make_round(revenue_share_bps=1000)
+    make_contracts(round_obj, 4, revenue_share_bps=1000)
+    report_revenue(db, round_obj.startup_id, 100000)
+    write_chunk = service._write_chunk
+
+    def write_chunk_then_run_out_of_time(*args):
+        write_chunk(*args)
+        monkeypatch.setattr(service, "time", SimpleNamespace(monotonic=lambda: float("inf")))
+
+    monkeypatch.setattr(service, "_write_chunk", write_chunk_then_run_out_of_time)
+    distribution = run_distribution(
+        db, round_obj.startup_id, "2024-06-01", admin.id, chunk_size=2, deadline=time.monotonic() + 60
+    )
+    assert distribution.status == "running"
+    assert db.query(Payout).count() == 2
+
+    monkeypatch.undo()
+    distribution = run_distribution(db, round_obj.startup_id, "2024-06-01", admin.id, chunk_size=2)
+    assert distribution.status == "completed"
+    assert db.query(Payout).count() == 4
+    assert distribution.total_distributed_cents == 10000
+
+
+def test_run_distribution_keeps_concurrent_contract_writes(
+    db, session_factory, monkeypatch, make_user, make_round, make_contracts
+):
+    from app.distributions import service
+
+    admin = make_user("admin")
+    round_obj = make_round(revenue_share_bps=1000)
+    contract_ids = [c.id for c in make_contracts(round_obj, 3, payout_cap_cents=10**6, revenue_share_bps=1000)]
+    report_revenue(db, round_obj.startup_id, 100000)
+    allocate = service.allocate
+
+    def allocate_then_write_elsewhere(*args):
+        # Another writer pays the first contract and ends the last after the run read them.
+        with session_factory() as other:
+            other.get(Contract, contract_ids[0]).paid_to_date_cents += 500
+            other.get(Contract, contract_ids[2]).status = "exited"
+            other.commit()
+        return allocate(*args)
+
+    monkeypatch.setattr(service, "allocate", allocate_then_write_elsewhere)
+    with pytest.raises(ValueError, match="Contracts changed"):
+        run_distribution(db, round_obj.startup_id, "2024-06-01", admin.id, chunk_size=1)
+    monkeypatch.undo()
+    db.expire_all()
+    distribution = run_distribution(db, round_obj.startup_id, "2024-06-01", admin.id, chunk_size=1)
+
+    assert distribution.status == "completed"
+    assert db.query(Payout).count() == 2
+    contracts = db.query(Contract).order_by(Contract.id).all()
+    assert [c.paid_to_date_cents for c in contracts] == [3834, 3333, 0]
+    assert [c.status for c in contracts] == ["active", "active", "exited"]
+
+
+def test_preview_matches_run_without_writing(db, make_user, make_round, make_contracts, query_counter):
+    from app.distributions import preview
+
+    admin = make_user("admin")
+    round_obj = make_round(revenue_share_bps=1000)
+    make_contracts(round_obj, 2, payout_cap_cents=2000, revenue_share_bps=1000)
+    make_contracts(round_obj, 2, payout_cap_cents=10**6, revenue_share_bps=1000)
+    report_revenue(db, round_obj.startup_id, 100000)
+    preview.invalidate()
+
+    query_counter.clear()
+    payload = preview.preview_payload(preview.get_preview(db, round_obj.startup_id, "2024-06-01"))
+    assert all(statement.lstrip().upper().startswith("SELECT") for statement in query_counter)
+    assert payload["projected_total_cents"] == 9000
+    assert len(payload["reaching_cap"]) == 2
+    assert [p["amount_cents"] for p in payload["payouts"]] == [2000, 2000, 2500, 2500]
+
+    distribution = run_distribution(db, round_obj.startup_id, "2024-06-01", admin.id)
+    assert distribution.total_distributed_cents == payload["projected_total_cents"]
+
+
+def test_preview_is_cached_until_revenue_changes(db, make_round, make_contracts, query_counter):
+    from app.distributions import preview
+
+    round_obj = make_round(revenue_share_bps=1000)
+    make_contracts(round_obj, 2, revenue_share_bps=1000)
+    report_revenue(db, round_obj.startup_id, 100000)
+    preview.invalidate()
+
+    first = preview.get_preview(db, round_obj.startup_id, "2024-06-01")
+    query_counter.clear()
+    assert preview.get_preview(db, round_obj.startup_id, "2024-06-01") is first
+    assert query_counter == []
+
+    report_revenue(db, round_obj.startup_id, 100000)
+    refreshed = preview.get_preview(db, round_obj.startup_id, "2024-06-01")
+    assert refreshed is not first
+    assert refreshed.gross_revenue_cents == 200000
+
+
+def test_revenue_reported_after_distribution_is_rejected_or_flagged(
+    db, session_factory, make_user, make_round, make_contracts
+):
+    from fastapi import HTTPException
+
+    from app.admin.router import RevenueSimulate, simulate_revenue
+    from app.auth.principals import Claims
+
+    admin = make_user("admin")
+    round_obj = make_round(revenue_share_bps=1000)
+    make_contracts(round_obj, 1, revenue_share_bps=1000)
+    report_revenue(db, round_obj.startup_id, 100000)
+    run_distribution(db, round_obj.startup_id, "2024-06-01", admin.id)
+
+    with pytest.raises(HTTPException) as exc:
+        simulate_revenue(
+            RevenueSimulate(startup_id=round_obj.startup_id, month="2024-06-01", gross_revenue_cents=5000),
+            db=db,
+            current_user=Claims(id=admin.id, role="admin"),
+        )
+    assert exc.value.status_code == 400
+
+    # A late report written around the endpoints is reported as a failure, not as distributed.
+    report_revenue(db, round_obj.startup_id, 5000)
+    with pytest.raises(ValueError, match="after the month was distributed"):
+        run_distribution(db, round_obj.startup_id, "2024-06-01", admin.id)
+    result = run_month_end("2024-06-01", admin.id, session_factory=session_factory)
+    assert [(r["status"], r["error"]) for r in result["results"]] == [
+        ("failed", "Revenue reported after the month was distributed")
+    ]
@@ -0,0 +1,56 @@
+from fastapi import Response
+
+from app.founder.router import TierRequest, list_tiers, run_tiers
+from app.investor.router import round_detail
+from app.investor.service import place_investment
+from app.models import RevenueReport
+
+
+def _detail(db, round_id, if_none_match=None):
+    response = Response()
+    body = round_detail(round_id, response, if_none_match=if_none_match, db=db)
+    return body, response.headers.get("ETag")
+
+
+def test_round_detail_is_not_rebuilt_for_a_current_etag(db, make_round, query_counter):
+    round_obj = make_round()
+    body, etag = _detail(db, round_obj.id)
+    assert body["round_code"] == f"RND-{round_obj.id:04d}"
+    query_counter.clear()
+    cached = round_detail(round_obj.id, Response(), if_none_match=f"W/{etag}", db=db)
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert len(query_counter) == 1
+
+
+def test_round_etag_follows_visible_writes_only(db, make_user, make_round):
+    round_obj = make_round()
+    _, etag = _detail(db, round_obj.id)
+    investor = make_user("investor")
+    place_investment(db, investor, round_obj.id, 100000)
+    assert _detail(db, round_obj.id, if_none_match=etag)[0].status_code == 304
+    db.add(
+        RevenueReport(
+            startup_id=round_obj.startup_id,
+            month="2024-06",
+            gross_revenue_cents=500000,
+            reported_by=investor.id,
+        )
+    )
+    db.commit()
+    body, changed = _detail(db, round_obj.id, if_none_match=etag)
+    assert changed != etag
+    assert body["revenue_reports"] == [{"month": "2024-06", "gross_revenue_cents": 500000}]
+
+
+def test_tier_listing_etag_changes_when_tiers_are_rerun(db, make_user, make_startup, make_round):
+    founder = make_user("founder")
+    round_obj = make_round(startup=make_startup(founder=founder))
+    response = Response()
+    assert len(list_tiers(round_obj.id, response, if_none_match=None, db=db, current_user=founder)) == 1
+    etag = response.headers["ETag"]
+    assert list_tiers(round_obj.id, Response(), if_none_match=etag, db=db, current_user=founder).status_code == 304
+    run_tiers(round_obj.id, TierRequest(), db=db, current_user=founder)
+    response = Response()
+    assert len(list_tiers(round_obj.id, response, if_none_match=etag, db=db, current_user=founder)) == 3
+    assert response.headers["ETag"] != etag
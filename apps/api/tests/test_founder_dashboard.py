@@ -0,0 +1,110 @@
+from datetime import date, datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.founder.router import list_revenue, list_rounds, list_startups
+from app.models import Application, Distribution, Investment, RevenueReport
+from app.startups.summary import rebuild
+
+
+def test_list_startups_uses_a_fixed_number_of_queries(db, make_user, make_startup, make_round, query_counter):
+    founder = make_user("founder")
+    live = make_startup(founder=founder)
+    make_round(startup=live, max_raise_cents=300000).raised_cents = 120000
+    make_round(startup=live, status="closed").raised_cents = 80000
+    for month in ("2024-05", "2024-06"):
+        db.add(RevenueReport(startup_id=live.id, month=month, gross_revenue_cents=100000, reported_by=founder.id))
+    pending = make_startup(founder=founder)
+    db.add(
+        Application(
+            startup_id=pending.id,
+            name="Initial Funding Application",
+            application_type="Initial Funding Application",
+            requested_limit_cents=100000,
+            risk_preference="medium",
+            status="submitted",
+        )
+    )
+    # The fixtures write the tables directly, like an import, so the read model is rebuilt afterwards.
+    rebuild(db)
+    db.commit()
+    query_counter.clear()
+    dashboard = {entry["id"]: entry for entry in list_startups(db=db, current_user=founder)}
+    baseline = len(query_counter)
+
+    assert dashboard[live.id]["status"] == "live"
+    assert dashboard[live.id]["total_raised_cents"] == 200000
+    assert dashboard[live.id]["last_revenue_reported"] == "2024-06"
+    assert (dashboard[pending.id]["status"], dashboard[pending.id]["active_round"]) == ("application_pending", False)
+    assert dashboard[pending.id]["total_raised_cents"] == 0
+
+    for _ in range(10):
+        make_round(startup=make_startup(founder=founder))
+    rebuild(db)
+    db.commit()
+    query_counter.clear()
+    assert len(list_startups(db=db, current_user=founder)) == 12
+    assert len(query_counter) == baseline
+
+
+def test_round_breakdowns_are_one_grouped_query(db, make_user, make_startup, make_round, query_counter):
+    founder, investor = make_user("founder"), make_user("investor")
+    startup = make_startup(founder=founder)
+    funded, empty = make_round(startup=startup), make_round(startup=startup)
+    for day, amount_cents in [(1, 100000), (1, 100000), (2, 500000), (2, 250000)]:
+        db.add(
+            Investment(
+                round_id=funded.id,
+                investor_user_id=investor.id,
+                amount_cents=amount_cents,
+                payment_id="pay_test",
+                created_at=datetime(2024, 7, day, 12),
+            )
+        )
+    db.commit()
+    db.refresh(founder)
+    db.refresh(startup)
+    query_counter.clear()
+    rounds = {entry["id"]: entry for entry in list_rounds(startup.id, breakdown=True, db=db, current_user=founder)}
+    assert len(query_counter) == 3
+
+    assert rounds[funded.id]["breakdown"] == {
+        "investments_per_day": [
+            {"day": "2024-07-01", "investments": 2, "amount_cents": 200000},
+            {"day": "2024-07-02", "investments": 2, "amount_cents": 750000},
+        ],
+        "largest_ticket_cents": 500000,
+        "median_ticket_cents": 175000,
+    }
+    assert rounds[empty.id]["breakdown"]["median_ticket_cents"] is None
+    for _ in range(5):
+        make_round(startup=startup)
+    db.refresh(founder)
+    db.refresh(startup)
+    query_counter.clear()
+    list_rounds(startup.id, breakdown=True, db=db, current_user=founder)
+    assert len(query_counter) == 3
+
+
+def test_revenue_history_joins_distributions_and_filters_by_month(db, make_user, make_startup, query_counter):
+    founder = make_user("founder")
+    startup = make_startup(founder=founder)
+    for month in ("2024-03", "2023-12", "2024-01", "2024-02", "Q1 2024"):
+        db.add(RevenueReport(startup_id=startup.id, month=month, gross_revenue_cents=100000, reported_by=founder.id))
+    db.add(Distribution(startup_id=startup.id, month="2024-01", total_distributed_cents=3500, created_by=founder.id))
+    db.commit()
+    assert db.query(RevenueReport).filter(RevenueReport.month == "2024-02").one().month_start == date(2024, 2, 1)
+    db.refresh(founder)
+    db.refresh(startup)
+
+    query_counter.clear()
+    history = list_revenue(startup.id, from_month=None, to_month=None, db=db, current_user=founder)
+    assert len(query_counter) == 2
+    assert [entry["month"] for entry in history] == ["2023-12", "2024-01", "2024-02", "2024-03", "Q1 2024"]
+    assert [entry["total_distributed_cents"] for entry in history] == [0, 3500, 0, 0, 0]
+
+    window = list_revenue(startup.id, from_month="2024-01", to_month="2024-02", db=db, current_user=founder)
+    assert [entry["month"] for entry in window] == ["2024-01", "2024-02"]
+    with pytest.raises(HTTPException):
+        list_revenue(startup.id, from_month="January", to_month=None, db=db, current_user=founder)
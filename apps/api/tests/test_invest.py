@@ -0,0 +1,52 @@
+import json
+
+from fastapi import HTTPException
+import pytest
+from sqlalchemy import event
+
+from app.investor.router import InvestRequest, invest, list_rounds
+from app.investor.service import place_investment
+from app.models import Investment, Contract, LedgerEntry
+
+
+def test_invest_maintains_round_counters(db, make_user, make_round):
+    round_obj = make_round(max_raise_cents=300000)
+    investor = make_user("investor")
+    invest(InvestRequest(round_id=round_obj.id, amount_cents=100000), db=db, current_user=investor)
+    invest(InvestRequest(round_id=round_obj.id, amount_cents=150000), db=db, current_user=investor)
+    db.refresh(round_obj)
+    assert round_obj.raised_cents == 250000
+    assert round_obj.investor_count == 2
+    listed = json.loads(list_rounds(db=db).body)["rounds"]
+    assert listed[0]["raised_cents"] == 250000
+
+
+def test_invest_rejects_oversubscription_without_writing(db, make_user, make_round):
+    round_obj = make_round(max_raise_cents=300000)
+    investor = make_user("investor")
+    invest(InvestRequest(round_id=round_obj.id, amount_cents=200000), db=db, current_user=investor)
+    with pytest.raises(HTTPException) as exc:
+        invest(InvestRequest(round_id=round_obj.id, amount_cents=100001), db=db, current_user=investor)
+    assert exc.value.detail == "Round fully subscribed"
+    db.rollback()
+    db.refresh(round_obj)
+    assert round_obj.raised_cents == 200000
+    assert round_obj.investor_count == 1
+    assert db.query(Investment).count() == 1
+
+
+def test_place_investment_commits_once(db, make_user, make_round):
+    round_obj = make_round()
+    investor = make_user("investor")
+    commits = []
+
+    def _count(session):
+        commits.append(session)
+
+    event.listen(db, "after_commit", _count)
+    investment = place_investment(db, investor, round_obj.id, 100000)
+    event.remove(db, "after_commit", _count)
+    assert len(commits) == 1
+    contract = db.query(Contract).filter(Contract.investment_id == investment.id).one()
+    assert contract.payout_cap_cents == 170000
+    assert db.query(LedgerEntry).filter(LedgerEntry.round_id == round_obj.id).count() == 2
@@ -0,0 +1,55 @@
+import csv
+from datetime import datetime, timedelta
+import io
+import json
+
+from sqlalchemy import insert
+
+from app.ledger import export as ledger_export
+from app.ledger.export import LedgerFilters, export_csv, export_ndjson, ledger_page
+from app.models import LedgerEntry
+
+
+def _seed(db, count=25):
+    start = datetime(2024, 7, 1)
+    db.execute(
+        insert(LedgerEntry),
+        [
+            {
+                "ts": start + timedelta(hours=index),
+                "entry_type": "payout" if index % 5 else "revenue_report",
+                "amount_cents": index * 100,
+                "metadata_json": json.dumps({"n": index}),
+            }
+            for index in range(count)
+        ],
+    )
+    db.commit()
+    return start
+
+
+def test_ledger_pages_chronologically_with_filters(db):
+    start = _seed(db)
+    seen, cursor = [], None
+    while True:
+        page = ledger_page(db, LedgerFilters(entry_type="payout"), cursor=cursor, limit=7)
+        seen += [entry["amount_cents"] for entry in page["entries"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [index * 100 for index in range(25) if index % 5]
+    window = ledger_page(db, LedgerFilters(ts_from=start + timedelta(hours=10), ts_to=start + timedelta(hours=12)))
+    assert [entry["amount_cents"] for entry in window["entries"]] == [1000, 1100]
+
+
+def test_exports_stream_in_batches(db, monkeypatch):
+    _seed(db)
+    monkeypatch.setattr(ledger_export, "BATCH_SIZE", 10)
+    chunks = list(export_ndjson(db, LedgerFilters()))
+    assert len(chunks) == 3
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [row["amount_cents"] for row in rows] == [index * 100 for index in range(25)]
+
+    rows = list(csv.DictReader(io.StringIO("".join(export_csv(db, LedgerFilters(entry_type="revenue_report"))))))
+    assert [row["amount_cents"] for row in rows] == ["0", "500", "1000", "1500", "2000"]
+    assert rows[0]["metadata_json"] == '{"n": 0}'
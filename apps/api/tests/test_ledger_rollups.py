@@ -0,0 +1,104 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select, update
+
+from app.admin.router import ledger_rollup_totals
+from app.investor.service import place_investment
+from app.ledger import rollups
+from app.ledger.writer import ledger_writer
+from app.models import LedgerRollup
+
+
+def _rollups(db):
+    db.expire_all()
+    return {
+        (row.grain, row.entry_type, row.startup_id): (row.amount_cents, row.entry_count)
+        for row in db.scalars(select(LedgerRollup))
+    }
+
+
+def test_rollups_are_updated_with_the_ledger_commit(db, make_user, make_round, query_counter):
+    round_obj = make_round()
+    investor = make_user("investor")
+    place_investment(db, investor, round_obj.id, 100000)
+    place_investment(db, investor, round_obj.id, 50000)
+
+    totals = _rollups(db)
+    for grain in rollups.GRAINS:
+        assert totals[(grain, "investment", round_obj.startup_id)] == (150000, 2)
+        assert totals[(grain, "platform_fee", round_obj.startup_id)] == (3000, 2)
+    assert len(totals) == 4
+
+    query_counter.clear()
+    ledger_writer(db).add(entry_type="payout", amount_cents=700)
+    ledger_writer(db).add(entry_type="payout", amount_cents=300)
+    db.commit()
+    upserts = [s for s in query_counter if s.lstrip().upper().startswith("INSERT INTO LEDGER_ROLLUPS")]
+    assert len(upserts) == 1
+    assert _rollups(db)[("month", "payout", rollups.UNATTRIBUTED)] == (1000, 2)
+
+
+def test_admin_totals_read_periods_from_the_rollups(db, make_user, make_round):
+    admin = make_user("admin")
+    round_obj = make_round()
+    place_investment(db, make_user("investor"), round_obj.id, 100000)
+    today = datetime.utcnow().date()
+    previous_month = rollups.period_start("month", today - timedelta(days=today.day))
+
+    result = ledger_rollup_totals(
+        entry_type="investment",
+        grain="month",
+        period_from=previous_month,
+        period_to=today,
+        startup_id=None,
+        by_startup=True,
+        db=db,
+        current_user=admin,
+    )
+    assert [period["period_start"] for period in result["periods"]] == [previous_month, today.replace(day=1)]
+    assert result["periods"][0] == {
+        "period_start": previous_month,
+        "amount_cents": 0,
+        "entry_count": 0,
+        "startups": [],
+    }
+    assert result["periods"][1]["amount_cents"] == 100000
+    assert result["periods"][1]["startups"] == [
+        {"startup_code": f"STP-{round_obj.startup_id:04d}", "amount_cents": 100000, "entry_count": 1}
+    ]
+
+
+def test_verify_rederives_closed_periods_and_repairs_drift(db, session_factory, make_startup):
+    startup = make_startup()
+    writer = ledger_writer(db)
+    for amount_cents in (100, 200, 300, 400, 500):
+        writer.add(entry_type="payout", amount_cents=amount_cents, startup_id=startup.id)
+    db.commit()
+    month = rollups.period_start("month", datetime.utcnow().date())
+    after_month = rollups.period_end("month", month) + timedelta(days=7)
+    db.execute(
+        update(LedgerRollup).where(LedgerRollup.grain == "month").values(amount_cents=LedgerRollup.amount_cents + 1)
+    )
+    # A stale row, and one from before the oldest ledger month, as left behind by a detached partition.
+    for period in (month, date(2020, 1, 1)):
+        db.add(
+            LedgerRollup(
+                grain="month", entry_type="refund", period_start=period, startup_id=startup.id, amount_cents=6, entry_count=1
+            )
+        )
+    db.commit()
+
+    # The current month is still open and is not compared.
+    assert rollups.verify(session_factory=session_factory)["mismatches"] == []
+
+    result = rollups.verify(cutoff=after_month, chunk_size=2, max_workers=3, session_factory=session_factory)
+    assert result["chunk_count"] == 3
+    assert [
+        (mismatch["entry_type"], mismatch["expected_amount_cents"], mismatch["stored_amount_cents"])
+        for mismatch in result["mismatches"]
+    ] == [("payout", 1500, 1501), ("refund", 0, 6)]
+
+    assert rollups.verify(cutoff=after_month, repair=True, session_factory=session_factory)["repaired"]
+    assert rollups.verify(cutoff=after_month, chunk_size=2, session_factory=session_factory)["mismatches"] == []
+    assert _rollups(db)[("month", "payout", startup.id)] == (1500, 5)
+    assert db.get(LedgerRollup, ("month", "refund", date(2020, 1, 1), startup.id)) is not None
@@ -0,0 +1,27 @@
+from app.ledger.writer import ledger_writer
+from app.models import LedgerEntry
+from app.providers.payments import collect_investment
+
+
+def test_entries_are_written_with_the_callers_commit(db, query_counter):
+    collect_investment(db, investor_id=7, round_id=3, amount_cents=100000)
+    assert query_counter == []
+    assert len(ledger_writer(db)) == 2
+
+    db.commit()
+
+    inserts = [s for s in query_counter if s.lstrip().upper().startswith("INSERT INTO LEDGER_ENTRIES")]
+    assert len(inserts) == 1
+    entries = db.query(LedgerEntry).order_by(LedgerEntry.id).all()
+    assert [(e.entry_type, e.amount_cents, e.round_id) for e in entries] == [
+        ("investment", 100000, 3),
+        ("platform_fee", 2000, 3),
+    ]
+
+
+def test_entries_are_discarded_on_rollback(db):
+    db.query(LedgerEntry).count()
+    ledger_writer(db).add(entry_type="payout", amount_cents=500)
+    db.rollback()
+    db.commit()
+    assert db.query(LedgerEntry).count() == 0
@@ -0,0 +1,21 @@
+from datetime import date
+
+import pytest
+
+from app.partitions import add_months, ensure_partitions, partition_name
+
+
+def test_monthly_partition_names_roll_over_years():
+    months = [add_months(date(2024, 11, 1), offset) for offset in range(4)]
+    assert [partition_name("ledger_entries", month) for month in months] == [
+        "ledger_entries_2024_11",
+        "ledger_entries_2024_12",
+        "ledger_entries_2025_01",
+        "ledger_entries_2025_02",
+    ]
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+
+
+def test_partition_maintenance_is_postgres_only(engine):
+    with pytest.raises(ValueError, match="Postgres only"):
+        ensure_partitions(engine)
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.algorithm.payouts import allocate_payouts
+
+AS_OF = datetime(2024, 6, 1)
+
+
+def allocate(gross, pools, bps, principal, cap, paid, end=None):
+    n = len(pools)
+    end = end if end is not None else [AS_OF + timedelta(days=30)] * n
+    return allocate_payouts(
+        gross,
+        np.array(pools),
+        np.array(bps),
+        np.array(principal),
+        np.array(cap),
+        np.array(paid),
+        np.array(end, dtype="datetime64[us]"),
+        AS_OF,
+    )
+
+
+def test_pool_is_fully_distributed_with_remainder_cents():
+    result = allocate(100000, [1, 1, 1], [1000] * 3, [100] * 3, [10**9] * 3, [0] * 3)
+    assert result.amounts.sum() == 10000
+    assert sorted(result.amounts.tolist()) == [3333, 3333, 3334]
+
+
+def test_pools_are_split_per_round():
+    result = allocate(100000, [1, 2, 1], [1000, 500, 1000], [100, 100, 300], [10**9] * 3, [0] * 3)
+    assert result.amounts.tolist() == [2500, 5000, 7500]
+
+
+def test_payouts_clip_to_cap_and_mark_completed():
+    result = allocate(100000, [1, 1], [1000, 1000], [100, 100], [1000, 10**9], [900, 0])
+    assert result.amounts.tolist() == [100, 5000]
+    assert result.completed.tolist() == [True, False]
+
+
+def test_expired_contracts_receive_nothing():
+    end = [AS_OF - timedelta(days=1), None]
+    result = allocate(100000, [1, 1], [1000, 1000], [100, 100], [10**9] * 2, [0, 0], end=end)
+    assert result.amounts.tolist() == [0, 10000]
+    assert result.expired.tolist() == [True, False]
+    assert not result.completed.any()
+
+
+def test_empty_input():
+    result = allocate(100000, [], [], [], [], [])
+    assert len(result.amounts) == 0
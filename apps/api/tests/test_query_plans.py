@@ -0,0 +1,229 @@
+import json
+import os
+
+from fastapi import Response
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app import models  # noqa: F401
+from app.admin import router as admin
+from app.auth.principals import Claims
+from app.founder import router as founder
+from app.investor import router as investor
+
+# Runs the read endpoints against a seeded Postgres and fails when a query's plan reads a large table
+# with a sequential scan. Set TEST_POSTGRES_URL to a scratch database: its tables are dropped and
+# recreated from the models, which carry the same indexes as the migrations.
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+# Tables estimated at this many rows or more must not be scanned sequentially.
+LARGE_ROWS = 10000
+FOUNDERS, INVESTORS = 5000, 20000
+FOUNDER_ID, STARTUP_ID, ROUND_ID, INVESTOR_ID, APPLICATION_ID = 7, 7, 7, FOUNDERS + 7, 7
+
+SEED = [
+    f"""
+    INSERT INTO users (id, email, hashed_password, role, country, token_version, created_at)
+    SELECT g, 'user' || g || '@plans', 'x', CASE WHEN g <= {FOUNDERS} THEN 'founder' ELSE 'investor' END, 'CA', 0, now()
+    FROM generate_series(1, {FOUNDERS + INVESTORS}) AS g
+    """,
+    f"""
+    INSERT INTO startups (
+        id, founder_user_id, legal_name, country, incorporation_type, incorporation_date, industry,
+        short_description, long_description, current_monthly_revenue, revenue_model, revenue_consistency,
+        revenue_stage, existing_debt, existing_investors, intended_use_of_funds, target_funding_size,
+        preferred_timeline, status, created_at
+    )
+    SELECT g, g, 'Startup ' || g, 'CA', 'Corp', '2021-01-01', (ARRAY['Fintech', 'Health', 'Retail'])[g % 3 + 1],
+        'Short', 'Long', '$25k-$50k', 'SaaS', 'Stable', 'Stable', 0, 0, '[]', '$250k-$1M', '3-6 months', 'active', now()
+    FROM generate_series(1, {FOUNDERS}) AS g
+    """,
+    # One approved application per startup, then drafts and submissions.
+    f"""
+    INSERT INTO applications (
+        id, startup_id, name, application_type, requested_limit_cents, risk_preference, status, created_at,
+        submitted_at
+    )
+    SELECT g, (g - 1) % {FOUNDERS} + 1, 'Application ' || g, 'Initial Funding Application', 50000000, 'medium',
+        CASE WHEN g <= {FOUNDERS} THEN 'approved' WHEN g % 10 = 0 THEN 'submitted' ELSE 'draft' END,
+        now() - g * interval '1 minute',
+        CASE WHEN g <= {FOUNDERS} OR g % 10 = 0 THEN now() - g * interval '1 minute' END
+    FROM generate_series(1, {FOUNDERS * 4}) AS g
+    """,
+    f"""
+    INSERT INTO documents (id, startup_id, doc_type, filename, storage_key, uploaded_at)
+    SELECT g, (g - 1) % {FOUNDERS} + 1, 'financials', 'doc' || g || '.pdf', 'docs/' || g, now()
+    FROM generate_series(1, {FOUNDERS * 3}) AS g
+    """,
+    # Most rounds are closed; one in ten is live.
+    f"""
+    INSERT INTO rounds (
+        id, startup_id, application_id, title, max_raise_cents, raised_cents, reserved_cents, investor_count,
+        version, tier_selected, status, created_at
+    )
+    SELECT g, (g - 1) % {FOUNDERS} + 1, (g - 1) % {FOUNDERS} + 1, 'Round ' || g, 100000000, 0, 0, 0, 1, 'medium',
+        CASE WHEN g % 10 = 0 THEN 'published' ELSE 'closed' END, now()
+    FROM generate_series(1, {FOUNDERS * 2}) AS g
+    """,
+    f"""
+    INSERT INTO tier_options (
+        id, round_id, tier, revenue_share_bps, time_cap_months, payout_cap_mult, min_hold_days,
+        exit_fee_bps_quarterly, exit_fee_bps_offcycle, explanation_json
+    )
+    SELECT g, (g - 1) % {FOUNDERS * 2} + 1, (ARRAY['low', 'medium', 'high'])[(g - 1) / {FOUNDERS * 2} + 1],
+        350, 24, 1.7, 90, 50, 150, '{{}}'
+    FROM generate_series(1, {FOUNDERS * 6}) AS g
+    """,
+    f"""
+    INSERT INTO investments (id, round_id, investor_user_id, amount_cents, payment_id, created_at)
+    SELECT g, g * 7 % {FOUNDERS * 2} + 1, {FOUNDERS + 1} + g % {INVESTORS}, 100000, 'pay_' || g,
+        now() - g * interval '1 minute'
+    FROM generate_series(1, 200000) AS g
+    """,
+    # Contracts run out over time: one in five is still active.
+    """
+    INSERT INTO contracts (
+        id, investment_id, status, principal_cents, payout_cap_cents, revenue_share_bps, start_date,
+        paid_to_date_cents
+    )
+    SELECT g, g, CASE WHEN g % 5 = 0 THEN 'active' ELSE 'completed' END, 100000, 170000, 350, now(), 0
+    FROM generate_series(1, 200000) AS g
+    """,
+    f"""
+    INSERT INTO reservations (id, round_id, investor_user_id, amount_cents, status, created_at)
+    SELECT g, g % {FOUNDERS * 2} + 1, {FOUNDERS + 1} + g % {INVESTORS}, 100000, 'expired', now()
+    FROM generate_series(1, 20000) AS g
+    """,
+    # Twelve months of revenue per startup; the last one is not distributed yet.
+    f"""
+    INSERT INTO revenue_reports (
+        id, startup_id, month, month_start, gross_revenue_cents, reported_by, distribution_status, created_at
+    )
+    SELECT g, (g - 1) % {FOUNDERS} + 1, to_char(date '2024-01-01' + ((g - 1) / {FOUNDERS}) * interval '1 month', 'YYYY-MM'),
+        date '2024-01-01' + ((g - 1) / {FOUNDERS}) * interval '1 month', 2500000, (g - 1) % {FOUNDERS} + 1,
+        CASE WHEN g > {FOUNDERS * 11} THEN 'pending' ELSE 'distributed' END, now()
+    FROM generate_series(1, {FOUNDERS * 12}) AS g
+    """,
+    f"""
+    INSERT INTO distributions (
+        id, startup_id, month, gross_revenue_cents, total_distributed_cents, status, created_at, created_by
+    )
+    SELECT id, startup_id, month, gross_revenue_cents, 87500, 'completed', now(), 1
+    FROM revenue_reports WHERE distribution_status = 'distributed'
+    """,
+    f"""
+    INSERT INTO payouts (id, contract_id, distribution_id, amount_cents, payout_id, created_at)
+    SELECT g, g, (g - 1) % {FOUNDERS * 11} + 1, 350, 'po_' || g, now()
+    FROM generate_series(1, 200000) AS g
+    """,
+    """
+    INSERT INTO exits (id, contract_id, requested_at, exit_type, status)
+    SELECT g, g * 20, now(), 'quarterly', 'requested'
+    FROM generate_series(1, 10000) AS g
+    """,
+]
+
+
+@pytest.fixture(scope="module")
+def pg_engine():
+    engine = create_engine(POSTGRES_URL)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for statement in SEED:
+            connection.execute(text(statement))
+        connection.execute(text("ANALYZE"))
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def large_tables(pg_engine) -> set[str]:
+    with pg_engine.connect() as connection:
+        return set(
+            connection.execute(
+                text("SELECT relname FROM pg_class WHERE relkind = 'r' AND reltuples >= :rows"), {"rows": LARGE_ROWS}
+            ).scalars()
+        )
+
+
+@pytest.fixture
+def explain(pg_engine):
+    # Runs a call with the statements it sends captured, then EXPLAINs each SELECT with the same
+    # parameters and returns (statement, plan) pairs.
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    def _explain(call) -> list[tuple[str, dict]]:
+        statements.clear()
+        with sessionmaker(bind=pg_engine, autoflush=False, autocommit=False)() as db:
+            event.listen(pg_engine, "before_cursor_execute", _capture)
+            try:
+                call(db)
+            finally:
+                event.remove(pg_engine, "before_cursor_execute", _capture)
+            connection = db.connection()
+            return [
+                (statement, connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()[0]["Plan"])
+                for statement, parameters in statements
+            ]
+
+    return _explain
+
+
+def _seq_scans(plan: dict, tables: set[str]) -> list[str]:
+    found = [plan["Relation Name"]] if plan["Node Type"] == "Seq Scan" and plan.get("Relation Name") in tables else []
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child, tables))
+    return found
+
+
+FOUNDER = Claims(id=FOUNDER_ID, role="founder")
+INVESTOR = Claims(id=INVESTOR_ID, role="investor")
+ADMIN = Claims(id=1, role="admin")
+
+ENDPOINTS = {
+    "investor.list_rounds": lambda db: investor.list_rounds(industry="Fintech", db=db),
+    "investor.round_detail": lambda db: investor.round_detail(ROUND_ID, Response(), if_none_match=None, db=db),
+    "investor.list_reservations": lambda db: investor.list_reservations(db=db, current_user=INVESTOR),
+    "investor.portfolio": lambda db: investor.portfolio(db=db, current_user=INVESTOR),
+    "investor.payout_history": lambda db: investor.payout_history(db=db, current_user=INVESTOR),
+    "founder.list_startups": lambda db: founder.list_startups(db=db, current_user=FOUNDER),
+    "founder.get_startup": lambda db: founder.get_startup(STARTUP_ID, db=db, current_user=FOUNDER),
+    "founder.list_applications": lambda db: founder.list_applications(STARTUP_ID, db=db, current_user=FOUNDER),
+    "founder.get_application": lambda db: founder.get_application(APPLICATION_ID, db=db, current_user=FOUNDER),
+    "founder.approved_applications": lambda db: founder.approved_applications(STARTUP_ID, db=db, current_user=FOUNDER),
+    "founder.list_rounds": lambda db: founder.list_rounds(STARTUP_ID, breakdown=True, db=db, current_user=FOUNDER),
+    "founder.list_tiers": lambda db: founder.list_tiers(
+        ROUND_ID, Response(), if_none_match=None, db=db, current_user=FOUNDER
+    ),
+    "founder.list_revenue": lambda db: founder.list_revenue(
+        STARTUP_ID, from_month=None, to_month=None, db=db, current_user=FOUNDER
+    ),
+    "founder.list_exits": lambda db: founder.list_exits(db=db, current_user=FOUNDER),
+    "admin.applications": lambda db: admin.applications(
+        status="submitted", order="oldest", cursor=None, limit=50, db=db, current_user=ADMIN
+    ),
+    "admin.preview_distribution": lambda db: admin.preview_distribution(
+        STARTUP_ID, "2024-12", offset=0, limit=100, db=db, current_user=ADMIN
+    ),
+}
+
+
+@pytest.mark.parametrize("endpoint", sorted(ENDPOINTS))
+def test_endpoint_queries_avoid_sequential_scans_of_large_tables(endpoint, explain, large_tables):
+    plans = explain(ENDPOINTS[endpoint])
+    assert plans, f"{endpoint} sent no queries"
+    degraded = [
+        f"{', '.join(scans)}:\n{statement}\n{json.dumps(plan, indent=1)}"
+        for statement, plan in plans
+        if (scans := _seq_scans(plan, large_tables))
+    ]
+    assert not degraded, f"{endpoint} scans large tables sequentially in:\n" + "\n\n".join(degraded)
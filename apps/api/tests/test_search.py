@@ -0,0 +1,97 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db import Base
+from app.investor.router import search
+from app.investor.search import InvertedIndex
+from app.models import Startup
+from app.settings import settings
+
+# Tests parametrized over the engine also run against Postgres when TEST_POSTGRES_URL points at a scratch
+# database; its tables are dropped and recreated from the models, plus the search column from migration 0006.
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+SEARCH_VECTOR = """
+    ALTER TABLE startups ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(legal_name, '') || ' ' || coalesce(operating_name, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(industry, '') || ' ' || coalesce(sub_industry, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(short_description, '')), 'C')
+        || setweight(to_tsvector('english', coalesce(long_description, '')), 'D')
+    ) STORED
+"""
+
+
+@pytest.fixture
+def engine(request, tmp_path):
+    backend = getattr(request, "param", "sqlite")
+    if backend == "sqlite":
+        engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"timeout": 30})
+        Base.metadata.create_all(engine)
+    else:
+        if not POSTGRES_URL:
+            pytest.skip("TEST_POSTGRES_URL is not set")
+        engine = create_engine(POSTGRES_URL)
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(text(SEARCH_VECTOR))
+    yield engine
+    if backend == "postgresql":
+        Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def test_inverted_index_ranks_by_field_weight():
+    index = InvertedIndex()
+    index.index(1, {"legal_name": "Acme", "short_description": "payments for clinics"})
+    index.index(2, {"legal_name": "Payments Co", "short_description": "clinic billing"})
+    index.index(3, {"legal_name": "Other", "short_description": "nothing relevant"})
+    assert [startup_id for startup_id, _ in index.search(["payments"])] == [2, 1]
+    assert index.search(["payments", "clinics"]) == [(1, 0.4)]
+    index.remove(2)
+    assert [startup_id for startup_id, _ in index.search(["payments"])] == [1]
+
+
+def test_search_returns_published_rounds_ranked_and_highlighted(db, make_startup, make_round):
+    named = make_round(make_startup(legal_name="Solar Harvest", short_description="Rooftop <b>solar</b> leasing."))
+    described = make_round(make_startup(legal_name="Brightline", short_description="Solar monitoring."))
+    make_round(make_startup(legal_name="Solar Draft"), status="draft")
+    make_round(make_startup(legal_name="Unrelated"))
+    page = search(q="solar", db=db)
+    assert [result["round_code"] for result in page["results"]] == [
+        f"RND-{named.id:04d}",
+        f"RND-{described.id:04d}",
+    ]
+    assert page["next_offset"] is None
+    assert "<mark>solar</mark>" in page["results"][0]["highlight"]
+    assert "&lt;b&gt;" in page["results"][0]["highlight"]
+
+
+def test_search_index_follows_startup_writes(db, make_startup, make_round):
+    round_obj = make_round(make_startup(legal_name="Orbital"))
+    assert search(q="orbital", db=db)["results"]
+    startup = db.get(Startup, round_obj.startup_id)
+    startup.legal_name = "Ground Control"
+    db.commit()
+    assert search(q="orbital", db=db)["results"] == []
+    assert len(search(q="ground control", db=db)["results"]) == 1
+
+
+def test_search_pages_with_offset(db, make_startup, make_round):
+    for index in range(5):
+        make_round(make_startup(legal_name=f"Harbor {index}"))
+    first = search(q="harbor", limit=3, db=db)
+    second = search(q="harbor", offset=first["next_offset"], limit=3, db=db)
+    assert len(first["results"]) == 3 and len(second["results"]) == 2
+    assert second["next_offset"] is None
+
+
+@pytest.mark.parametrize("engine", ["sqlite", "postgresql"], indirect=True)
+def test_search_finds_published_rounds_behind_many_unpublished_matches(db, make_startup, make_round, monkeypatch):
+    monkeypatch.setattr(settings, "search_candidate_limit", 3)
+    for index in range(5):
+        make_round(make_startup(legal_name=f"Lumen Draft {index}"), status="draft")
+    published = make_round(make_startup(legal_name="Lumen Live"))
+    page = search(q="lumen", db=db)
+    assert [result["round_code"] for result in page["results"]] == [f"RND-{published.id:04d}"]
@@ -0,0 +1,81 @@
+from fastapi import HTTPException
+import pytest
+from sqlalchemy import select
+
+from app.admin.router import close_round
+from app.distributions.service import run_distribution
+from app.founder.router import ExitSettlement, RevenueReportCreate, report_revenue, settle_exit
+from app.investor.service import place_investment
+from app.models import ExitRequest, StartupSummary
+from app.startups.summary import rebuild
+
+
+def _summary(db, startup_id):
+    db.expire_all()
+    row = db.get(StartupSummary, startup_id)
+    return (
+        row.total_raised_cents,
+        row.live_round_id,
+        row.last_revenue_month,
+        row.total_distributed_cents,
+        row.active_contract_count,
+    )
+
+
+def test_writes_keep_the_summary_equal_to_a_rebuild(db, make_user, make_startup, make_round):
+    founder, admin = make_user("founder"), make_user("admin")
+    startup = make_startup(founder=founder)
+    first, second = make_round(startup=startup, max_raise_cents=200000), make_round(startup=startup)
+    investor = make_user("investor")
+
+    place_investment(db, investor, first.id, 150000)
+    assert _summary(db, startup.id) == (150000, first.id, None, 0, 1)
+    place_investment(db, investor, first.id, 50000)
+    assert _summary(db, startup.id)[:2] == (200000, second.id)
+
+    report_revenue(
+        RevenueReportCreate(startup_id=startup.id, month="2024-06", gross_revenue_cents=1000000),
+        db=db,
+        current_user=founder,
+    )
+    distribution = run_distribution(db, startup.id, "2024-06", admin.id)
+    close_round(second.id, db=db, current_user=admin)
+    maintained = _summary(db, startup.id)
+    assert maintained == (200000, None, "2024-06", distribution.total_distributed_cents, 2)
+    assert distribution.total_distributed_cents > 0
+
+    rebuild(db)
+    db.commit()
+    assert _summary(db, startup.id) == maintained
+
+
+def test_rebuild_covers_every_startup(db, make_startup, make_round):
+    startups = [make_startup() for _ in range(3)]
+    make_round(startup=startups[0])
+    assert rebuild(db) == 3
+    db.commit()
+    live = dict(db.execute(select(StartupSummary.startup_id, StartupSummary.live_round_id)).all())
+    assert live[startups[0].id] is not None
+    assert live[startups[1].id] is None
+
+
+def test_founders_settle_only_their_own_startups_exits(db, make_user, make_startup, make_round, make_contracts):
+    owner, other = make_user("founder"), make_user("founder")
+    startup = make_startup(founder=owner)
+    (contract,) = make_contracts(make_round(startup=startup), 1)
+    exit_req = ExitRequest(contract_id=contract.id, exit_type="quarterly")
+    db.add(exit_req)
+    rebuild(db)
+    db.commit()
+
+    with pytest.raises(HTTPException) as error:
+        settle_exit(exit_req.id, ExitSettlement(settlement_method="ach"), db=db, current_user=other)
+    assert error.value.status_code == 404
+    db.expire_all()
+    assert (exit_req.status, contract.status) == ("requested", "active")
+    assert _summary(db, startup.id)[4] == 1
+
+    settle_exit(exit_req.id, ExitSettlement(settlement_method="ach"), db=db, current_user=owner)
+    db.expire_all()
+    assert (exit_req.status, contract.status) == ("settled", "exited")
+    assert _summary(db, startup.id)[4] == 0
@@ -8,6 +8,7 @@ const styles: Record<string, string> = {
   draft: "bg-charcoal/10 text-charcoal dark:bg-cream/10 dark:text-cream",
   active: "bg-charcoal/10 text-charcoal dark:bg-cream/10 dark:text-cream",
   completed: "bg-charcoal/10 text-charcoal dark:bg-cream/10 dark:text-cream",
+  expired: "bg-charcoal/10 text-charcoal dark:bg-cream/10 dark:text-cream",
 };
 
 export function StatusPill({ status, label }: { status: string; label?: string }) {
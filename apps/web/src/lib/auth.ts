@@ -42,11 +42,19 @@ export function useAuth() {
       const me = await apiGet<{ role: string }>(`/auth/me`);
       setState((prev) => ({ ...prev, role: me.role }));
     } catch {
-      logout();
+      await logout();
     }
   };
 
-  const logout = () => {
+  const logout = async () => {
+    // Revokes the token server-side while it is still in storage; the local sign-out happens regardless.
+    if (localStorage.getItem("token")) {
+      try {
+        await apiPost<{ status: string }>("/auth/logout", {});
+      } catch {
+        // Nothing to undo: an unreachable API still leaves the user signed out locally.
+      }
+    }
     localStorage.removeItem("token");
     localStorage.removeItem("role");
     localStorage.removeItem("companyName");
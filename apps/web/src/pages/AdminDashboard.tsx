@@ -10,9 +10,23 @@ interface ApplicationItem {
   name: string;
   application_type: string;
   requested_limit_cents: number;
+  submitted_at: string;
   documents: { doc_type: string; filename: string }[];
 }
 
+interface ApplicationPage {
+  applications: ApplicationItem[];
+  next_cursor: string | null;
+}
+
+function applicationsPath(status: string, cursor: string | null) {
+  const params = new URLSearchParams();
+  if (status) params.set("status", status);
+  if (cursor) params.set("cursor", cursor);
+  const query = params.toString();
+  return query ? `/admin/applications?${query}` : "/admin/applications";
+}
+
 interface RoundItem {
   round_code: string;
   status: string;
@@ -21,18 +35,35 @@ interface RoundItem {
 
 export default function AdminDashboard() {
   const [applications, setApplications] = useState<ApplicationItem[]>([]);
+  const [applicationStatus, setApplicationStatus] = useState("submitted");
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [rounds, setRounds] = useState<RoundItem[]>([]);
   const [message, setMessage] = useState<string | null>(null);
   const [exitCode, setExitCode] = useState("EXIT-0001");
 
   const load = () => {
-    apiGet<ApplicationItem[]>("/admin/applications").then(setApplications).catch(() => setApplications([]));
+    apiGet<ApplicationPage>(applicationsPath(applicationStatus, null))
+      .then((page) => {
+        setApplications(page.applications);
+        setNextCursor(page.next_cursor);
+      })
+      .catch(() => {
+        setApplications([]);
+        setNextCursor(null);
+      });
     apiGet<RoundItem[]>("/admin/rounds").then(setRounds).catch(() => setRounds([]));
   };
 
   useEffect(() => {
     load();
-  }, []);
+  }, [applicationStatus]);
+
+  const loadMore = async () => {
+    if (nextCursor === null) return;
+    const page = await apiGet<ApplicationPage>(applicationsPath(applicationStatus, nextCursor));
+    setApplications((current) => [...current, ...page.applications]);
+    setNextCursor(page.next_cursor);
+  };
 
   const approve = async (code: string) => {
     const id = Number(code.split("-")[1]);
@@ -71,7 +102,19 @@ export default function AdminDashboard() {
   return (
     <div className="space-y-8">
       <Card className="p-6">
-        <h2 className="text-2xl font-semibold">Applications queue</h2>
+        <div className="flex flex-wrap items-center justify-between gap-3">
+          <h2 className="text-2xl font-semibold">Applications queue</h2>
+          <select
+            className="rounded-2xl border border-slate-200 bg-white dark:border-slate-800 dark:bg-slate-950 px-4 py-2 text-sm"
+            value={applicationStatus}
+            onChange={(e) => setApplicationStatus(e.target.value)}
+          >
+            <option value="submitted">Awaiting review</option>
+            <option value="approved">Approved</option>
+            <option value="rejected">Rejected</option>
+            <option value="">All</option>
+          </select>
+        </div>
         <div className="mt-4 grid gap-4 md:grid-cols-2">
           {applications.map((app) => (
             <div key={app.application_code} className="rounded-2xl border border-slate-200 dark:border-slate-800 p-4">
@@ -94,6 +137,11 @@ export default function AdminDashboard() {
             </div>
           ))}
         </div>
+        {nextCursor !== null && (
+          <Button className="mt-4" variant="outline" onClick={loadMore}>
+            Load more
+          </Button>
+        )}
       </Card>
 
       <Card className="p-6">
@@ -1,20 +1,47 @@
 import { useEffect, useState } from "react";
 import { Card } from "../components/Card";
+import { Button } from "../components/ui/button";
 import { apiGet } from "../lib/api";
 
 interface LedgerEntry {
   entry_code: string;
   type: string;
   amount_cents: number;
+  ts: string;
+}
+
+interface LedgerPage {
+  entries: LedgerEntry[];
+  next_cursor: string | null;
+}
+
+function ledgerPath(cursor: string | null) {
+  return cursor ? `/admin/ledger?cursor=${encodeURIComponent(cursor)}` : "/admin/ledger";
 }
 
 export default function AdminLedger() {
   const [entries, setEntries] = useState<LedgerEntry[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   useEffect(() => {
-    apiGet<LedgerEntry[]>("/admin/ledger").then(setEntries).catch(() => setEntries([]));
+    apiGet<LedgerPage>(ledgerPath(null))
+      .then((page) => {
+        setEntries(page.entries);
+        setNextCursor(page.next_cursor);
+      })
+      .catch(() => {
+        setEntries([]);
+        setNextCursor(null);
+      });
   }, []);
 
+  const loadMore = async () => {
+    if (nextCursor === null) return;
+    const page = await apiGet<LedgerPage>(ledgerPath(nextCursor));
+    setEntries((current) => [...current, ...page.entries]);
+    setNextCursor(page.next_cursor);
+  };
+
   return (
     <div className="space-y-6">
       <h2 className="text-2xl font-semibold">Ledger</h2>
@@ -29,6 +56,11 @@ export default function AdminLedger() {
           </Card>
         ))}
       </div>
+      {nextCursor !== null && (
+        <Button variant="outline" onClick={loadMore}>
+          Load more
+        </Button>
+      )}
     </div>
   );
 }
@@ -16,6 +16,28 @@ interface RoundSummary {
   raised_cents: number;
 }
 
+interface RoundPage {
+  rounds: RoundSummary[];
+  next_cursor: number | null;
+}
+
+interface RoundFilters {
+  industry: string;
+  revenue_stage: string;
+  min_funded_pct: string;
+}
+
+const PAGE_SIZE = 20;
+
+function roundsPath(filters: RoundFilters, cursor: number | null) {
+  const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value) params.set(key, value);
+  });
+  if (cursor !== null) params.set("cursor", String(cursor));
+  return `/investor/rounds?${params.toString()}`;
+}
+
 interface RoundDetail {
   round_code: string;
   max_raise_cents: number;
@@ -41,33 +63,122 @@ interface RoundDetail {
   revenue_reports: { month: string; gross_revenue_cents: number }[];
 }
 
+interface Reservation {
+  reservation_code: string;
+  round_code: string;
+  amount_cents: number;
+  status: string;
+  expires_at: string | null;
+  waitlist_position: number | null;
+}
+
+// Direct mode answers with the investment; queue mode with a reservation that still has to be confirmed.
+type InvestResult = { investment_code: string } | Reservation;
+
 export default function InvestorDashboard() {
   const [rounds, setRounds] = useState<RoundSummary[]>([]);
+  const [nextCursor, setNextCursor] = useState<number | null>(null);
+  const [filters, setFilters] = useState<RoundFilters>({ industry: "", revenue_stage: "", min_funded_pct: "" });
   const [selected, setSelected] = useState<RoundDetail | null>(null);
   const [amount, setAmount] = useState(25000);
   const [complianceOpen, setComplianceOpen] = useState(false);
   const [message, setMessage] = useState<string | null>(null);
+  const [reservations, setReservations] = useState<Reservation[]>([]);
+
+  const loadReservations = () =>
+    apiGet<Reservation[]>("/investor/reservations")
+      .then(setReservations)
+      .catch(() => setReservations([]));
 
   useEffect(() => {
-    apiGet<RoundSummary[]>("/investor/rounds").then(setRounds).catch(() => setRounds([]));
+    loadReservations();
   }, []);
 
+  useEffect(() => {
+    apiGet<RoundPage>(roundsPath(filters, null))
+      .then((page) => {
+        setRounds(page.rounds);
+        setNextCursor(page.next_cursor);
+      })
+      .catch(() => {
+        setRounds([]);
+        setNextCursor(null);
+      });
+  }, [filters]);
+
+  const loadMore = async () => {
+    if (nextCursor === null) return;
+    const page = await apiGet<RoundPage>(roundsPath(filters, nextCursor));
+    setRounds((current) => [...current, ...page.rounds]);
+    setNextCursor(page.next_cursor);
+  };
+
   const viewRound = async (roundCode: string) => {
     const id = Number(roundCode.split("-")[1]);
     const data = await apiGet<RoundDetail>(`/investor/rounds/${id}`);
     setSelected(data);
   };
 
+  const confirmReservation = async (reservationCode: string) => {
+    const id = Number(reservationCode.split("-")[1]);
+    try {
+      await apiPost(`/investor/reservations/${id}/confirm`, {});
+      setMessage("Investment submitted. Check your portfolio for updates.");
+    } catch {
+      setMessage(`Reservation ${reservationCode} could not be confirmed. It may have expired.`);
+    }
+    await loadReservations();
+  };
+
   const invest = async () => {
     if (!selected) return;
     const id = Number(selected.round_code.split("-")[1]);
-    await apiPost("/investor/invest", { round_id: id, amount_cents: amount });
-    setMessage("Investment submitted. Check your portfolio for updates.");
+    const result = await apiPost<InvestResult>("/investor/invest", { round_id: id, amount_cents: amount });
+    if (!("reservation_code" in result)) {
+      setMessage("Investment submitted. Check your portfolio for updates.");
+    } else if (result.status === "held") {
+      // The compliance confirmation was just given, so the held reservation is confirmed straight away.
+      await confirmReservation(result.reservation_code);
+    } else {
+      setMessage(
+        `The round is fully reserved. You are number ${result.waitlist_position} on the waitlist; ` +
+          "confirm your reservation below if a spot opens up."
+      );
+      await loadReservations();
+    }
   };
 
   return (
     <div className="space-y-6">
       <h2 className="text-2xl font-semibold">Discover rounds</h2>
+      <div className="flex flex-wrap gap-3">
+        <input
+          className="rounded-2xl border border-slate-200 bg-white px-4 py-2 text-sm dark:border-slate-800 dark:bg-slate-950"
+          placeholder="Industry"
+          value={filters.industry}
+          onChange={(e) => setFilters({ ...filters, industry: e.target.value })}
+        />
+        <select
+          className="rounded-2xl border border-slate-200 bg-white px-4 py-2 text-sm dark:border-slate-800 dark:bg-slate-950"
+          value={filters.revenue_stage}
+          onChange={(e) => setFilters({ ...filters, revenue_stage: e.target.value })}
+        >
+          <option value="">Any revenue stage</option>
+          <option value="Pre-revenue">Pre-revenue</option>
+          <option value="Early">Early</option>
+          <option value="Stable">Stable</option>
+        </select>
+        <select
+          className="rounded-2xl border border-slate-200 bg-white px-4 py-2 text-sm dark:border-slate-800 dark:bg-slate-950"
+          value={filters.min_funded_pct}
+          onChange={(e) => setFilters({ ...filters, min_funded_pct: e.target.value })}
+        >
+          <option value="">Any progress</option>
+          <option value="25">25%+ funded</option>
+          <option value="50">50%+ funded</option>
+          <option value="75">75%+ funded</option>
+        </select>
+      </div>
       <div className="grid gap-6 lg:grid-cols-2">
         {rounds.map((round) => (
           <Card key={round.round_code} className="p-6">
@@ -87,6 +198,11 @@ export default function InvestorDashboard() {
           </Card>
         ))}
       </div>
+      {nextCursor !== null && (
+        <Button variant="outline" onClick={loadMore}>
+          Load more
+        </Button>
+      )}
 
       {selected && (
         <Card className="p-6">
@@ -132,6 +248,29 @@ export default function InvestorDashboard() {
         </Card>
       )}
 
+      {reservations.length > 0 && (
+        <Card className="p-6">
+          <h3 className="text-lg font-semibold">Your reservations</h3>
+          <div className="mt-4 space-y-3">
+            {reservations.map((reservation) => (
+              <div key={reservation.reservation_code} className="flex flex-wrap items-center gap-3 text-sm">
+                <span className="text-slate-400">{reservation.reservation_code}</span>
+                <span>Round {reservation.round_code}</span>
+                <span>${(reservation.amount_cents / 100).toLocaleString()}</span>
+                <span className="text-slate-500 dark:text-slate-400">
+                  {reservation.status === "waitlisted"
+                    ? `Waitlisted #${reservation.waitlist_position}`
+                    : reservation.status}
+                </span>
+                {reservation.status === "held" && (
+                  <Button onClick={() => confirmReservation(reservation.reservation_code)}>Confirm</Button>
+                )}
+              </div>
+            ))}
+          </div>
+        </Card>
+      )}
+
       <ConfirmModal
         open={complianceOpen}
         onOpenChange={setComplianceOpen}
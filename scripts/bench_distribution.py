@@ -0,0 +1,124 @@
+import argparse
+from datetime import datetime, timedelta
+import time
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base
+from app import models  # noqa: F401
+from app.models import User, Startup, Application, Round, Investment, Contract, RevenueReport
+from app.distributions.service import run_distribution
+
+
+def seed(db, contract_count: int) -> tuple[int, int]:
+    admin = User(email=f"admin{time.time_ns()}@bench", hashed_password="x", role="admin", country="CA")
+    founder = User(email=f"founder{time.time_ns()}@bench", hashed_password="x", role="founder", country="CA")
+    db.add_all([admin, founder])
+    db.flush()
+    startup = Startup(
+        founder_user_id=founder.id,
+        legal_name="Bench Co",
+        country="CA",
+        incorporation_type="Corp",
+        incorporation_date="2021-01-01",
+        industry="Fintech",
+        short_description="Bench",
+        long_description="Bench",
+        current_monthly_revenue="$25k-$50k",
+        revenue_model="SaaS",
+        revenue_consistency="Stable",
+        revenue_stage="Stable",
+        existing_debt=0,
+        existing_investors=0,
+        intended_use_of_funds="[]",
+        target_funding_size="$250k-$1M",
+        preferred_timeline="3-6 months",
+    )
+    db.add(startup)
+    db.flush()
+    application = Application(
+        startup_id=startup.id,
+        name="Bench",
+        application_type="Initial Funding Application",
+        requested_limit_cents=contract_count * 100000,
+        risk_preference="medium",
+        status="approved",
+    )
+    db.add(application)
+    db.flush()
+    round_obj = Round(
+        startup_id=startup.id,
+        application_id=application.id,
+        title="Bench Round",
+        max_raise_cents=contract_count * 100000,
+        tier_selected="medium",
+        status="published",
+    )
+    db.add(round_obj)
+    db.flush()
+    investment_ids = db.scalars(
+        insert(Investment).returning(Investment.id),
+        [
+            {"round_id": round_obj.id, "investor_user_id": admin.id, "amount_cents": 100000, "payment_id": "pay_bench"}
+            for _ in range(contract_count)
+        ],
+    ).all()
+    now = datetime.utcnow()
+    db.execute(
+        insert(Contract),
+        [
+            {
+                "investment_id": investment_id,
+                "status": "active",
+                "principal_cents": 100000,
+                "payout_cap_cents": 170000,
+                "revenue_share_bps": 350,
+                "start_date": now,
+                "end_date_cap": now + timedelta(days=720),
+                "paid_to_date_cents": 0,
+            }
+            for investment_id in investment_ids
+        ],
+    )
+    db.add(
+        RevenueReport(
+            startup_id=startup.id,
+            month="2024-06-01",
+            gross_revenue_cents=contract_count * 50000,
+            reported_by=founder.id,
+            distribution_status="pending",
+        )
+    )
+    db.commit()
+    return startup.id, admin.id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark admin distribution runs by contract count.")
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--sizes", default="1000,5000,20000")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, poolclass=StaticPool if args.database_url == "sqlite://" else None)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+    print(f"{'contracts':>10} {'total_ms':>10} {'us/contract':>12} {'statements':>11}")
+    for size in [int(value) for value in args.sizes.split(",")]:
+        db = SessionLocal()
+        startup_id, admin_id = seed(db, size)
+        statements.clear()
+        started = time.perf_counter()
+        run_distribution(db, startup_id, "2024-06-01", admin_id)
+        elapsed = time.perf_counter() - started
+        db.close()
+        print(f"{size:>10} {elapsed * 1000:>10.1f} {elapsed * 1e6 / size:>12.2f} {len(statements):>11}")
+
+
+if __name__ == "__main__":
+    main()
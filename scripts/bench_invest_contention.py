@@ -0,0 +1,174 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app import models  # noqa: F401
+from app.models import User, Startup, Application, Round, TierOption, Investment, Contract, Reservation
+from app.investor.admission import AdmissionQueue
+from app.investor.service import place_investment
+from app.settings import settings
+
+
+def seed(db, investor_count: int, max_raise_cents: int) -> tuple[int, list[int]]:
+    tag = time.time_ns()
+    founder = User(email=f"founder{tag}@bench", hashed_password="x", role="founder", country="CA")
+    db.add(founder)
+    db.flush()
+    startup = Startup(
+        founder_user_id=founder.id,
+        legal_name="Bench Co",
+        country="CA",
+        incorporation_type="Corp",
+        incorporation_date="2021-01-01",
+        industry="Fintech",
+        short_description="Bench",
+        long_description="Bench",
+        current_monthly_revenue="$25k-$50k",
+        revenue_model="SaaS",
+        revenue_consistency="Stable",
+        revenue_stage="Stable",
+        existing_debt=0,
+        existing_investors=0,
+        intended_use_of_funds="[]",
+        target_funding_size="$250k-$1M",
+        preferred_timeline="3-6 months",
+    )
+    db.add(startup)
+    db.flush()
+    application = Application(
+        startup_id=startup.id,
+        name="Bench",
+        application_type="Initial Funding Application",
+        requested_limit_cents=max_raise_cents,
+        risk_preference="medium",
+        status="approved",
+    )
+    db.add(application)
+    db.flush()
+    round_obj = Round(
+        startup_id=startup.id,
+        application_id=application.id,
+        title="Bench Round",
+        max_raise_cents=max_raise_cents,
+        tier_selected="medium",
+        status="published",
+    )
+    db.add(round_obj)
+    db.flush()
+    db.add(
+        TierOption(
+            round_id=round_obj.id,
+            tier="medium",
+            revenue_share_bps=350,
+            time_cap_months=24,
+            payout_cap_mult=1.7,
+            min_hold_days=90,
+            exit_fee_bps_quarterly=50,
+            exit_fee_bps_offcycle=150,
+            explanation_json="{}",
+        )
+    )
+    investor_ids = db.scalars(
+        insert(User).returning(User.id),
+        [
+            {"email": f"investor{tag}-{index}@bench", "hashed_password": "x", "role": "investor", "country": "CA"}
+            for index in range(investor_count)
+        ],
+    ).all()
+    db.commit()
+    return round_obj.id, list(investor_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Stress the invest path with concurrent investors on one round; run against Postgres."
+    )
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--investors", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--amount-cents", type=int, default=100000)
+    parser.add_argument("--oversubscription", type=float, default=2.0, help="requested capital / max raise")
+    parser.add_argument("--admission", choices=["direct", "queue"], default="direct")
+    args = parser.parse_args()
+    args.threads = min(args.threads, args.investors)
+
+    engine = create_engine(args.database_url, pool_size=args.threads, max_overflow=0)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+    max_raise_cents = int(args.investors * args.amount_cents / args.oversubscription)
+    with SessionLocal() as db:
+        round_id, investor_ids = seed(db, args.investors, max_raise_cents)
+        investors = db.scalars(select(User).where(User.id.in_(investor_ids))).all()
+        db.expunge_all()
+
+    start = threading.Barrier(args.threads)
+    admission_queue = AdmissionQueue(session_factory=SessionLocal) if args.admission == "queue" else None
+    local = threading.local()
+
+    def _invest(investor: User) -> tuple[bool, float]:
+        if not getattr(local, "waited", False):
+            local.waited = True
+            start.wait()
+        started = time.perf_counter()
+        if admission_queue is not None:
+            reservation = admission_queue.submit(investor.id, round_id, args.amount_cents).result()
+            return reservation["status"] == "held", time.perf_counter() - started
+        with SessionLocal() as db:
+            try:
+                place_investment(db, investor, round_id, args.amount_cents)
+                accepted = True
+            except ValueError:
+                accepted = False
+        return accepted, time.perf_counter() - started
+
+    wall_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        results = list(executor.map(_invest, investors))
+    wall = time.perf_counter() - wall_started
+    if admission_queue is not None:
+        admission_queue.stop()
+
+    with SessionLocal() as db:
+        round_obj = db.get(Round, round_id)
+        invested, investment_count = db.execute(
+            select(func.coalesce(func.sum(Investment.amount_cents), 0), func.count(Investment.id)).where(
+                Investment.round_id == round_id
+            )
+        ).one()
+        contract_count = db.execute(
+            select(func.count(Contract.id))
+            .join(Investment, Investment.id == Contract.investment_id)
+            .where(Investment.round_id == round_id)
+        ).scalar()
+        held_cents = db.execute(
+            select(func.coalesce(func.sum(Reservation.amount_cents), 0)).where(
+                Reservation.round_id == round_id, Reservation.status == "held"
+            )
+        ).scalar()
+
+    accepted = sum(1 for ok, _ in results if ok)
+    latencies_ms = np.array([elapsed for _, elapsed in results]) * 1000
+    subscribed = invested + held_cents
+    assert subscribed <= max_raise_cents, f"oversubscribed: {subscribed} > {max_raise_cents}"
+    assert invested == round_obj.raised_cents and held_cents == round_obj.reserved_cents
+    assert subscribed == accepted * args.amount_cents
+    assert investment_count == contract_count == round_obj.investor_count
+    assert accepted == min(args.investors, max_raise_cents // args.amount_cents)
+
+    print(f"admission={args.admission} investors={args.investors} threads={args.threads} accepted={accepted} rejected={args.investors - accepted}")
+    print(f"raised_cents={invested} reserved_cents={held_cents} max_raise_cents={max_raise_cents}")
+    print(
+        f"p50_ms={np.percentile(latencies_ms, 50):.1f} p99_ms={np.percentile(latencies_ms, 99):.1f} "
+        f"max_ms={latencies_ms.max():.1f} throughput={args.investors / wall:.0f}/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
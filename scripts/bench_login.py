@@ -0,0 +1,85 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app import models  # noqa: F401
+from app.models import User
+from app.auth.passwords import _verify, password_hasher
+from app.auth.router import AuthRequest, ensure_admin, login
+from app.auth.security import create_access_token
+from app.settings import settings
+
+
+def _login_inline(db, payload: AuthRequest) -> str:
+    # The login handler as it was: admin bootstrap on every call, bcrypt on the request thread.
+    ensure_admin(db)
+    user = db.query(User).filter(User.email == payload.email).first()
+    if not user or not _verify(payload.password, user.hashed_password):
+        raise ValueError("Invalid credentials")
+    return create_access_token({"sub": str(user.id), "role": user.role, "ver": user.token_version})
+
+
+def _login_pool(db, payload: AuthRequest) -> str:
+    return login(payload, db=db).access_token
+
+
+def run(SessionLocal, handler, emails: list[str], threads: int) -> float:
+    def _one(email: str) -> None:
+        with SessionLocal() as db:
+            handler(db, AuthRequest(email=email, password="password"))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(_one, emails))
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Login throughput with bcrypt on the request threads versus the password hashing pool. "
+        "The cost and pool size come from PASSWORD_HASH_ROUNDS and PASSWORD_HASH_WORKERS."
+    )
+    parser.add_argument("--database-url", default=None, help="defaults to a temporary SQLite file")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench_login.db"
+    engine = create_engine(database_url, pool_size=args.threads, max_overflow=0)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+    password_hasher.start()
+    hashed = password_hasher.hash("password")
+    tag = time.time_ns()
+    emails = [f"login{tag}-{index}@bench" for index in range(args.users)]
+    with SessionLocal() as db:
+        db.execute(
+            insert(User),
+            [{"email": email, "hashed_password": hashed, "role": "investor", "country": "CA"} for email in emails],
+        )
+        db.commit()
+    logins = [emails[index % args.users] for index in range(args.logins)]
+
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    print(
+        f"logins={args.logins} threads={args.threads} cores={cores} "
+        f"rounds={password_hasher.rounds} workers={password_hasher.workers} admin={settings.admin_email}"
+    )
+    print(f"{'mode':>8} {'total_s':>8} {'logins/s':>9} {'logins/s/core':>14}")
+    for mode, handler in (("inline", _login_inline), ("pool", _login_pool)):
+        elapsed = run(SessionLocal, handler, logins, args.threads)
+        rate = args.logins / elapsed
+        print(f"{mode:>8} {elapsed:>8.2f} {rate:>9.1f} {rate / cores:>14.1f}")
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+from datetime import datetime
+import time
+
+import numpy as np
+
+from app.algorithm.payouts import allocate_payouts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized revenue-share payout kernel.")
+    parser.add_argument("--contracts", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.contracts
+    as_of = datetime(2024, 6, 1)
+    pool_ids = rng.integers(0, args.rounds, n)
+    revenue_share_bps = (300 + pool_ids * 5).astype(np.int64)
+    principal_cents = rng.integers(10_000, 5_000_000, n)
+    payout_cap_cents = principal_cents * 17 // 10
+    paid_to_date_cents = rng.integers(0, payout_cap_cents)
+    end_date_cap = np.datetime64(as_of, "us") + rng.integers(-30, 720, n).astype("timedelta64[D]")
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        result = allocate_payouts(
+            2_500_000_000,
+            pool_ids,
+            revenue_share_bps,
+            principal_cents,
+            payout_cap_cents,
+            paid_to_date_cents,
+            end_date_cap,
+            as_of,
+        )
+        timings.append(time.perf_counter() - started)
+    print(f"contracts={n} best_ms={min(timings) * 1000:.1f} median_ms={sorted(timings)[len(timings) // 2] * 1000:.1f}")
+    print(f"paid_cents={int(result.amounts.sum())} completed={int(result.completed.sum())} expired={int(result.expired.sum())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import argparse
+from datetime import date
+
+from sqlalchemy import create_engine
+
+from app.partitions import detach_partitions, ensure_partitions
+from app.settings import settings
+
+
+def _month(value: str) -> date:
+    return date.fromisoformat(f"{value}-01")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Maintain the monthly partitions of ledger_entries and audit_logs (Postgres only)."
+    )
+    parser.add_argument("--database-url", default=settings.database_url)
+    commands = parser.add_subparsers(dest="command", required=True)
+    ensure = commands.add_parser("ensure", help="create partitions for the coming months")
+    ensure.add_argument("--months-ahead", type=int, default=3)
+    detach = commands.add_parser("detach", help="detach the partitions of every month before --before")
+    detach.add_argument("--before", type=_month, required=True, help="YYYY-MM")
+    detach.add_argument("--drop", action="store_true", help="drop detached partitions instead of keeping them")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    if args.command == "ensure":
+        for name in ensure_partitions(engine, months_ahead=args.months_ahead):
+            print(f"created {name}")
+    else:
+        for name in detach_partitions(engine, args.before, drop=args.drop):
+            print(f"{'dropped' if args.drop else 'detached'} {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import argparse
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models  # noqa: F401
+from app.settings import settings
+from app.startups.summary import rebuild
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Recompute the startup_summaries read model from the raw tables in one transaction."
+    )
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--startup-id", type=int, action="append", help="rebuild only these startups (repeatable)")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        count = rebuild(db, args.startup_id)
+        db.commit()
+    print(f"rebuilt={count} elapsed_ms={(time.perf_counter() - started) * 1000:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
+from datetime import datetime
 from app.db import SessionLocal
 from app.models import User, Startup, Application, Round, TierOption
 from app.auth.security import hash_password
 from app.algorithm.service import calculate_tiers
 from app.settings import settings
+from app.startups.summary import rebuild
 import json
 
 
@@ -57,6 +59,7 @@ def seed():
         requested_limit_cents=5000000,
         risk_preference="medium",
         status="approved",
+        submitted_at=datetime.utcnow(),
     )
     db.add(application)
     db.commit()
@@ -86,6 +89,7 @@ def seed():
                 explanation_json=tier.explanation_json,
             )
         )
+    rebuild(db, [startup.id])
     db.commit()
     print("Seed complete")
 
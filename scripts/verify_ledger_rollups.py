@@ -0,0 +1,47 @@
+import argparse
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models  # noqa: F401
+from app.ledger.rollups import verify
+from app.settings import settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Re-derive the ledger rollups from ledger_entries in parallel id ranges and compare them."
+    )
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--cutoff", type=date.fromisoformat, help="compare periods that ended by this date (default: today)")
+    parser.add_argument("--chunk-size", type=int, default=settings.rollup_verify_chunk_size)
+    parser.add_argument("--workers", type=int, default=settings.rollup_verify_workers)
+    parser.add_argument("--repair", action="store_true", help="overwrite mismatched rollups with the re-derived totals")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, pool_size=args.workers, max_overflow=0)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    result = verify(
+        cutoff=args.cutoff,
+        chunk_size=args.chunk_size,
+        max_workers=args.workers,
+        repair=args.repair,
+        session_factory=SessionLocal,
+    )
+    for mismatch in result["mismatches"]:
+        print(
+            f"mismatch grain={mismatch['grain']} type={mismatch['entry_type']} period={mismatch['period_start']} "
+            f"startup={mismatch['startup_id']} expected={mismatch['expected_amount_cents']}/{mismatch['expected_entry_count']} "
+            f"stored={mismatch['stored_amount_cents']}/{mismatch['stored_entry_count']}"
+        )
+    print(
+        f"cutoff={result['cutoff']} chunks={result['chunk_count']} checked={result['checked_count']} "
+        f"mismatches={len(result['mismatches'])} repaired={result['repaired']} elapsed_ms={result['elapsed_ms']:.1f}"
+    )
+    if result["mismatches"] and not result["repaired"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()